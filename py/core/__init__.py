@@ -139,6 +139,7 @@ __all__ = [
     "RSTParser",
     "TIFFParser",
     "TSVParser",
+    "TSVParserAdvanced",
     "XLSParser",
     "XLSXParser",
     "XLSXParserAdvanced",
@@ -5,7 +5,6 @@ import random
 import re
 from typing import Any, AsyncGenerator, Callable, Optional, Tuple
 
-import tiktoken
 from google.genai.errors import ServerError
 
 from core.agent import R2RAgent, R2RStreamingAgent, R2RStreamingReasoningAgent
@@ -29,6 +28,7 @@ from core.providers import (
     OpenAICompletionProvider,
     R2RCompletionProvider,
 )
+from core.utils import count_tokens_for_text
 
 logger = logging.getLogger(__name__)
 
@@ -83,13 +83,7 @@ class SearchResultsCollector:
 
 
 def num_tokens(text, model="gpt-4o"):
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        encoding = tiktoken.get_encoding("cl100k_base")
-
-    """Return the number of tokens used by a list of messages for both user and assistant."""
-    return len(encoding.encode(text, disallowed_special=()))
+    return count_tokens_for_text(text, model)
 
 
 class RAGAgentMixin:
@@ -76,6 +76,8 @@ __all__ = [
     ## PARSERS
     # Base parser
     "AsyncParser",
+    "BufferReader",
+    "binary_stream",
     ## PROVIDERS
     # Base provider classes
     "AppConfig",
@@ -96,19 +98,30 @@ __all__ = [
     "DatabaseProvider",
     "Handler",
     "PostgresConfigurationSettings",
+    # File storage provider
+    "FileConfig",
+    "FileStorageProvider",
+    "StoredFile",
     # Embedding provider
+    "EmbeddingCache",
     "EmbeddingConfig",
     "EmbeddingProvider",
+    "InMemoryEmbeddingCache",
     # Ingestion provider
     "IngestionMode",
     "IngestionConfig",
     "IngestionProvider",
     "ChunkingStrategy",
+    "ParserExecutionMode",
+    "ParserExecutionSettings",
     # LLM provider
     "CompletionConfig",
     "CompletionProvider",
     ## UTILS
     "RecursiveCharacterTextSplitter",
+    "RecursiveSpanTextSplitter",
+    "RecursiveTokenTextSplitter",
+    "TextSpan",
     "TextSplitter",
     "format_search_results_for_llm",
     "format_search_results_for_stream",
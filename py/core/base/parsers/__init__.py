@@ -1,5 +1,7 @@
-from .base_parser import AsyncParser
+from .base_parser import AsyncParser, BufferReader, binary_stream
 
 __all__ = [
     "AsyncParser",
+    "BufferReader",
+    "binary_stream",
 ]
@@ -1,12 +1,61 @@
 """Abstract base class for parsers."""
 
+import io
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, Generic, TypeVar
+from typing import AsyncGenerator, BinaryIO, Generic, TypeVar
 
 T = TypeVar("T")
 
 
 class AsyncParser(ABC, Generic[T]):
+    # Parsers that can read any bytes-like buffer, such as a memory-mapped
+    # file, set this; the others are handed a `bytes` copy.
+    accepts_buffer: bool = False
+
     @abstractmethod
-    async def ingest(self, data: T, **kwargs) -> AsyncGenerator[str, None]:
-        pass
+    def ingest(self, data: T, **kwargs) -> AsyncGenerator[str, None]:
+        """Yields the text of `data`; implemented as an async generator."""
+
+
+class BufferReader(io.RawIOBase):
+    """A seekable binary stream that reads a buffer in place."""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        data = self._view[self._position : self._position + len(b)]
+        b[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {
+            io.SEEK_SET: 0,
+            io.SEEK_CUR: self._position,
+            io.SEEK_END: len(self._view),
+        }[whence]
+        self._position = max(base + offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        # Lets a memory-mapped buffer be unmapped
+        self._view.release()
+        super().close()
+
+
+def binary_stream(data) -> BinaryIO:
+    """A seekable binary stream over `bytes` or any other buffer."""
+    if isinstance(data, bytes):
+        return io.BytesIO(data)
+    return BufferReader(data)  # type: ignore
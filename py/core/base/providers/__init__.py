@@ -10,12 +10,20 @@ from .database import (
     PostgresConfigurationSettings,
 )
 from .email import EmailConfig, EmailProvider
-from .embedding import EmbeddingConfig, EmbeddingProvider
+from .embedding import (
+    EmbeddingCache,
+    EmbeddingConfig,
+    EmbeddingProvider,
+    InMemoryEmbeddingCache,
+)
+from .file import FileConfig, FileStorageProvider, StoredFile
 from .ingestion import (
     ChunkingStrategy,
     IngestionConfig,
     IngestionMode,
     IngestionProvider,
+    ParserExecutionMode,
+    ParserExecutionSettings,
 )
 from .llm import CompletionConfig, CompletionProvider
 from .orchestration import OrchestrationConfig, OrchestrationProvider, Workflow
@@ -33,6 +41,8 @@ __all__ = [
     "IngestionConfig",
     "IngestionProvider",
     "ChunkingStrategy",
+    "ParserExecutionMode",
+    "ParserExecutionSettings",
     # Crypto provider
     "CryptoConfig",
     "CryptoProvider",
@@ -46,9 +56,15 @@ __all__ = [
     "PostgresConfigurationSettings",
     "DatabaseProvider",
     "Handler",
+    # File storage provider
+    "FileConfig",
+    "FileStorageProvider",
+    "StoredFile",
     # Embedding provider
+    "EmbeddingCache",
     "EmbeddingConfig",
     "EmbeddingProvider",
+    "InMemoryEmbeddingCache",
     # LLM provider
     "CompletionConfig",
     "CompletionProvider",
@@ -131,6 +131,11 @@ class DatabaseConfig(ProviderConfig):
     collection_summary_system_prompt: str = "system"
     collection_summary_prompt: str = "collection_summary"
     enable_fts: bool = False
+    # Chunk batches at least this large are upserted through COPY (0 disables)
+    copy_upsert_threshold: int = 1000
+    # Deduplicated chunk embeddings unused for this long are dropped
+    # (None keeps them)
+    chunk_embeddings_ttl_seconds: Optional[float] = 30 * 24 * 3600
 
     # Graph settings
     batch_size: Optional[int] = 1
@@ -1,8 +1,11 @@
 import asyncio
+import hashlib
 import logging
 import random
 import time
-from abc import abstractmethod
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
 from enum import Enum
 from typing import Any, Optional
 
@@ -36,6 +39,10 @@ class EmbeddingConfig(ProviderConfig):
     quantization_settings: VectorQuantizationSettings = (
         VectorQuantizationSettings()
     )
+    cache_backend: str = "memory"
+    cache_max_entries: int = 10_000
+    cache_ttl_seconds: Optional[float] = 3_600
+    cache_purposes: list[str] = ["query"]
 
     ## deprecated
     rerank_dimension: Optional[int] = None
@@ -44,11 +51,98 @@ class EmbeddingConfig(ProviderConfig):
     def validate_config(self) -> None:
         if self.provider not in self.supported_providers:
             raise ValueError(f"Provider '{self.provider}' is not supported.")
+        if self.cache_backend not in self.supported_cache_backends:
+            raise ValueError(
+                f"Embedding cache backend '{self.cache_backend}' is not supported."
+            )
 
     @property
     def supported_providers(self) -> list[str]:
         return ["litellm", "openai", "ollama"]
 
+    @property
+    def supported_cache_backends(self) -> list[str]:
+        return ["none", "memory", "postgres"]
+
+
+class EmbeddingCache(ABC):
+    """
+    Pluggable store for computed embeddings.
+
+    Entries are keyed by `EmbeddingProvider._cache_key` and held as packed
+    float32 arrays, which is what pgvector stores anyway.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    async def _get_many(self, keys: list[str]) -> dict[str, array]:
+        pass
+
+    @abstractmethod
+    async def _set_many(self, entries: dict[str, array]) -> None:
+        pass
+
+    async def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        found = await self._get_many(keys)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return {key: vector.tolist() for key, vector in found.items()}
+
+    async def set_many(self, entries: dict[str, list[float]]) -> None:
+        await self._set_many(
+            {key: array("f", vector) for key, vector in entries.items()}
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class InMemoryEmbeddingCache(EmbeddingCache):
+    """Process-local LRU cache with optional time-to-live eviction."""
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[array, float]] = OrderedDict()
+
+    async def _get_many(self, keys: list[str]) -> dict[str, array]:
+        now = time.monotonic()
+        found: dict[str, array] = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            vector, expires_at = entry
+            if expires_at < now:
+                del self._entries[key]
+                self.evictions += 1
+                continue
+            self._entries.move_to_end(key)
+            found[key] = vector
+        return found
+
+    async def _set_many(self, entries: dict[str, array]) -> None:
+        expires_at = (
+            time.monotonic() + self.ttl_seconds
+            if self.ttl_seconds is not None
+            else float("inf")
+        )
+        for key, vector in entries.items():
+            self._entries[key] = (vector, expires_at)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
 
 class EmbeddingProvider(Provider):
     class Step(Enum):
@@ -66,8 +160,60 @@ class EmbeddingProvider(Provider):
         self.config: EmbeddingConfig = config
         self.semaphore = asyncio.Semaphore(config.concurrent_request_limit)
         self.current_requests = 0
+        self.cache: Optional[EmbeddingCache] = None
+        if config.cache_backend == "memory":
+            self.cache = InMemoryEmbeddingCache(
+                max_entries=config.cache_max_entries,
+                ttl_seconds=config.cache_ttl_seconds,
+            )
+        # The postgres backend needs a database connection and is attached
+        # by the provider factory once the database provider exists.
+
+    def _cache_key(self, task: dict[str, Any], text: str) -> str:
+        purpose = task.get("purpose", EmbeddingPurpose.INDEX)
+        prefix = getattr(self, "prefixes", {}).get(purpose, "")
+        prefix_hash = hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.config.base_model}:{self.config.base_dimension}:{purpose.name.lower()}:{prefix_hash}:{text_hash}"
+
+    def _is_cacheable(self, task: dict[str, Any]) -> bool:
+        # Per-call kwargs (e.g. a different `dimensions`) change the output,
+        # so only default calls are served from the cache.
+        return (
+            self.cache is not None
+            and "texts" in task
+            and not task.get("kwargs")
+            and task.get("stage", EmbeddingProvider.Step.BASE)
+            == EmbeddingProvider.Step.BASE
+            and task.get("purpose", EmbeddingPurpose.INDEX).name.lower()
+            in self.config.cache_purposes
+        )
 
     async def _execute_with_backoff_async(self, task: dict[str, Any]):
+        if not self._is_cacheable(task):
+            return await self._execute_with_retries_async(task)
+
+        assert self.cache is not None
+        texts = task["texts"]
+        keys = [self._cache_key(task, text) for text in texts]
+        embeddings = await self.cache.get_many(keys)
+
+        missing = {
+            key: text
+            for key, text in zip(keys, texts, strict=True)
+            if key not in embeddings
+        }
+        if missing:
+            computed = await self._execute_with_retries_async(
+                {**task, "texts": list(missing.values())}
+            )
+            new_entries = dict(zip(missing.keys(), computed, strict=True))
+            await self.cache.set_many(new_entries)
+            embeddings.update(new_entries)
+
+        return [embeddings[key] for key in keys]
+
+    async def _execute_with_retries_async(self, task: dict[str, Any]):
         retries = 0
         backoff = self.config.initial_backoff
         while retries < self.config.max_retries:
@@ -0,0 +1,88 @@
+import logging
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterable, AsyncIterator, NamedTuple, Optional
+
+from .base import Provider, ProviderConfig
+
+logger = logging.getLogger()
+
+
+class FileConfig(ProviderConfig):
+    # Directory of the content-addressed store of the `local` provider
+    root: Optional[str] = None
+    # S3 or S3-compatible bucket of the `s3` provider
+    bucket_name: Optional[str] = None
+    endpoint_url: Optional[str] = None
+    region_name: Optional[str] = None
+    aws_access_key_id: Optional[str] = None
+    aws_secret_access_key: Optional[str] = None
+
+    @property
+    def supported_providers(self) -> list[str]:
+        return ["postgres", "local", "s3"]
+
+    def validate_config(self) -> None:
+        if self.provider not in self.supported_providers:
+            raise ValueError(
+                f"File storage provider {self.provider} not supported."
+            )
+        if self.provider == "local" and not self.root:
+            raise ValueError("The local file provider requires a `root`.")
+        if self.provider == "s3" and not self.bucket_name:
+            raise ValueError("The s3 file provider requires a `bucket_name`.")
+
+
+class StoredFile(NamedTuple):
+    key: str
+    size: int
+    sha256: str
+
+
+class FileStorageProvider(Provider, ABC):
+    """
+    Stores the bytes of original uploads under opaque keys. File names,
+    types and owners are kept by the files handler, which records the key.
+    """
+
+    def __init__(self, config: FileConfig):
+        if not isinstance(config, FileConfig):
+            raise ValueError(
+                "FileStorageProvider must be initialized with a FileConfig"
+            )
+        super().__init__(config)
+        self.config: FileConfig = config
+
+    @abstractmethod
+    async def store(
+        self, chunks: AsyncIterable[bytes], max_size: Optional[int] = None
+    ) -> StoredFile:
+        """
+        Stores a file written chunk by chunk, rejecting it with a 413 once
+        it exceeds `max_size` without leaving anything behind.
+        """
+        pass
+
+    @abstractmethod
+    def stream(
+        self, key: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Yields bytes [start, end) of a stored file in chunks."""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        pass
+
+    @asynccontextmanager
+    async def open(self, key: str) -> AsyncIterator[bytes | memoryview]:
+        """
+        Yields the whole file as a read-only bytes-like buffer that is
+        valid until the block exits. Backends that can memory-map the file
+        override this to avoid the copy.
+        """
+        yield b"".join([chunk async for chunk in self.stream(key)])
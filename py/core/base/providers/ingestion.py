@@ -3,7 +3,7 @@ from abc import ABC
 from enum import Enum
 from typing import TYPE_CHECKING, Any, ClassVar, Optional
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 
 from core.base.abstractions import ChunkEnrichmentSettings
 
@@ -21,6 +21,7 @@ class ChunkingStrategy(str, Enum):
     CHARACTER = "character"
     BASIC = "basic"
     BY_TITLE = "by_title"
+    TOKEN = "token"
 
 
 class IngestionMode(str, Enum):
@@ -29,6 +30,26 @@ class IngestionMode(str, Enum):
     custom = "custom"
 
 
+class ParserExecutionMode(str, Enum):
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class ParserExecutionSettings(BaseModel):
+    """
+    Where a document type's parser runs. `thread` and `process` keep
+    CPU-bound parsing off the event loop; they suit parsers that only work
+    on the file bytes, not ones that call the LLM or database providers.
+    """
+
+    mode: ParserExecutionMode = ParserExecutionMode.INLINE
+    # Seconds a single document may spend in the parser
+    timeout: Optional[float] = None
+    # Address-space cap applied to the worker while parsing (process only)
+    memory_limit_mb: Optional[int] = None
+
+
 class IngestionConfig(ProviderConfig):
     _defaults: ClassVar[dict] = {
         "app": AppConfig(),
@@ -36,6 +57,7 @@ class IngestionConfig(ProviderConfig):
         "excluded_parsers": ["mp4"],
         "chunking_strategy": "recursive",
         "chunk_size": 1024,
+        "chunk_tokenizer": "cl100k_base",
         "chunk_enrichment_settings": ChunkEnrichmentSettings(),
         "extra_parsers": {},
         "audio_transcription_model": None,
@@ -43,6 +65,9 @@ class IngestionConfig(ProviderConfig):
         "vision_img_model": None,
         "vision_pdf_prompt_name": "vision_pdf",
         "vision_pdf_model": None,
+        "vision_pdf_page_window": 8,
+        "vision_pdf_render_batch": 4,
+        "vision_pdf_cache_dir": None,
         "skip_document_summary": False,
         "document_summary_system_prompt": "system",
         "document_summary_task_prompt": "summary",
@@ -52,6 +77,11 @@ class IngestionConfig(ProviderConfig):
         "parser_overrides": {},
         "extra_fields": {},
         "automatic_extraction": False,
+        "deduplicate_chunk_embeddings": True,
+        "incremental_updates": True,
+        "pipeline_queue_size": 256,
+        "parser_execution": {},
+        "parser_process_workers": None,
     }
 
     provider: str = Field(
@@ -66,6 +96,9 @@ class IngestionConfig(ProviderConfig):
     chunk_size: int = Field(
         default_factory=lambda: IngestionConfig._defaults["chunk_size"]
     )
+    chunk_tokenizer: str = Field(
+        default_factory=lambda: IngestionConfig._defaults["chunk_tokenizer"]
+    )
     chunk_enrichment_settings: ChunkEnrichmentSettings = Field(
         default_factory=lambda: IngestionConfig._defaults[
             "chunk_enrichment_settings"
@@ -95,6 +128,21 @@ class IngestionConfig(ProviderConfig):
     vision_pdf_model: Optional[str] = Field(
         default_factory=lambda: IngestionConfig._defaults["vision_pdf_model"]
     )
+    vision_pdf_page_window: int = Field(
+        default_factory=lambda: IngestionConfig._defaults[
+            "vision_pdf_page_window"
+        ]
+    )
+    vision_pdf_render_batch: int = Field(
+        default_factory=lambda: IngestionConfig._defaults[
+            "vision_pdf_render_batch"
+        ]
+    )
+    vision_pdf_cache_dir: Optional[str] = Field(
+        default_factory=lambda: IngestionConfig._defaults[
+            "vision_pdf_cache_dir"
+        ]
+    )
     skip_document_summary: bool = Field(
         default_factory=lambda: IngestionConfig._defaults[
             "skip_document_summary"
@@ -133,6 +181,29 @@ class IngestionConfig(ProviderConfig):
             "document_summary_max_length"
         ]
     )
+    deduplicate_chunk_embeddings: bool = Field(
+        default_factory=lambda: IngestionConfig._defaults[
+            "deduplicate_chunk_embeddings"
+        ]
+    )
+    incremental_updates: bool = Field(
+        default_factory=lambda: IngestionConfig._defaults[
+            "incremental_updates"
+        ]
+    )
+    pipeline_queue_size: int = Field(
+        default_factory=lambda: IngestionConfig._defaults[
+            "pipeline_queue_size"
+        ]
+    )
+    parser_execution: dict[str, ParserExecutionSettings] = Field(
+        default_factory=lambda: IngestionConfig._defaults["parser_execution"]
+    )
+    parser_process_workers: Optional[int] = Field(
+        default_factory=lambda: IngestionConfig._defaults[
+            "parser_process_workers"
+        ]
+    )
 
     @classmethod
     def set_default(cls, **kwargs):
@@ -152,6 +223,19 @@ class IngestionConfig(ProviderConfig):
         if self.provider not in self.supported_providers:
             raise ValueError(f"Provider {self.provider} is not supported.")
 
+    def get_parser_execution(
+        self, document_type: str
+    ) -> ParserExecutionSettings:
+        """
+        Settings for `document_type`, falling back to the `default` entry
+        and then to inline execution.
+        """
+        return (
+            self.parser_execution.get(document_type)
+            or self.parser_execution.get("default")
+            or ParserExecutionSettings()
+        )
+
     @classmethod
     def get_default(cls, mode: str, app) -> "IngestionConfig":
         """Return default ingestion configuration for a given mode."""
@@ -178,3 +262,7 @@ class IngestionProvider(Provider, ABC):
         self.config: IngestionConfig = config
         self.llm_provider = llm_provider
         self.database_provider: "PostgresDatabaseProvider" = database_provider
+
+    def shutdown(self) -> None:
+        """Stops any workers started to parse documents."""
+        pass
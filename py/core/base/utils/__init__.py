@@ -1,5 +1,8 @@
 from shared.utils import (
     RecursiveCharacterTextSplitter,
+    RecursiveSpanTextSplitter,
+    RecursiveTokenTextSplitter,
+    TextSpan,
     TextSplitter,
     _decorate_vector_type,
     _get_vector_column_str,
@@ -34,6 +37,9 @@ __all__ = [
     "generate_entity_document_id",
     "generate_default_prompt_id",
     "RecursiveCharacterTextSplitter",
+    "RecursiveSpanTextSplitter",
+    "RecursiveTokenTextSplitter",
+    "TextSpan",
     "TextSplitter",
     "validate_uuid",
     "deep_update",
@@ -17,6 +17,7 @@ __all__ = [
     "R2RProviderFactory",
     ## R2R SERVICES
     "AuthService",
+    "ChunkQuotaService",
     "IngestionService",
     "ManagementService",
     "RetrievalService",
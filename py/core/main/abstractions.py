@@ -11,13 +11,16 @@ from core.providers import (
     JwtAuthProvider,
     LiteLLMCompletionProvider,
     LiteLLMEmbeddingProvider,
+    LocalFileStorageProvider,
     OllamaEmbeddingProvider,
     OpenAICompletionProvider,
     OpenAIEmbeddingProvider,
     PostgresDatabaseProvider,
+    PostgresFileStorageProvider,
     R2RAuthProvider,
     R2RCompletionProvider,
     R2RIngestionProvider,
+    S3FileStorageProvider,
     SendGridEmailProvider,
     SimpleOrchestrationProvider,
     SupabaseAuthProvider,
@@ -26,6 +29,7 @@ from core.providers import (
 
 if TYPE_CHECKING:
     from core.main.services.auth_service import AuthService
+    from core.main.services.chunk_quota_service import ChunkQuotaService
     from core.main.services.graph_service import GraphService
     from core.main.services.ingestion_service import IngestionService
     from core.main.services.management_service import ManagementService
@@ -35,6 +39,11 @@ if TYPE_CHECKING:
 class R2RProviders(BaseModel):
     auth: R2RAuthProvider | SupabaseAuthProvider | JwtAuthProvider
     database: PostgresDatabaseProvider
+    file: (
+        PostgresFileStorageProvider
+        | LocalFileStorageProvider
+        | S3FileStorageProvider
+    )
     ingestion: R2RIngestionProvider | UnstructuredIngestionProvider
     embedding: (
         LiteLLMEmbeddingProvider
@@ -66,6 +75,7 @@ class R2RProviders(BaseModel):
 @dataclass
 class R2RServices:
     auth: "AuthService"
+    chunk_quota: "ChunkQuotaService"
     ingestion: "IngestionService"
     management: "ManagementService"
     retrieval: "RetrievalService"
@@ -1,4 +1,3 @@
-import base64
 import logging
 import mimetypes
 import textwrap
@@ -8,7 +7,16 @@ from typing import Any, Optional
 from urllib.parse import quote
 from uuid import UUID
 
-from fastapi import Body, Depends, File, Form, Path, Query, UploadFile
+from fastapi import (
+    Body,
+    Depends,
+    File,
+    Form,
+    Header,
+    Path,
+    Query,
+    UploadFile,
+)
 from fastapi.background import BackgroundTasks
 from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import Json
@@ -47,6 +55,7 @@ from .base_router import BaseRouterV3
 
 logger = logging.getLogger()
 MAX_CHUNKS_PER_REQUEST = 1024 * 100
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 def merge_search_settings(
@@ -326,20 +335,20 @@ class DocumentsRouter(BaseRouterV3):
                         message=f"User has reached the maximum number of documents allowed ({user_max_documents}).",
                     )
 
-                # Get chunks using the vector handler's list_chunks method
                 user_chunk_count = (
-                    await self.services.ingestion.list_chunks(
-                        filters={"owner_id": {"$eq": str(auth_user.id)}},
-                        offset=0,
-                        limit=1,
+                    await self.services.chunk_quota.get_chunk_count(
+                        auth_user.id
                     )
-                )["total_entries"]
+                )
                 user_max_chunks = (
-                    await self.services.management.get_user_max_chunks(
+                    await self.services.chunk_quota.get_max_chunks(
                         auth_user.id
                     )
                 )
-                if user_chunk_count >= user_max_chunks:
+                if (
+                    user_max_chunks is not None
+                    and user_chunk_count >= user_max_chunks
+                ):
                     raise R2RException(
                         status_code=403,
                         message=f"User has reached the maximum number of chunks allowed ({user_max_chunks}).",
@@ -459,16 +468,18 @@ class DocumentsRouter(BaseRouterV3):
 
             else:
                 if file:
-                    file_data = await self._process_file(file)
-                    content_length = len(file_data["content"])
-                    file_ext = file.filename.split(".")[
-                        -1
-                    ]  # e.g. "pdf", "txt"
+                    if file.filename is None:
+                        raise R2RException(
+                            status_code=422,
+                            message="The uploaded file has no filename.",
+                        )
+                    upload, file_name = file, file.filename
+                    file_ext = file_name.split(".")[-1]  # e.g. "pdf", "txt"
                     max_allowed_size = await self.services.management.get_max_upload_size_by_type(
                         user_id=auth_user.id, file_type_or_ext=file_ext
                     )
 
-                    if content_length > max_allowed_size:
+                    if file.size is not None and file.size > max_allowed_size:
                         raise R2RException(
                             status_code=413,  # HTTP 413: Payload Too Large
                             message=(
@@ -477,13 +488,14 @@ class DocumentsRouter(BaseRouterV3):
                             ),
                         )
 
-                    file_content = BytesIO(
-                        base64.b64decode(file_data["content"])
-                    )
-
-                    file_data.pop("content", None)
+                    # Streamed into storage below, never read whole
+                    file_content = None
+                    file_data = {
+                        "filename": file_name,
+                        "content_type": file.content_type,
+                    }
                     document_id = id or generate_document_id(
-                        file_data["filename"], auth_user.id
+                        file_name, auth_user.id
                     )
                 elif raw_text:
                     content_length = len(raw_text)
@@ -491,8 +503,9 @@ class DocumentsRouter(BaseRouterV3):
                     document_id = id or generate_document_id(
                         raw_text, auth_user.id
                     )
+                    file_name = "N/A"
                     file_data = {
-                        "filename": "N/A",
+                        "filename": file_name,
                         "content_type": "text/plain",
                     }
                 else:
@@ -501,6 +514,25 @@ class DocumentsRouter(BaseRouterV3):
                         message="Either a file or content must be provided.",
                     )
 
+            if file_content is None:
+                (
+                    content_length,
+                    file_data["sha256"],
+                ) = await self.providers.database.files_handler.store_file_stream(
+                    document_id,
+                    file_name,
+                    self._iter_upload(upload),
+                    file_data["content_type"],
+                    max_size=max_allowed_size,
+                )
+            else:
+                await self.providers.database.files_handler.store_file(
+                    document_id,
+                    file_name,
+                    file_content,
+                    file_data["content_type"],
+                )
+
             workflow_input = {
                 "file_data": file_data,
                 "document_id": str(document_id),
@@ -518,14 +550,6 @@ class DocumentsRouter(BaseRouterV3):
                 "version": "v0",
             }
 
-            file_name = file_data["filename"]
-            await self.providers.database.files_handler.store_file(
-                document_id,
-                file_name,
-                file_content,
-                file_data["content_type"],
-            )
-
             await self.services.ingestion.ingest_file_ingress(
                 file_data=workflow_input["file_data"],
                 user=auth_user,
@@ -749,26 +773,19 @@ class DocumentsRouter(BaseRouterV3):
                         message="Non-superusers must provide document IDs to export.",
                     )
 
-            (
-                zip_name,
-                zip_content,
-                zip_size,
-            ) = await self.services.management.export_files(
+            zip_name, zip_stream = await self.services.management.export_files(
                 document_ids=document_ids,
                 start_date=start_date,
                 end_date=end_date,
             )
             encoded_filename = quote(zip_name)
 
-            async def stream_file():
-                yield zip_content.getvalue()
-
+            # The archive is written as it is sent, so its size is unknown
             return StreamingResponse(
-                stream_file(),
+                zip_stream,
                 media_type="application/zip",
                 headers={
                     "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}",
-                    "Content-Length": str(zip_size),
                 },
             )
 
@@ -1154,6 +1171,11 @@ class DocumentsRouter(BaseRouterV3):
         @self.base_endpoint
         async def get_document_file(
             id: str = Path(..., description="Document ID"),
+            range_header: Optional[str] = Header(
+                None,
+                alias="Range",
+                description="Optional single byte range, e.g. `bytes=0-1023`.",
+            ),
             auth_user=Depends(self.providers.auth.auth_wrapper()),
         ) -> StreamingResponse:
             """
@@ -1162,6 +1184,9 @@ class DocumentsRouter(BaseRouterV3):
             For uploaded files, returns the original file with its proper MIME type.
             For text-only documents, returns the content as plain text.
 
+            A `Range` header with a single byte range returns just that part
+            of the file with status 206, so interrupted downloads can resume.
+
             Users can only download documents they own or have access to through collections.
             """
             try:
@@ -1221,28 +1246,34 @@ class DocumentsRouter(BaseRouterV3):
             if not file_tuple:
                 raise R2RException(status_code=404, message="File not found.")
 
-            file_name, file_content, file_size = file_tuple
+            file_name, file_stream, file_size = file_tuple
             encoded_filename = quote(file_name)
 
             mime_type, _ = mimetypes.guess_type(file_name)
             if not mime_type:
                 mime_type = "application/octet-stream"
 
-            async def file_stream():
-                chunk_size = 1024 * 1024  # 1MB
-                while True:
-                    data = file_content.read(chunk_size)
-                    if not data:
-                        break
-                    yield data
+            headers = {
+                "Content-Disposition": f"inline; filename*=UTF-8''{encoded_filename}",
+                "Accept-Ranges": "bytes",
+            }
+            byte_range = self._parse_byte_range(range_header, file_size)
+            if byte_range is None:
+                headers["Content-Length"] = str(file_size)
+                return StreamingResponse(
+                    file_stream(0, None),
+                    media_type=mime_type,
+                    headers=headers,
+                )
 
+            start, end = byte_range
+            headers["Content-Length"] = str(end - start)
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{file_size}"
             return StreamingResponse(
-                file_stream(),
+                file_stream(start, end),
+                status_code=206,
                 media_type=mime_type,
-                headers={
-                    "Content-Disposition": f"inline; filename*=UTF-8''{encoded_filename}",
-                    "Content-Length": str(file_size),
-                },
+                headers=headers,
             )
 
         @self.router.delete(
@@ -2238,12 +2269,41 @@ class DocumentsRouter(BaseRouterV3):
             return results  # type: ignore
 
     @staticmethod
-    async def _process_file(file):
-        import base64
-
-        content = await file.read()
-        return {
-            "filename": file.filename,
-            "content": base64.b64encode(content).decode("utf-8"),
-            "content_type": file.content_type,
-        }
+    def _parse_byte_range(
+        header: Optional[str], size: int
+    ) -> Optional[tuple[int, int]]:
+        """
+        The [start, end) byte range requested by a `Range` header, or None
+        to send the whole file. Malformed and multi-range headers are
+        ignored, as HTTP allows.
+        """
+        if not header or not header.startswith("bytes="):
+            return None
+        spec = header.removeprefix("bytes=").strip()
+        if "," in spec or "-" not in spec:
+            return None
+        first, last = (part.strip() for part in spec.split("-", 1))
+        if not (first or last) or not all(
+            part.isdigit() for part in (first, last) if part
+        ):
+            return None
+        if not first:
+            # A suffix range: the last `last` bytes
+            start, end = max(size - int(last), 0), size
+        else:
+            start = int(first)
+            if last and int(last) < start:
+                return None
+            end = min(int(last) + 1, size) if last else size
+        if start >= size:
+            raise R2RException(
+                status_code=416,
+                message=f"Requested range not satisfiable for {size} bytes.",
+            )
+        return start, end
+
+    @staticmethod
+    async def _iter_upload(file: UploadFile):
+        """Reads an upload in chunks; Starlette spools large ones to disk."""
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
@@ -44,6 +44,7 @@ async def lifespan(app: FastAPI):
 
     # # Shutdown
     scheduler.shutdown()
+    r2r_app.services.ingestion.providers.ingestion.shutdown()
 
 
 async def create_r2r_app(
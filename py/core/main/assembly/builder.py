@@ -16,6 +16,7 @@ from ..api.v3.users_router import UsersRouter
 from ..app import R2RApp
 from ..config import R2RConfig
 from ..services.auth_service import AuthService  # noqa: F401
+from ..services.chunk_quota_service import ChunkQuotaService  # noqa: F401
 from ..services.graph_service import GraphService  # noqa: F401
 from ..services.ingestion_service import IngestionService  # noqa: F401
 from ..services.management_service import ManagementService  # noqa: F401
@@ -26,7 +27,19 @@ logger = logging.getLogger()
 
 
 class R2RBuilder:
-    _SERVICES = ["auth", "ingestion", "management", "retrieval", "graph"]
+    _SERVICES = [
+        "auth",
+        "chunk_quota",
+        "ingestion",
+        "management",
+        "retrieval",
+        "graph",
+    ]
+    # Services handed to another service, created before it
+    _SERVICE_DEPENDENCIES = {
+        "ingestion": ["chunk_quota"],
+        "management": ["chunk_quota"],
+    }
 
     def __init__(self, config: R2RConfig):
         self.config = config
@@ -122,10 +135,21 @@ class R2RBuilder:
 
     def _create_services(self, service_params: dict[str, Any]) -> R2RServices:
         services = R2RBuilder._SERVICES
-        service_instances = {}
+        service_instances: dict[str, Any] = {}
 
         for service_type in services:
-            service_class = globals()[f"{service_type.capitalize()}Service"]
-            service_instances[service_type] = service_class(**service_params)
+            class_name = "".join(
+                part.capitalize() for part in service_type.split("_")
+            )
+            service_class = globals()[f"{class_name}Service"]
+            dependencies = {
+                name: service_instances[name]
+                for name in R2RBuilder._SERVICE_DEPENDENCIES.get(
+                    service_type, []
+                )
+            }
+            service_instances[service_type] = service_class(
+                **service_params, **dependencies
+            )
 
         return R2RServices(**service_instances)
@@ -12,6 +12,7 @@ from core.base import (
     EmailConfig,
     EmbeddingConfig,
     EmbeddingProvider,
+    FileConfig,
     IngestionConfig,
     OrchestrationConfig,
 )
@@ -30,16 +31,20 @@ from core.providers import (
     JwtAuthProvider,
     LiteLLMCompletionProvider,
     LiteLLMEmbeddingProvider,
+    LocalFileStorageProvider,
     NaClCryptoConfig,
     NaClCryptoProvider,
     OllamaEmbeddingProvider,
     OpenAICompletionProvider,
     OpenAIEmbeddingProvider,
     PostgresDatabaseProvider,
+    PostgresEmbeddingCache,
+    PostgresFileStorageProvider,
     R2RAuthProvider,
     R2RCompletionProvider,
     R2RIngestionConfig,
     R2RIngestionProvider,
+    S3FileStorageProvider,
     SendGridEmailProvider,
     SimpleOrchestrationProvider,
     SupabaseAuthProvider,
@@ -254,6 +259,30 @@ class R2RProviderFactory:
             raise ValueError("Language model provider not found")
         return llm_provider
 
+    @staticmethod
+    def create_file_provider(
+        file_config: FileConfig,
+        database_provider: PostgresDatabaseProvider,
+        *args,
+        **kwargs,
+    ) -> (
+        PostgresFileStorageProvider
+        | LocalFileStorageProvider
+        | S3FileStorageProvider
+    ):
+        if file_config.provider == "postgres":
+            return PostgresFileStorageProvider(
+                file_config, database_provider.connection_manager
+            )
+        elif file_config.provider == "local":
+            return LocalFileStorageProvider(file_config)
+        elif file_config.provider == "s3":
+            return S3FileStorageProvider(file_config)
+        else:
+            raise ValueError(
+                f"File storage provider {file_config.provider} not supported."
+            )
+
     @staticmethod
     async def create_email_provider(
         email_config: Optional[EmailConfig] = None, *args, **kwargs
@@ -288,6 +317,11 @@ class R2RProviderFactory:
             BCryptCryptoProvider | NaClCryptoProvider
         ] = None,
         database_provider_override: Optional[PostgresDatabaseProvider] = None,
+        file_provider_override: Optional[
+            PostgresFileStorageProvider
+            | LocalFileStorageProvider
+            | S3FileStorageProvider
+        ] = None,
         email_provider_override: Optional[
             AsyncSMTPEmailProvider
             | ConsoleMockEmailProvider
@@ -354,6 +388,23 @@ class R2RProviderFactory:
             )
         )
 
+        file_provider = file_provider_override or self.create_file_provider(
+            self.config.file, database_provider, *args, **kwargs
+        )
+        if not isinstance(file_provider, PostgresFileStorageProvider):
+            database_provider.files_handler.storage = file_provider
+
+        for provider, embedding_config in (
+            (embedding_provider, self.config.embedding),
+            (completion_embedding_provider, self.config.completion_embedding),
+        ):
+            if embedding_config.cache_backend == "postgres":
+                provider.cache = PostgresEmbeddingCache(
+                    database_provider.embedding_cache_handler,
+                    max_entries=embedding_config.cache_max_entries,
+                    ttl_seconds=embedding_config.cache_ttl_seconds,
+                )
+
         ingestion_provider = (
             ingestion_provider_override
             or self.create_ingestion_provider(
@@ -392,6 +443,7 @@ class R2RProviderFactory:
         return R2RProviders(
             auth=auth_provider,
             database=database_provider,
+            file=file_provider,
             embedding=embedding_provider,
             completion_embedding=completion_embedding_provider,
             ingestion=ingestion_provider,
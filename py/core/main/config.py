@@ -14,6 +14,7 @@ from ..base.providers.crypto import CryptoConfig
 from ..base.providers.database import DatabaseConfig
 from ..base.providers.email import EmailConfig
 from ..base.providers.embedding import EmbeddingConfig
+from ..base.providers.file import FileConfig
 from ..base.providers.ingestion import IngestionConfig
 from ..base.providers.llm import CompletionConfig
 from ..base.providers.orchestration import OrchestrationConfig
@@ -61,6 +62,7 @@ class R2RConfig:
         "ingestion": ["provider"],
         "logging": ["provider", "log_table"],
         "database": ["provider"],
+        "file": ["provider"],
         "agent": ["generation_config"],
         "orchestration": ["provider"],
     }
@@ -73,6 +75,7 @@ class R2RConfig:
     embedding: EmbeddingConfig
     completion_embedding: EmbeddingConfig
     email: EmailConfig
+    file: FileConfig
     ingestion: IngestionConfig
     agent: AgentConfig
     orchestration: OrchestrationConfig
@@ -110,6 +113,7 @@ class R2RConfig:
         self.crypto = CryptoConfig.create(**self.crypto, app=self.app)  # type: ignore
         self.email = EmailConfig.create(**self.email, app=self.app)  # type: ignore
         self.database = DatabaseConfig.create(**self.database, app=self.app)  # type: ignore
+        self.file = FileConfig.create(**self.file, app=self.app)  # type: ignore
         self.embedding = EmbeddingConfig.create(**self.embedding, app=self.app)  # type: ignore
         self.completion_embedding = EmbeddingConfig.create(
             **self.completion_embedding, app=self.app
@@ -304,8 +304,14 @@ def hatchet_graph_search_results_factory(
                 id=collection_id,
                 status_type="graph_cluster_status",
             )
+            incremental = input_data["graph_enrichment_settings"].get(
+                "incremental_communities", False
+            )
 
-            if workflow_status == GraphConstructionStatus.SUCCESS:
+            if (
+                workflow_status == GraphConstructionStatus.SUCCESS
+                and not incremental
+            ):
                 raise R2RException(
                     "Communities have already been built for this collection. To build communities again, first reset the graph.",
                     400,
@@ -323,7 +329,11 @@ def hatchet_graph_search_results_factory(
                     "num_communities"
                 ][0]
 
-                if num_communities == 0:
+                updating = (
+                    incremental
+                    and workflow_status == GraphConstructionStatus.SUCCESS
+                )
+                if num_communities == 0 and not updating:
                     raise R2RException("No communities found", 400)
 
                 return {
@@ -355,8 +365,15 @@ def hatchet_graph_search_results_factory(
                 "graph_search_results_clustering"
             )["result"]["num_communities"][0]
 
-            # Calculate batching
-            parallel_communities = min(100, num_communities)
+            # Calculate batching; an incremental run is worked out and
+            # applied as a whole
+            parallel_communities = (
+                max(num_communities, 1)
+                if input_data["graph_enrichment_settings"].get(
+                    "incremental_communities", False
+                )
+                else min(100, num_communities)
+            )
             total_workflows = math.ceil(num_communities / parallel_communities)
             workflows = []
 
@@ -4,7 +4,6 @@ import uuid
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-import tiktoken
 from fastapi import HTTPException
 from hatchet_sdk import ConcurrencyLimitStrategy, Context
 from litellm import AuthenticationError
@@ -18,6 +17,7 @@ from core.base import (
 )
 from core.base.abstractions import DocumentResponse, R2RException
 from core.utils import (
+    count_tokens_batch,
     generate_default_user_collection_id,
     update_settings_from_dict,
 )
@@ -30,16 +30,6 @@ if TYPE_CHECKING:
 logger = logging.getLogger()
 
 
-def count_tokens_for_text(text: str, model: str = "gpt-4o") -> int:
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        # Fallback to a known encoding if model not recognized
-        encoding = tiktoken.get_encoding("cl100k_base")
-
-    return len(encoding.encode(text, disallowed_special=()))
-
-
 def hatchet_ingestion_factory(
     orchestration_provider: OrchestrationProvider, service: IngestionService
 ) -> dict[str, "Hatchet.Workflow"]:
@@ -99,6 +89,9 @@ def hatchet_ingestion_factory(
                 )
 
                 ingestion_config = parsed_data["ingestion_config"] or {}
+                diff = await self.ingestion_service.start_chunk_diff(
+                    document_info, ingestion_config
+                )
                 extractions_generator = self.ingestion_service.parse_file(
                     document_info, ingestion_config
                 )
@@ -108,13 +101,16 @@ def hatchet_ingestion_factory(
                     extractions.append(extraction)
 
                 # 2) Sum tokens
-                total_tokens = 0
-                for chunk in extractions:
-                    text_data = chunk.data
-                    if not isinstance(text_data, str):
-                        text_data = text_data.decode("utf-8", errors="ignore")
-                    total_tokens += count_tokens_for_text(text_data)
-                document_info.total_tokens = total_tokens
+                document_info.total_tokens = sum(
+                    count_tokens_batch(
+                        (
+                            chunk.data
+                            if isinstance(chunk.data, str)
+                            else chunk.data.decode("utf-8", errors="ignore")
+                        )
+                        for chunk in extractions
+                    )
+                )
 
                 if not ingestion_config.get("skip_document_summary", False):
                     await service.update_document_status(
@@ -132,17 +128,25 @@ def hatchet_ingestion_factory(
 
                 # extractions = context.step_output("parse")["extractions"]
 
+                embedding_reuse: dict[UUID, dict] = {}
                 embedding_generator = self.ingestion_service.embed_document(
-                    [extraction.to_dict() for extraction in extractions]
+                    [
+                        extraction.to_dict()
+                        for extraction in extractions
+                        if not diff.keep(extraction)
+                    ],
+                    embedding_reuse=embedding_reuse,
                 )
 
                 embeddings = []
                 async for embedding in embedding_generator:
                     embeddings.append(embedding)
 
+                reuse = embedding_reuse.get(document_info.id)
                 await self.ingestion_service.update_document_status(
                     document_info,
                     status=IngestionStatus.STORING,
+                    metadata={"embedding_reuse": reuse} if reuse else None,
                 )
 
                 storage_generator = self.ingestion_service.store_embeddings(  # type: ignore
@@ -152,6 +156,9 @@ def hatchet_ingestion_factory(
                 async for _ in storage_generator:
                     pass
 
+                await self.ingestion_service.finish_chunk_diff(
+                    document_info, diff
+                )
                 await self.ingestion_service.finalize_ingestion(document_info)
 
                 await self.ingestion_service.update_document_status(
@@ -381,13 +388,16 @@ def hatchet_ingestion_factory(
             ]
 
             # 2) Sum tokens
-            total_tokens = 0
-            for chunk in extractions:
-                text_data = chunk["data"]
-                if not isinstance(text_data, str):
-                    text_data = text_data.decode("utf-8", errors="ignore")
-                total_tokens += count_tokens_for_text(text_data)
-            document_info.total_tokens = total_tokens
+            document_info.total_tokens = sum(
+                count_tokens_batch(
+                    (
+                        chunk["data"]
+                        if isinstance(chunk["data"], str)
+                        else chunk["data"].decode("utf-8", errors="ignore")
+                    )
+                    for chunk in extractions
+                )
+            )
 
             return {
                 "status": "Successfully ingested chunks",
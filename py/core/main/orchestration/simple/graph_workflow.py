@@ -152,7 +152,13 @@ def simple_graph_search_results_factory(service: GraphService):
             id=input_data.get("collection_id", None),
             status_type="graph_cluster_status",
         )
-        if workflow_status == GraphConstructionStatus.SUCCESS:
+        incremental = input_data["graph_enrichment_settings"].get(
+            "incremental_communities", False
+        )
+        if (
+            workflow_status == GraphConstructionStatus.SUCCESS
+            and not incremental
+        ):
             raise R2RException(
                 "Communities have already been built for this collection. To build communities again, first submit a POST request to `graphs/{collection_id}/reset` to erase the previously built communities.",
                 400,
@@ -168,10 +174,19 @@ def simple_graph_search_results_factory(service: GraphService):
             # TODO - Do not hardcode the number of parallel communities,
             # make it a configurable parameter at runtime & add server-side defaults
 
-            if num_communities == 0:
+            updating = (
+                incremental
+                and workflow_status == GraphConstructionStatus.SUCCESS
+            )
+            if num_communities == 0 and not updating:
                 raise R2RException("No communities found", 400)
 
-            parallel_communities = min(100, num_communities)
+            # An incremental run is worked out and applied as a whole
+            parallel_communities = (
+                max(num_communities, 1)
+                if incremental
+                else min(100, num_communities)
+            )
 
             total_workflows = math.ceil(num_communities / parallel_communities)
             for i in range(total_workflows):
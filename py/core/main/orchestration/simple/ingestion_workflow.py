@@ -1,18 +1,21 @@
 import asyncio
 import logging
+from typing import Any, AsyncGenerator
 from uuid import UUID
 
-import tiktoken
 from fastapi import HTTPException
 from litellm import AuthenticationError
 
 from core.base import (
     DocumentChunk,
+    DocumentResponse,
     GraphConstructionStatus,
+    IngestionStatus,
     R2RException,
     increment_version,
 )
 from core.utils import (
+    count_tokens_for_text,
     generate_default_user_collection_id,
     generate_extraction_id,
     update_settings_from_dict,
@@ -23,14 +26,99 @@ from ...services import IngestionService
 logger = logging.getLogger()
 
 
-def count_tokens_for_text(text: str, model: str = "gpt-4o") -> int:
+_END_OF_STAGE = object()
+
+
+async def _drain(queue: asyncio.Queue) -> AsyncGenerator[Any, None]:
+    while (item := await queue.get()) is not _END_OF_STAGE:
+        yield item
+
+
+async def run_ingestion_pipeline(
+    service: IngestionService,
+    document_info: DocumentResponse,
+    ingestion_config: dict,
+) -> None:
+    """
+    Parses, embeds and stores a document as three concurrent stages joined
+    by bounded queues. A stage blocks while its output queue is full, so the
+    number of chunks held in memory stays flat and throughput is set by the
+    slowest stage. The document summary is generated from the leading chunks
+    once parsing is done, while embedding carries on. Chunks a previous
+    version of the document already stored are kept and skip both queues;
+    the chunks it no longer has are only removed once every new chunk has
+    been stored.
+    """
+    queue_size = service.config.ingestion.pipeline_queue_size
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    vectors: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    parsed = asyncio.Event()
+    diff = await service.start_chunk_diff(document_info, ingestion_config)
+
+    async def parse() -> None:
+        summary_chunks: list[dict] = []
+        total_tokens = 0
+        async for extraction in service.parse_file(
+            document_info, ingestion_config
+        ):
+            kept = diff.keep(extraction)
+            chunk = extraction.model_dump()
+            text_data = chunk["data"]
+            if not isinstance(text_data, str):
+                text_data = text_data.decode("utf-8", errors="ignore")
+            total_tokens += count_tokens_for_text(text_data)
+            if (
+                len(summary_chunks)
+                < service.config.ingestion.chunks_for_document_summary
+            ):
+                summary_chunks.append(chunk)
+            if not kept:
+                await chunks.put(chunk)
+        await chunks.put(_END_OF_STAGE)
+        document_info.total_tokens = total_tokens
+
+        if not ingestion_config.get("skip_document_summary", False):
+            await service.update_document_status(
+                document_info, status=IngestionStatus.AUGMENTING
+            )
+            await service.augment_document_info(document_info, summary_chunks)
+
+        await service.update_document_status(
+            document_info, status=IngestionStatus.EMBEDDING
+        )
+        parsed.set()
+
+    async def embed() -> None:
+        embedding_reuse: dict[UUID, dict] = {}
+        async for vector_entry in service.embed_document(
+            _drain(chunks), embedding_reuse=embedding_reuse
+        ):
+            await vectors.put(vector_entry)
+        await vectors.put(_END_OF_STAGE)
+
+        await parsed.wait()
+        reuse = embedding_reuse.get(document_info.id)
+        await service.update_document_status(
+            document_info,
+            status=IngestionStatus.STORING,
+            metadata={"embedding_reuse": reuse} if reuse else None,
+        )
+
+    async def store() -> None:
+        async for _ in service.store_embeddings(_drain(vectors)):
+            pass
+
+    stages = [asyncio.create_task(stage()) for stage in (parse, embed, store)]
     try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        # Fallback to a known encoding if model not recognized
-        encoding = tiktoken.get_encoding("cl100k_base")
+        await asyncio.gather(*stages)
+    except BaseException:
+        # A failed stage would leave its neighbours blocked on a queue
+        for stage in stages:
+            stage.cancel()
+        await asyncio.gather(*stages, return_exceptions=True)
+        raise
 
-    return len(encoding.encode(text, disallowed_special=()))
+    await service.finish_chunk_diff(document_info, diff)
 
 
 def simple_ingestion_factory(service: IngestionService):
@@ -60,44 +148,9 @@ def simple_ingestion_factory(service: IngestionService):
             )
 
             ingestion_config = parsed_data["ingestion_config"]
-            extractions_generator = service.parse_file(
-                document_info, ingestion_config
-            )
-            extractions = [
-                extraction.model_dump()
-                async for extraction in extractions_generator
-            ]
-
-            # 2) Sum tokens
-            total_tokens = 0
-            for chunk_dict in extractions:
-                text_data = chunk_dict["data"]
-                if not isinstance(text_data, str):
-                    text_data = text_data.decode("utf-8", errors="ignore")
-                total_tokens += count_tokens_for_text(text_data)
-            document_info.total_tokens = total_tokens
-
-            if not ingestion_config.get("skip_document_summary", False):
-                await service.update_document_status(
-                    document_info, status=IngestionStatus.AUGMENTING
-                )
-                await service.augment_document_info(document_info, extractions)
-
-            await service.update_document_status(
-                document_info, status=IngestionStatus.EMBEDDING
+            await run_ingestion_pipeline(
+                service, document_info, ingestion_config
             )
-            embedding_generator = service.embed_document(extractions)
-            embeddings = [
-                embedding.model_dump()
-                async for embedding in embedding_generator
-            ]
-
-            await service.update_document_status(
-                document_info, status=IngestionStatus.STORING
-            )
-            storage_generator = service.store_embeddings(embeddings)
-            async for _ in storage_generator:
-                pass
 
             await service.finalize_ingestion(document_info)
 
@@ -1,4 +1,5 @@
 from .auth_service import AuthService
+from .chunk_quota_service import ChunkQuotaService
 from .graph_service import GraphService
 from .ingestion_service import IngestionService, IngestionServiceAdapter
 from .management_service import ManagementService
@@ -6,6 +7,7 @@ from .retrieval_service import RetrievalService
 
 __all__ = [
     "AuthService",
+    "ChunkQuotaService",
     "IngestionService",
     "IngestionServiceAdapter",
     "ManagementService",
@@ -0,0 +1,67 @@
+from typing import Iterable, Optional
+from uuid import UUID
+
+from core.base import VectorEntry
+
+from .base import Service
+
+
+class ChunkQuota:
+    """
+    Chunk allowance of the owners seen during one ingestion.
+
+    Each owner's limit is resolved and their usage read once, on first use;
+    afterwards admission is decided locally. The counter triggers in the
+    database remain the authority when ingestions for the same owner run
+    concurrently.
+    """
+
+    def __init__(self, service: "ChunkQuotaService"):
+        self.service = service
+        self.max_chunks: dict[UUID, Optional[int]] = {}
+        self.used_chunks: dict[UUID, int] = {}
+
+    async def try_reserve(self, owner_id: UUID) -> bool:
+        """Claims room for one more chunk owned by `owner_id`."""
+        if owner_id not in self.max_chunks:
+            handler = self.service.providers.database.chunk_quotas_handler
+            max_chunks = await self.service.get_max_chunks(owner_id)
+            self.max_chunks[owner_id] = max_chunks
+            self.used_chunks[owner_id] = await handler.set_max_chunks(
+                owner_id, max_chunks
+            )
+
+        max_chunks = self.max_chunks[owner_id]
+        if max_chunks is not None and self.used_chunks[owner_id] >= max_chunks:
+            return False
+        self.used_chunks[owner_id] += 1
+        return True
+
+    async def release(self, entries: Iterable[VectorEntry]) -> None:
+        """
+        Re-reads the usage of the owners of `entries` after they failed to
+        store, dropping the room claimed for them.
+        """
+        for owner_id in {entry.owner_id for entry in entries}:
+            self.used_chunks[owner_id] = await self.service.get_chunk_count(
+                owner_id
+            )
+
+
+class ChunkQuotaService(Service):
+    """Resolves and enforces per-owner chunk limits."""
+
+    async def get_max_chunks(self, owner_id: UUID) -> Optional[int]:
+        user = await self.providers.database.users_handler.get_user_by_id(
+            owner_id
+        )
+        if user.limits_overrides and "max_chunks" in user.limits_overrides:
+            return user.limits_overrides["max_chunks"]
+        return self.config.app.default_max_chunks_per_user
+
+    async def get_chunk_count(self, owner_id: UUID) -> int:
+        handler = self.providers.database.chunk_quotas_handler
+        return await handler.get_chunk_count(owner_id)
+
+    def start_ingestion(self) -> ChunkQuota:
+        return ChunkQuota(self)
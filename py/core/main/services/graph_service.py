@@ -1,4 +1,5 @@
 import asyncio
+import hashlib
 import logging
 import math
 import random
@@ -6,7 +7,9 @@ import re
 import time
 import uuid
 import xml.etree.ElementTree as ET
-from typing import Any, AsyncGenerator, Coroutine, Optional
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, Coroutine, Iterable, Optional
 from uuid import UUID
 from xml.etree.ElementTree import Element
 
@@ -47,6 +50,153 @@ async def _collect_async_results(result_gen: AsyncGenerator) -> list[Any]:
     return results
 
 
+def _truncate_info(info_list: list[str], max_length: int) -> str:
+    """
+    Shuffles lines of info to try to keep them distinct, then accumulates
+    until hitting max_length.
+    """
+    random.shuffle(info_list)
+    truncated_info = ""
+    current_length = 0
+    for info in info_list:
+        if current_length + len(info) > max_length:
+            break
+        truncated_info += info + "\n"
+        current_length += len(info)
+    return truncated_info
+
+
+class CommunityIndex:
+    """
+    The entities and relationships of a graph keyed by entity name, so the
+    contents of each community are looked up rather than scanned for.
+
+    Lookups return items in the order they were given, as a scan would.
+    """
+
+    def __init__(
+        self, entities: list[Entity], relationships: list[Relationship]
+    ):
+        self._entities = entities
+        self._relationships = relationships
+        self._entities_by_name: dict[str, list[int]] = defaultdict(list)
+        for position, entity in enumerate(entities):
+            self._entities_by_name[entity.name].append(position)
+        self._edges_by_subject: dict[str, list[int]] = defaultdict(list)
+        for position, relationship in enumerate(relationships):
+            self._edges_by_subject[relationship.subject].append(position)
+
+    def community(
+        self, nodes: list[str]
+    ) -> tuple[list[Entity], list[Relationship]]:
+        """
+        The entities named by `nodes` and the relationships between them.
+        """
+        members = set(nodes)
+        entity_positions = sorted(
+            position
+            for name in members
+            for position in self._entities_by_name.get(name, ())
+        )
+        edge_positions = sorted(
+            position
+            for name in members
+            for position in self._edges_by_subject.get(name, ())
+            if self._relationships[position].object in members
+        )
+        return (
+            [self._entities[position] for position in entity_positions],
+            [self._relationships[position] for position in edge_positions],
+        )
+
+    def fingerprint(self, nodes: Iterable[str]) -> str:
+        """
+        A digest of the ids of a community's entities and relationships,
+        which changes whenever its summary input could.
+        """
+        entities, relationships = self.community(list(nodes))
+        ids = sorted(str(entity.id) for entity in entities)
+        ids += sorted(str(relationship.id) for relationship in relationships)
+        return hashlib.sha256("\n".join(ids).encode("utf-8")).hexdigest()
+
+
+class CommunityUpdate:
+    """
+    The part of a graph an incremental clustering run has to revisit.
+
+    A stored community is affected when one of its members is an endpoint
+    of a relationship added since the last run, or when its fingerprint no
+    longer matches: entities or relationships between its members were
+    added or removed. Communities stored without their members are always
+    affected. The nodes of the affected communities, along with nodes that
+    are in no community yet, are clustered again; every other community
+    and its summary is kept as it is.
+    """
+
+    def __init__(
+        self,
+        stored: list[tuple[UUID, dict]],
+        index: CommunityIndex,
+        relationships: list[Relationship],
+        new_edges: list[tuple[str, str]],
+    ):
+        touched = {node for edge in new_edges for node in edge}
+        clustered: set[str] = set()
+        self.affected: dict[frozenset[str], list[UUID]] = defaultdict(list)
+        self._fingerprints: dict[UUID, Optional[str]] = {}
+        for community_id, metadata in stored:
+            members = frozenset(metadata.get("nodes") or ())
+            clustered |= members
+            if (
+                not members
+                or members & touched
+                or index.fingerprint(members) != metadata.get("fingerprint")
+            ):
+                self.affected[members].append(community_id)
+                self._fingerprints[community_id] = metadata.get("fingerprint")
+
+        graph_nodes = {
+            node for r in relationships for node in (r.subject, r.object)
+        }
+        self.nodes = touched | (graph_nodes - clustered)
+        for members in self.affected:
+            self.nodes |= members
+        self.kept: list[UUID] = []
+
+    def subgraph(
+        self, relationships: list[Relationship]
+    ) -> list[Relationship]:
+        """The relationships between the nodes to cluster again."""
+        return [
+            r
+            for r in relationships
+            if r.subject in self.nodes and r.object in self.nodes
+        ]
+
+    def keep(self, nodes: list[str], fingerprint: str) -> bool:
+        """
+        Whether a re-clustered community is one of the affected ones
+        unchanged, in which case the stored community is kept.
+        """
+        for community_id in self.affected.get(frozenset(nodes), ()):
+            if (
+                community_id not in self.kept
+                and self._fingerprints[community_id] == fingerprint
+            ):
+                self.kept.append(community_id)
+                return True
+        return False
+
+    @property
+    def removed(self) -> list[UUID]:
+        return [
+            community_id
+            for community_ids in self.affected.values()
+            for community_id in community_ids
+            if community_id not in self.kept
+        ]
+
+
 class GraphService(Service):
     def __init__(
         self,
@@ -57,6 +207,11 @@ class GraphService(Service):
             config,
             providers,
         )
+        # Shared by every graph job so they cannot starve other LLM traffic
+        settings = providers.database.config.graph_creation_settings
+        self._description_requests = asyncio.Semaphore(
+            max(1, settings.description_concurrent_requests)
+        )
 
     @telemetry_event("create_entity")
     async def create_entity(
@@ -67,7 +222,7 @@ class GraphService(Service):
         category: Optional[str] = None,
         metadata: Optional[dict] = None,
     ) -> Entity:
-        description_embedding = str(
+        description_embedding = (
             await self.providers.embedding.async_get_embedding(description)
         )
 
@@ -92,7 +247,7 @@ class GraphService(Service):
     ) -> Entity:
         description_embedding = None
         if description is not None:
-            description_embedding = str(
+            description_embedding = (
                 await self.providers.embedding.async_get_embedding(description)
             )
 
@@ -152,7 +307,7 @@ class GraphService(Service):
     ) -> Relationship:
         description_embedding = None
         if description:
-            description_embedding = str(
+            description_embedding = (
                 await self.providers.embedding.async_get_embedding(description)
             )
 
@@ -201,7 +356,7 @@ class GraphService(Service):
     ) -> Relationship:
         description_embedding = None
         if description is not None:
-            description_embedding = str(
+            description_embedding = (
                 await self.providers.embedding.async_get_embedding(description)
             )
 
@@ -249,7 +404,7 @@ class GraphService(Service):
         rating: Optional[float],
         rating_explanation: Optional[str],
     ) -> Community:
-        description_embedding = str(
+        description_embedding = (
             await self.providers.embedding.async_get_embedding(summary)
         )
         return await self.providers.database.graphs_handler.communities.create(
@@ -275,7 +430,7 @@ class GraphService(Service):
     ) -> Community:
         summary_embedding = None
         if summary is not None:
-            summary_embedding = str(
+            summary_embedding = (
                 await self.providers.embedding.async_get_embedding(summary)
             )
 
@@ -451,7 +606,7 @@ class GraphService(Service):
     ) -> AsyncGenerator[str, None]:
         """
         Core logic that replaces GraphDescriptionPipe._run_logic for a particular document/batch.
-        Yields entity-names or some textual result as each entity is updated.
+        Yields the name of each entity as it is described.
         """
         start_time = time.time()
         logger.info(
@@ -469,60 +624,66 @@ class GraphService(Service):
             f"_describe_entities_in_document_batch: got {total_entities} items in entity_map for doc={document_id}."
         )
 
-        # 2) For each entity name in the map, we gather sub-entities and relationships
-        tasks: list[Coroutine[Any, Any, str]] = []
-        tasks.extend(
-            self._process_entity_for_description(
-                entities=entity_info["entities"],
-                relationships=entity_info["relationships"],
-                document_id=document_id,
-                max_description_input_length=max_description_input_length,
+        # 2) Only entities still missing a description are sent to the LLM,
+        # with their sub-entities and relationships
+        to_describe: list[tuple[Entity, str]] = []
+        for entity_info in entity_map.values():
+            main_entity: Entity = entity_info["entities"][0]
+            if main_entity.description:
+                continue
+            entity_lines = [
+                f"{e.name}, {e.description or 'NONE'}"
+                for e in entity_info["entities"]
+            ]
+            relationship_lines = [
+                f"{i + 1}: {r.subject}, {r.object}, {r.predicate} - Summary: {r.description or ''}"
+                for i, r in enumerate(entity_info["relationships"])
+            ]
+            to_describe.append(
+                (
+                    main_entity,
+                    "Entity Information:\n"
+                    + _truncate_info(
+                        entity_lines, max_description_input_length
+                    )
+                    + "\nRelationship Data:\n"
+                    + _truncate_info(
+                        relationship_lines, max_description_input_length
+                    ),
+                )
             )
-            for entity_name, entity_info in entity_map.items()
-        )
 
-        # 3) Wait for all tasks, yield as they complete
-        idx = 0
-        for coro in asyncio.as_completed(tasks):
-            result = await coro
-            idx += 1
-            if idx % 100 == 0:
-                logger.info(
-                    f"_describe_entities_in_document_batch: {idx}/{total_entities} described for doc={document_id}"
-                )
-            yield result
+        # 3) Describe, embed and store them in batches
+        described = await self._describe_entities(document_id, to_describe)
+        for entity in described:
+            yield entity.name
 
         logger.info(
-            f"Finished describing doc={document_id} batch offset={offset} in {time.time() - start_time:.2f}s."
+            f"Finished describing doc={document_id} batch offset={offset}: {len(described)}/{len(to_describe)} described in {time.time() - start_time:.2f}s."
         )
 
-    async def _process_entity_for_description(
+    async def _describe_entities(
         self,
-        entities: list[Entity],
-        relationships: list[Relationship],
         document_id: UUID,
-        max_description_input_length: int,
-    ) -> str:
+        entities: list[tuple[Entity, str]],
+    ) -> list[Entity]:
         """
-        Adapted from the old process_entity function in GraphDescriptionPipe.
-        If entity has no description, call an LLM to create one, then store it.
-        Returns the name of the top entity (or could store more details).
+        Generates descriptions for `(entity, information)` pairs, packing
+        several entities into each LLM request. The number of requests in
+        flight is bounded across all documents being described. The new
+        descriptions are then embedded in a single batch and written with a
+        single update.
+
+        Returns the entities that were described. An entity the LLM left
+        out, or whose request failed, keeps its description.
         """
+        if not entities:
+            return []
 
-        def truncate_info(info_list: list[str], max_length: int) -> str:
-            """
-            Shuffles lines of info to try to keep them distinct, then accumulates
-            until hitting max_length.
-            """
-            random.shuffle(info_list)
-            truncated_info = ""
-            current_length = 0
-            for info in info_list:
-                if current_length + len(info) > max_length:
-                    break
-                truncated_info += info + "\n"
-                current_length += len(info)
-            return truncated_info
+        settings = self.providers.database.config.graph_creation_settings
+        generation_config = settings.generation_config or GenerationConfig(
+            model=self.config.app.fast_llm
+        )
 
         # Grab a doc-level summary (optional) to feed into the prompt
         response = await self.providers.database.documents_handler.get_documents_overview(
@@ -534,69 +695,73 @@ class GraphService(Service):
             response["results"][0].summary if response["results"] else None
         )
 
-        # Synthesize a minimal “entity info” string + relationship summary
-        entity_info = [
-            f"{e.name}, {e.description or 'NONE'}" for e in entities
-        ]
-        relationships_txt = [
-            f"{i + 1}: {r.subject}, {r.object}, {r.predicate} - Summary: {r.description or ''}"
-            for i, r in enumerate(relationships)
-        ]
-
-        # We'll describe only the first entity for simplicity
-        # or you could do them all if needed
-        main_entity = entities[0]
-
-        if not main_entity.description:
-            # We only call LLM if the entity is missing a description
-            messages = await self.providers.database.prompts_handler.get_message_payload(
-                task_prompt_name=self.providers.database.config.graph_creation_settings.graph_entity_description_prompt,
-                task_inputs={
-                    "document_summary": document_summary,
-                    "entity_info": truncate_info(
-                        entity_info, max_description_input_length
-                    ),
-                    "relationships_txt": truncate_info(
-                        relationships_txt, max_description_input_length
-                    ),
-                },
-            )
+        batch_size = max(1, settings.description_batch_size)
 
-            # Call the LLM
-            gen_config = (
-                self.providers.database.config.graph_creation_settings.generation_config
-                or GenerationConfig(model=self.config.app.fast_llm)
-            )
-            llm_resp = await self.providers.llm.aget_completion(
-                messages=messages,
-                generation_config=gen_config,
+        async def describe(batch: list[tuple[Entity, str]]) -> list[Entity]:
+            entities_txt = "\n\n".join(
+                f'<entity id="{i}">\nName: {entity.name}\n{info}</entity>'
+                for i, (entity, info) in enumerate(batch, 1)
             )
-            new_description = llm_resp.choices[0].message.content
-
-            if not new_description:
+            try:
+                async with self._description_requests:
+                    messages = await self.providers.database.prompts_handler.get_message_payload(
+                        task_prompt_name=settings.graph_entity_descriptions_prompt,
+                        task_inputs={
+                            "document_summary": document_summary,
+                            "entities": entities_txt,
+                        },
+                    )
+                    llm_resp = await self.providers.llm.aget_completion(
+                        messages=messages,
+                        generation_config=generation_config,
+                    )
+            except Exception as e:
                 logger.error(
-                    f"No LLM description returned for entity={main_entity.name}"
+                    f"Failed to describe {len(batch)} entities of doc={document_id}: {e}"
                 )
-                return main_entity.name
-
-            # create embedding
-            embed = (
-                await self.providers.embedding.async_get_embeddings(
-                    [new_description]
+                return []
+
+            descriptions = {
+                int(match.group(1)): match.group(2).strip()
+                for match in re.finditer(
+                    r'<entity id="(\d+)">(.*?)</entity>',
+                    llm_resp.choices[0].message.content or "",
+                    re.DOTALL,
                 )
-            )[0]
+            }
+            described = []
+            for i, (entity, _) in enumerate(batch, 1):
+                if not descriptions.get(i):
+                    logger.error(
+                        f"No LLM description returned for entity={entity.name}"
+                    )
+                    continue
+                entity.description = descriptions[i]
+                described.append(entity)
+            return described
+
+        results = await asyncio.gather(
+            *(
+                describe(entities[start : start + batch_size])
+                for start in range(0, len(entities), batch_size)
+            )
+        )
+        described = [entity for batch in results for entity in batch]
+        if not described:
+            return []
 
-            # update DB
-            main_entity.description = new_description
-            main_entity.description_embedding = embed
+        embeddings = await self.providers.embedding.async_get_embeddings(
+            [entity.description or "" for entity in described]
+        )
+        for entity, embedding in zip(described, embeddings, strict=True):
+            entity.description_embedding = embedding
 
-            # Use a method to upsert entity in `documents_entities` or your table
-            await self.providers.database.graphs_handler.add_entities(
-                [main_entity],
-                table_name="documents_entities",
+        await (
+            self.providers.database.graphs_handler.update_entity_descriptions(
+                described, store_type=StoreType.DOCUMENTS
             )
-
-        return main_entity.name
+        )
+        return described
 
     @telemetry_event("graph_search_results_clustering")
     async def graph_search_results_clustering(
@@ -604,6 +769,7 @@ class GraphService(Service):
         collection_id: UUID,
         generation_config: GenerationConfig,
         leiden_params: dict,
+        incremental_communities: bool = False,
         **kwargs,
     ):
         """
@@ -618,6 +784,7 @@ class GraphService(Service):
             collection_id=collection_id,
             generation_config=generation_config,
             leiden_params=leiden_params,
+            incremental_communities=incremental_communities,
         )
 
     async def _perform_graph_clustering(
@@ -625,13 +792,52 @@ class GraphService(Service):
         collection_id: UUID,
         generation_config: GenerationConfig,
         leiden_params: dict,
+        incremental_communities: bool = False,
     ) -> dict:
         """
         The actual clustering logic (previously in GraphClusteringPipe.cluster_graph_search_results).
+
+        Incrementally, only the part of the graph whose communities changed
+        is clustered, and no communities means there is nothing to update.
         """
         clustering_mode = (
             self.config.database.graph_creation_settings.clustering_mode
         )
+        if incremental_communities:
+            (
+                all_entities,
+                _,
+            ) = await self.providers.database.graphs_handler.get_entities(
+                parent_id=collection_id,
+                offset=0,
+                limit=-1,
+                include_embeddings=False,
+            )
+            (
+                all_relationships,
+                _,
+            ) = await self.providers.database.graphs_handler.get_relationships(
+                parent_id=collection_id,
+                offset=0,
+                limit=-1,
+                include_embeddings=False,
+            )
+            update = await self._get_community_update(
+                collection_id,
+                CommunityIndex(all_entities, all_relationships),
+                all_relationships,
+            )
+            relationships = update.subgraph(all_relationships)
+            if not relationships:
+                return {"num_communities": (0, [])}
+            num_communities = await self.providers.database.graphs_handler._cluster_and_add_community_info(
+                relationships=relationships,
+                leiden_params=leiden_params,
+                collection_id=collection_id,
+                clustering_mode=clustering_mode,
+            )
+            return {"num_communities": num_communities}
+
         num_communities = await self.providers.database.graphs_handler.perform_graph_clustering(
             collection_id=collection_id,
             leiden_params=leiden_params,
@@ -648,6 +854,7 @@ class GraphService(Service):
         generation_config: GenerationConfig,
         collection_id: UUID | None,
         leiden_params: Optional[dict] = None,
+        incremental_communities: bool = False,
         **kwargs,
     ):
         """
@@ -665,9 +872,42 @@ class GraphService(Service):
             generation_config=generation_config,
             collection_id=collection_id,
             leiden_params=leiden_params or {},
+            incremental_communities=incremental_communities,
         )
         return await _collect_async_results(gen)
 
+    async def _get_community_update(
+        self,
+        collection_id: UUID,
+        index: CommunityIndex,
+        relationships: list[Relationship],
+    ) -> CommunityUpdate:
+        """
+        What an incremental run has to revisit: the whole graph when the
+        collection has no communities yet.
+        """
+        graphs_handler = self.providers.database.graphs_handler
+        stored = await graphs_handler.get_community_memberships(collection_id)
+        if not stored:
+            return CommunityUpdate([], index, relationships, [])
+
+        # Relationships added since the last run; all of them when any
+        # community does not record when it was clustered
+        run_times: list[str] = [
+            metadata["clustered_at"]
+            for _, metadata in stored
+            if metadata.get("clustered_at")
+        ]
+        last_run = (
+            max(map(datetime.fromisoformat, run_times))
+            if len(run_times) == len(stored)
+            else None
+        )
+        new_edges = await graphs_handler.get_relationship_endpoints(
+            collection_id, created_after=last_run
+        )
+        return CommunityUpdate(stored, index, relationships, new_edges)
+
     async def _summarize_communities(
         self,
         offset: int,
@@ -676,10 +916,16 @@ class GraphService(Service):
         generation_config: GenerationConfig,
         collection_id: UUID,
         leiden_params: dict,
+        incremental_communities: bool = False,
     ) -> AsyncGenerator[dict, None]:
         """
         Does the community summary logic from GraphCommunitySummaryPipe._run_logic.
         Yields each summary dictionary as it completes.
+
+        Incrementally, only the nodes of affected communities are clustered
+        again. A resulting community with the same members and contents as
+        an affected one keeps its stored summary; the other affected
+        communities are deleted once the new ones have been summarized.
         """
         start_time = time.time()
         logger.info(
@@ -706,19 +952,36 @@ class GraphService(Service):
             include_embeddings=False,
         )
 
+        index = CommunityIndex(all_entities, all_relationships)
+        update = (
+            await self._get_community_update(
+                collection_id, index, all_relationships
+            )
+            if incremental_communities
+            else None
+        )
+        relationships = (
+            update.subgraph(all_relationships)
+            if update is not None
+            else all_relationships
+        )
+        clustered_at = datetime.now(timezone.utc).isoformat()
+
         # We can optionally re-run the clustering to produce fresh community assignments
         clustering_mode = (
             self.config.database.graph_creation_settings.clustering_mode
         )
-        (
-            _,
-            community_clusters,
-        ) = await self.providers.database.graphs_handler._cluster_and_add_community_info(
-            relationships=all_relationships,
-            leiden_params=leiden_params,
-            collection_id=collection_id,
-            clustering_mode=clustering_mode,
-        )
+        community_clusters: Any = []
+        if relationships:
+            (
+                _,
+                community_clusters,
+            ) = await self.providers.database.graphs_handler._cluster_and_add_community_info(
+                relationships=relationships,
+                leiden_params=leiden_params,
+                collection_id=collection_id,
+                clustering_mode=clustering_mode,
+            )
 
         # Group clusters
         clusters: dict[Any, list[str]] = {}
@@ -735,6 +998,31 @@ class GraphService(Service):
             )
             clusters.setdefault(cluster_id, []).append(node_name)
 
+        # Incremental runs record each community's members and contents
+        communities: list[tuple[list[str], Optional[dict]]] = []
+        for nodes in clusters.values():
+            metadata = None
+            if update is not None:
+                fingerprint = index.fingerprint(nodes)
+                if update.keep(nodes, fingerprint):
+                    continue
+                metadata = {
+                    "nodes": sorted(set(nodes)),
+                    "fingerprint": fingerprint,
+                    "clustered_at": clustered_at,
+                }
+            communities.append((nodes, metadata))
+
+        # fetch the collection description (optional)
+        response = await self.providers.database.collections_handler.get_collections_overview(
+            offset=0,
+            limit=1,
+            filter_collection_ids=[collection_id],
+        )
+        collection_description = (
+            response["results"][0].description if response["results"] else None
+        )
+
         # create an async job for each cluster
         tasks: list[Coroutine[Any, Any, dict]] = []
 
@@ -742,13 +1030,14 @@ class GraphService(Service):
             self._process_community_summary(
                 community_id=uuid.uuid4(),
                 nodes=nodes,
-                all_entities=all_entities,
-                all_relationships=all_relationships,
+                index=index,
+                collection_description=collection_description,
                 max_summary_input_length=max_summary_input_length,
                 generation_config=generation_config,
                 collection_id=collection_id,
+                metadata=metadata,
             )
-            for nodes in clusters.values()
+            for nodes, metadata in communities
         )
 
         total_jobs = len(tasks)
@@ -771,38 +1060,36 @@ class GraphService(Service):
                 f"{total_errors} communities failed summarization out of {total_jobs}"
             )
 
+        if update is not None:
+            # Nodes of communities that failed are in no community now, so
+            # the next incremental run clusters them again
+            await self.providers.database.graphs_handler.retire_communities(
+                collection_id,
+                removed=update.removed,
+                kept=update.kept,
+                clustered_at=clustered_at,
+            )
+            logger.info(
+                f"Incremental community update: {len(update.kept)} kept, {total_jobs - total_errors} summarized, {len(update.removed)} replaced"
+            )
+
     async def _process_community_summary(
         self,
         community_id: UUID,
         nodes: list[str],
-        all_entities: list[Entity],
-        all_relationships: list[Relationship],
+        index: CommunityIndex,
+        collection_description: Optional[str],
         max_summary_input_length: int,
         generation_config: GenerationConfig,
         collection_id: UUID,
+        metadata: Optional[dict] = None,
     ) -> dict:
         """
         Summarize a single community: gather all relevant entities/relationships, call LLM to generate an XML block,
         parse it, store the result as a community in DB.
         """
         # (Equivalent to process_community in old code)
-        # fetch the collection description (optional)
-        response = await self.providers.database.collections_handler.get_collections_overview(
-            offset=0,
-            limit=1,
-            filter_collection_ids=[collection_id],
-        )
-        collection_description = (
-            response["results"][0].description if response["results"] else None
-        )
-
-        # filter out relevant entities / relationships
-        entities = [e for e in all_entities if e.name in nodes]
-        relationships = [
-            r
-            for r in all_relationships
-            if r.subject in nodes and r.object in nodes
-        ]
+        entities, relationships = index.community(nodes)
         if not entities and not relationships:
             return {
                 "community_id": community_id,
@@ -895,7 +1182,7 @@ class GraphService(Service):
 
                 # store it
                 await self.providers.database.graphs_handler.add_community(
-                    community
+                    community, metadata=metadata
                 )
 
                 return {
@@ -1282,51 +1569,10 @@ class GraphService(Service):
         """
         Stores a batch of knowledge graph extractions in the DB.
         """
-        for extraction in graph_search_results_extractions:
-            # Map name->id after creation
-            entities_id_map = {}
-            for e in extraction.entities:
-                result = await self.providers.database.graphs_handler.entities.create(
-                    name=e.name,
-                    parent_id=e.parent_id,
-                    store_type=StoreType.DOCUMENTS,
-                    category=e.category,
-                    description=e.description,
-                    description_embedding=e.description_embedding,
-                    chunk_ids=e.chunk_ids,
-                    metadata=e.metadata,
-                )
-                entities_id_map[e.name] = result.id
-
-            # Insert relationships
-            for rel in extraction.relationships:
-                subject_id = entities_id_map.get(rel.subject)
-                object_id = entities_id_map.get(rel.object)
-                parent_id = rel.parent_id
-
-                if any(
-                    id is None for id in (subject_id, object_id, parent_id)
-                ):
-                    logger.warning(f"Missing ID for relationship: {rel}")
-                    continue
-
-                assert isinstance(subject_id, UUID)
-                assert isinstance(object_id, UUID)
-                assert isinstance(parent_id, UUID)
-
-                await self.providers.database.graphs_handler.relationships.create(
-                    subject=rel.subject,
-                    subject_id=subject_id,
-                    predicate=rel.predicate,
-                    object=rel.object,
-                    object_id=object_id,
-                    parent_id=parent_id,
-                    description=rel.description,
-                    description_embedding=rel.description_embedding,
-                    weight=rel.weight,
-                    metadata=rel.metadata,
-                    store_type=StoreType.DOCUMENTS,
-                )
+        await self.providers.database.graphs_handler.add_extractions(
+            graph_search_results_extractions,
+            store_type=StoreType.DOCUMENTS,
+        )
 
     @telemetry_event("deduplicate_document_entities")
     async def deduplicate_document_entities(
@@ -1341,46 +1587,19 @@ class GraphService(Service):
             store_type=StoreType.DOCUMENTS,
         )
 
-        # Grab doc summary
-        response = await self.providers.database.documents_handler.get_documents_overview(
-            offset=0,
-            limit=1,
-            filter_document_ids=[document_id],
-        )
-        document_summary = (
-            response["results"][0].summary if response["results"] else None
+        # Consolidate the descriptions of each merged entity with the LLM
+        await self._describe_entities(
+            document_id,
+            [
+                (
+                    merged_entity,
+                    "Entity Information:\n"
+                    + "\n".join(
+                        e.description
+                        for e in original_entities
+                        if e.description
+                    ),
+                )
+                for original_entities, merged_entity in merged_results
+            ],
         )
-
-        # For each merged entity
-        for original_entities, merged_entity in merged_results:
-            # Summarize them with LLM
-            entity_info = "\n".join(
-                e.description for e in original_entities if e.description
-            )
-            messages = await self.providers.database.prompts_handler.get_message_payload(
-                task_prompt_name=self.providers.database.config.graph_creation_settings.graph_entity_description_prompt,
-                task_inputs={
-                    "document_summary": document_summary,
-                    "entity_info": f"{merged_entity.name}\n{entity_info}",
-                    "relationships_txt": "",
-                },
-            )
-            gen_config = (
-                self.config.database.graph_creation_settings.generation_config
-                or GenerationConfig(model=self.config.app.fast_llm)
-            )
-            resp = await self.providers.llm.aget_completion(
-                messages, generation_config=gen_config
-            )
-            new_description = resp.choices[0].message.content
-
-            new_embedding = await self.providers.embedding.async_get_embedding(
-                new_description or ""
-            )
-
-            await self.providers.database.graphs_handler.entities.update(
-                entity_id=merged_entity.id,
-                store_type=StoreType.DOCUMENTS,
-                description=new_description,
-                description_embedding=str(new_embedding),
-            )
@@ -1,8 +1,19 @@
 import asyncio
+import hashlib
 import json
 import logging
+import unicodedata
+from collections import defaultdict
 from datetime import datetime
-from typing import Any, AsyncGenerator, Optional, Sequence
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Iterable,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 from uuid import UUID
 
 from fastapi import HTTPException
@@ -12,6 +23,7 @@ from core.base import (
     DocumentChunk,
     DocumentResponse,
     DocumentType,
+    EmbeddingPurpose,
     GenerationConfig,
     IngestionStatus,
     R2RException,
@@ -35,11 +47,82 @@ from shared.abstractions import PDFParsingError, PopplerNotFoundError
 
 from ..abstractions import R2RProviders
 from ..config import R2RConfig
+from .chunk_quota_service import ChunkQuotaService
 
 logger = logging.getLogger()
+
+T = TypeVar("T")
+
+
+async def _iterate(
+    items: Iterable[T] | AsyncIterable[T],
+) -> AsyncGenerator[T, None]:
+    """Iterates a plain or an async iterable alike."""
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
 STARTING_VERSION = "v0"
 
 
+class ChunkDiff:
+    """
+    The stored chunks of a document being re-ingested, matched by exact
+    text against the chunks of the new version as they are parsed.
+
+    A matched chunk keeps its id and vector and only has its metadata
+    replaced; the rest are embedded and stored as usual. Stored chunks left
+    unmatched once parsing is done are removed. With `reuse` off nothing is
+    matched, so the previous version is replaced entirely.
+    """
+
+    def __init__(self, existing: list[tuple[UUID, str]], reuse: bool = True):
+        self._existing_ids = dict.fromkeys(
+            chunk_id for chunk_id, _ in existing
+        )
+        self._unmatched: dict[str, list[UUID]] = defaultdict(list)
+        if reuse:
+            # Identical chunks are matched in order of appearance
+            for chunk_id, content_hash in reversed(existing):
+                self._unmatched[content_hash].append(chunk_id)
+        self.kept: dict[UUID, dict] = {}
+
+    @staticmethod
+    def content_hash(text: str | bytes) -> str:
+        if isinstance(text, str):
+            text = text.encode("utf-8")
+        return hashlib.sha256(text).hexdigest()
+
+    def keep(self, chunk: DocumentChunk) -> bool:
+        """
+        Whether `chunk` is already stored, in which case it takes over the
+        stored chunk's id. Otherwise its id is moved off any stored id.
+        """
+        if not self._existing_ids:
+            return False
+        content_hash = self.content_hash(chunk.data)
+        if matches := self._unmatched.get(content_hash):
+            chunk.id = matches.pop()
+            self.kept[chunk.id] = chunk.metadata
+            return True
+        if chunk.id in self._existing_ids:
+            # Re-ingesting the same version numbers chunks alike
+            chunk.id = generate_id(f"{chunk.id}_{content_hash}")
+        return False
+
+    @property
+    def removed(self) -> list[UUID]:
+        return [
+            chunk_id
+            for chunk_id in self._existing_ids
+            if chunk_id not in self.kept
+        ]
+
+
 class IngestionService:
     """
     A refactored IngestionService that inlines all pipe logic for parsing,
@@ -50,9 +133,11 @@ class IngestionService:
         self,
         config: R2RConfig,
         providers: R2RProviders,
+        chunk_quota: ChunkQuotaService,
     ) -> None:
         self.config = config
         self.providers = providers
+        self.chunk_quota = chunk_quota
 
     @telemetry_event("IngestFile")
     async def ingest_file_ingress(
@@ -230,48 +315,33 @@ class IngestionService:
             )
 
         try:
-            # Pull file from DB
-            retrieved = (
-                await self.providers.database.files_handler.retrieve_file(
-                    document_info.id
-                )
-            )
-            if not retrieved:
-                # No file found in the DB, can't parse
-                raise R2RDocumentProcessingError(
-                    document_id=document_info.id,
-                    error_message="No file content found in DB for this document.",
+            # Memory-mapped when the file storage provider allows it
+            async with self.providers.database.files_handler.open_file(
+                document_info.id
+            ) as (file_name, file_content, file_size):
+                # Build a barebones Document object
+                doc = Document(
+                    id=document_info.id,
+                    collection_ids=document_info.collection_ids,
+                    owner_id=document_info.owner_id,
+                    metadata={
+                        "document_type": document_info.document_type.value,
+                        **document_info.metadata,
+                    },
+                    document_type=document_info.document_type,
                 )
 
-            file_name, file_wrapper, file_size = retrieved
-
-            # Read the content
-            with file_wrapper as file_content_stream:
-                file_content = file_content_stream.read()
-
-            # Build a barebones Document object
-            doc = Document(
-                id=document_info.id,
-                collection_ids=document_info.collection_ids,
-                owner_id=document_info.owner_id,
-                metadata={
-                    "document_type": document_info.document_type.value,
-                    **document_info.metadata,
-                },
-                document_type=document_info.document_type,
-            )
-
-            # Delegate to the ingestion provider to parse
-            async for extraction in self.providers.ingestion.parse(
-                file_content,  # raw bytes
-                doc,
-                ingestion_config_override,
-            ):
-                # Adjust chunk ID to incorporate version
-                # or any other needed transformations
-                extraction.id = generate_id(f"{extraction.id}_{version}")
-                extraction.metadata["version"] = version
-                yield extraction
+                # Delegate to the ingestion provider to parse
+                async for extraction in self.providers.ingestion.parse(
+                    file_content,
+                    doc,
+                    ingestion_config_override,
+                ):
+                    # Adjust chunk ID to incorporate version
+                    # or any other needed transformations
+                    extraction.id = generate_id(f"{extraction.id}_{version}")
+                    extraction.metadata["version"] = version
+                    yield extraction
 
         except (PopplerNotFoundError, PDFParsingError) as e:
             raise R2RDocumentProcessingError(
@@ -287,6 +357,42 @@ class IngestionService:
                 error_message=f"Error parsing document: {str(e)}",
             )
 
+    async def start_chunk_diff(
+        self, document_info: DocumentResponse, ingestion_config: dict | None
+    ) -> ChunkDiff:
+        """
+        Reads the chunks already stored for a document about to be
+        (re-)ingested. Unless `incremental_updates` is off, unchanged chunks
+        of the new version are then kept rather than embedded again.
+        """
+        reuse = (ingestion_config or {}).get("incremental_updates")
+        if reuse is None:
+            reuse = self.config.ingestion.incremental_updates
+        existing = await self.providers.database.chunks_handler.get_document_chunk_hashes(
+            document_info.id
+        )
+        return ChunkDiff(existing, reuse=reuse)
+
+    async def finish_chunk_diff(
+        self, document_info: DocumentResponse, diff: ChunkDiff
+    ) -> None:
+        """
+        Brings the kept chunks' metadata up to the new version and removes
+        the chunks the new version no longer has.
+        """
+        chunks_handler = self.providers.database.chunks_handler
+        removed = diff.removed
+        # Kept chunks stay enriched
+        await chunks_handler.update_chunk_metadata(
+            diff.kept, keep_keys=("original_text", "chunk_enrichment_status")
+        )
+        await chunks_handler.delete_chunks(removed)
+        if diff.kept or removed:
+            logger.info(
+                f"Re-ingested document {document_info.id}: kept "
+                f"{len(diff.kept)} unchanged chunks, removed {len(removed)}."
+            )
+
     async def augment_document_info(
         self,
         document_info: DocumentResponse,
@@ -331,16 +437,76 @@ class IngestionService:
             document_info.summary_embedding = embedding
         return
 
+    def _chunk_content_hash(self, text: str) -> str:
+        """
+        Key of `text` in the content-addressed chunk embedding store. The
+        text is NFC-normalized with whitespace collapsed, and the embedding
+        model, dimension, purpose and the prefix the provider adds for that
+        purpose are part of the key.
+        """
+        normalized = " ".join(unicodedata.normalize("NFC", text).split())
+        config = self.providers.embedding.config
+        purpose = EmbeddingPurpose.INDEX
+        prefix = getattr(self.providers.embedding, "prefixes", {}).get(
+            purpose, ""
+        )
+        return hashlib.sha256(
+            f"{config.base_model}:{config.base_dimension}:{purpose.name.lower()}:{prefix}\x00{normalized}".encode()
+        ).hexdigest()
+
+    async def _get_chunk_embeddings(
+        self, texts: list[str]
+    ) -> tuple[list[list[float]], list[bool]]:
+        """
+        Embeds `texts`, reusing stored embeddings of identical content.
+
+        Returns the vectors along with a flag per text telling whether its
+        embedding was reused rather than freshly computed.
+        """
+        if not self.config.ingestion.deduplicate_chunk_embeddings:
+            vectors = await self.providers.embedding.async_get_embeddings(
+                texts
+            )
+            return vectors, [False] * len(texts)
+
+        store = self.providers.database.chunk_embeddings_handler
+        hashes = [self._chunk_content_hash(text) for text in texts]
+        found = await store.get_embeddings(list(set(hashes)))
+
+        missing: dict[str, str] = {}
+        reused: list[bool] = []
+        for content_hash, text in zip(hashes, texts, strict=False):
+            if content_hash in found or content_hash in missing:
+                reused.append(True)
+            else:
+                missing[content_hash] = text
+                reused.append(False)
+
+        if missing:
+            vectors = await self.providers.embedding.async_get_embeddings(
+                list(missing.values())
+            )
+            computed = dict(zip(missing.keys(), vectors, strict=False))
+            await store.upsert_embeddings(computed)
+            found.update(computed)
+
+        return [found[content_hash] for content_hash in hashes], reused
+
     async def embed_document(
         self,
-        chunked_documents: list[dict],
+        chunked_documents: list[dict] | AsyncIterable[dict],
         embedding_batch_size: int = 8,
+        embedding_reuse: Optional[dict[UUID, dict]] = None,
     ) -> AsyncGenerator[VectorEntry, None]:
         """
         Inline replacement for the old embedding_pipe.run(...).
         Batches the embedding calls and yields VectorEntry objects.
+        `chunked_documents` may be an async iterable, in which case
+        embedding starts before all chunks are available.
+        If given, `embedding_reuse` is filled with the number of embedded
+        and reused chunks and the dedup ratio of each document.
         """
-        if not chunked_documents:
+        if isinstance(chunked_documents, list) and not chunked_documents:
             return
 
         concurrency_limit = (
@@ -348,6 +514,8 @@ class IngestionService:
         )
         extraction_batch: list[DocumentChunk] = []
         tasks: set[asyncio.Task] = set()
+        # document_id -> [embedded chunks, chunks with a reused embedding]
+        dedup_counts: dict[UUID, list[int]] = defaultdict(lambda: [0, 0])
 
         async def process_batch(
             batch: list[DocumentChunk],
@@ -361,13 +529,16 @@ class IngestionService:
                 )
                 for ex in batch
             ]
-            # Retrieve embeddings in bulk
-            vectors = await self.providers.embedding.async_get_embeddings(
-                texts,  # list of strings
-            )
+            # Retrieve embeddings in bulk, skipping already embedded content
+            vectors, reused = await self._get_chunk_embeddings(texts)
             # Zip them back together
             results = []
-            for raw_vector, extraction in zip(vectors, batch, strict=False):
+            for raw_vector, was_reused, extraction in zip(
+                vectors, reused, batch, strict=False
+            ):
+                counts = dedup_counts[extraction.document_id]
+                counts[0] += 1
+                counts[1] += was_reused
                 results.append(
                     VectorEntry(
                         id=extraction.id,
@@ -389,7 +560,13 @@ class IngestionService:
             return await process_batch(batch)
 
         # Convert each chunk dict to a DocumentChunk
-        for chunk_dict in chunked_documents:
+        async for chunk_dict in _iterate(chunked_documents):
+            # Hand on finished batches without waiting for the next one
+            for finished in [t for t in tasks if t.done()]:
+                tasks.discard(finished)
+                for vector_entry in finished.result():
+                    yield vector_entry
+
             extraction = DocumentChunk.from_dict(chunk_dict)
             extraction_batch.append(extraction)
 
@@ -418,75 +595,59 @@ class IngestionService:
             for vector_entry in await future_task:
                 yield vector_entry
 
+        for document_id, (total, reused_count) in dedup_counts.items():
+            logger.info(
+                f"Reused {reused_count} of {total} chunk embeddings for "
+                f"document {document_id} (dedup ratio {reused_count / total:.2%})."
+            )
+            if embedding_reuse is not None:
+                embedding_reuse[document_id] = {
+                    "embedded": total,
+                    "reused": reused_count,
+                    "ratio": round(reused_count / total, 4),
+                }
+
     async def store_embeddings(
         self,
-        embeddings: Sequence[dict | VectorEntry],
+        embeddings: Sequence[dict | VectorEntry]
+        | AsyncIterable[dict | VectorEntry],
         storage_batch_size: int = 128,
     ) -> AsyncGenerator[str, None]:
         """
         Inline replacement for the old vector_storage_pipe.run(...).
         Batches up the vector entries, enforces usage limits, stores them,
         and yields a success/error string (or you could yield a StorageResult).
+        `embeddings` may be an async iterable, which is stored as it arrives.
+        A document that would take its owner past their chunk limit raises a
+        403 before the batch that crosses it is stored.
         """
-        if not embeddings:
+        if isinstance(embeddings, Sequence) and not embeddings:
             return
 
-        vector_entries: list[VectorEntry] = []
-        for item in embeddings:
-            if isinstance(item, VectorEntry):
-                vector_entries.append(item)
-            else:
-                vector_entries.append(VectorEntry.from_dict(item))
-
         vector_batch: list[VectorEntry] = []
         document_counts: dict[UUID, int] = {}
+        # Limits and usage are looked up once per owner
+        quota = self.chunk_quota.start_ingestion()
+
+        async for item in _iterate(embeddings):
+            msg = (
+                item
+                if isinstance(item, VectorEntry)
+                else VectorEntry.from_dict(item)
+            )
 
-        # We'll track usage from the first user we see; if your scenario allows
-        # multiple user owners in a single ingestion, you'd need to refine usage checks.
-        current_usage = None
-        user_id_for_usage_check: UUID | None = None
-
-        count = 0
-
-        for msg in vector_entries:
-            # If we haven't set usage yet, do so on the first chunk
-            if current_usage is None:
-                user_id_for_usage_check = msg.owner_id
-                usage_data = (
-                    await self.providers.database.chunks_handler.list_chunks(
-                        limit=1,
-                        offset=0,
-                        filters={"owner_id": msg.owner_id},
-                    )
+            if not await quota.try_reserve(msg.owner_id):
+                # Checked before the batch is stored, so it fails as a whole
+                raise R2RException(
+                    status_code=403,
+                    message=f"Document {msg.document_id} exceeds the maximum number of chunks allowed for user {msg.owner_id} ({quota.max_chunks[msg.owner_id]}).",
                 )
-                current_usage = usage_data["total_entries"]
-
-            # Figure out the user's limit
-            user = await self.providers.database.users_handler.get_user_by_id(
-                msg.owner_id
-            )
-            max_chunks = (
-                self.providers.database.config.app.default_max_chunks_per_user
-            )
-            if user.limits_overrides and "max_chunks" in user.limits_overrides:
-                max_chunks = user.limits_overrides["max_chunks"]
 
             # Add to our local batch
             vector_batch.append(msg)
             document_counts[msg.document_id] = (
                 document_counts.get(msg.document_id, 0) + 1
             )
-            count += 1
-
-            # Check usage
-            if (
-                current_usage is not None
-                and (current_usage + len(vector_batch) + count) > max_chunks
-            ):
-                error_message = f"User {msg.owner_id} has exceeded the maximum number of allowed chunks: {max_chunks}"
-                logger.error(error_message)
-                yield error_message
-                continue
 
             # Once we hit our batch size, store them
             if len(vector_batch) >= storage_batch_size:
@@ -496,8 +657,12 @@ class IngestionService:
                             vector_batch
                         )
                     )
+                except R2RException:
+                    await quota.release(vector_batch)
+                    raise
                 except Exception as e:
                     logger.error(f"Failed to store vector batch: {e}")
+                    await quota.release(vector_batch)
                     yield f"Error: {e}"
                 vector_batch.clear()
 
@@ -507,8 +672,12 @@ class IngestionService:
                 await self.providers.database.chunks_handler.upsert_entries(
                     vector_batch
                 )
+            except R2RException:
+                await quota.release(vector_batch)
+                raise
             except Exception as e:
                 logger.error(f"Failed to store final vector batch: {e}")
+                await quota.release(vector_batch)
                 yield f"Error: {e}"
 
         # Summaries
@@ -691,31 +860,23 @@ class IngestionService:
         self,
         chunk_idx: int,
         chunk: dict,
-        document_id: UUID,
+        source_texts: list[str],
         document_summary: str | None,
         chunk_enrichment_settings: ChunkEnrichmentSettings,
-        list_document_chunks: list[dict],
-    ) -> VectorEntry:
+        system_prompt: str,
+        task_prompt: str,
+    ) -> str:
         """
-        Helper for chunk_enrichment. Leverages an LLM to rewrite or expand chunk text,
-        then re-embeds it.
+        Helper for chunk_enrichment. Leverages an LLM to rewrite or expand
+        chunk text in the context of its neighbours, recording the outcome in
+        the chunk's metadata. The chunk's own text is kept if that fails.
         """
-        preceding_chunks = [
-            list_document_chunks[idx]["text"]
-            for idx in range(
-                max(0, chunk_idx - chunk_enrichment_settings.n_chunks),
-                chunk_idx,
-            )
+        n_chunks = chunk_enrichment_settings.n_chunks
+        preceding_chunks = source_texts[
+            max(0, chunk_idx - n_chunks) : chunk_idx
         ]
-        succeeding_chunks = [
-            list_document_chunks[idx]["text"]
-            for idx in range(
-                chunk_idx + 1,
-                min(
-                    len(list_document_chunks),
-                    chunk_idx + chunk_enrichment_settings.n_chunks + 1,
-                ),
-            )
+        succeeding_chunks = source_texts[
+            chunk_idx + 1 : chunk_idx + n_chunks + 1
         ]
         try:
             # Obtain the updated text from the LLM
@@ -723,10 +884,11 @@ class IngestionService:
                 (
                     await self.providers.llm.aget_completion(
                         messages=await self.providers.database.prompts_handler.get_message_payload(
-                            task_prompt_name=chunk_enrichment_settings.chunk_enrichment_prompt,
+                            system_prompt_override=system_prompt,
+                            task_prompt_override=task_prompt,
                             task_inputs={
                                 "document_summary": document_summary or "None",
-                                "chunk": chunk["text"],
+                                "chunk": source_texts[chunk_idx],
                                 "preceding_chunks": (
                                     "\n".join(preceding_chunks)
                                     if preceding_chunks
@@ -748,32 +910,48 @@ class IngestionService:
                 .choices[0]
                 .message.content
             )
-        except Exception:
-            updated_chunk_text = chunk["text"]
-            chunk["metadata"]["chunk_enrichment_status"] = "failed"
-        else:
-            chunk["metadata"]["chunk_enrichment_status"] = (
-                "success" if updated_chunk_text else "failed"
-            )
+        except Exception as e:
+            logger.warning(f"Failed to enrich chunk {chunk['id']}: {e}")
+            updated_chunk_text = None
 
+        chunk["metadata"]["original_text"] = source_texts[chunk_idx]
         if not updated_chunk_text or not isinstance(updated_chunk_text, str):
-            updated_chunk_text = str(chunk["text"])
             chunk["metadata"]["chunk_enrichment_status"] = "failed"
+            return chunk["text"]
+        chunk["metadata"]["chunk_enrichment_status"] = "success"
+        return updated_chunk_text
 
-        # Re-embed
-        data = await self.providers.embedding.async_get_embedding(
-            updated_chunk_text
+    async def _store_enriched_chunks(
+        self, document_id: UUID, enriched: list[tuple[dict, str]]
+    ) -> None:
+        """
+        Embeds rewritten chunks in batches of the embedding provider's size
+        and overwrites the stored chunks in place, under their own ids.
+        """
+        texts = [text for _, text in enriched]
+        batch_size = max(self.providers.embedding.config.batch_size, 1)
+        batches = await asyncio.gather(
+            *(
+                self._get_chunk_embeddings(texts[start : start + batch_size])
+                for start in range(0, len(texts), batch_size)
+            )
         )
-        chunk["metadata"]["original_text"] = chunk["text"]
-
-        return VectorEntry(
-            id=generate_id(str(chunk["id"])),
-            vector=Vector(data=data, type=VectorType.FIXED, length=len(data)),
-            document_id=document_id,
-            owner_id=chunk["owner_id"],
-            collection_ids=chunk["collection_ids"],
-            text=updated_chunk_text,
-            metadata=chunk["metadata"],
+        vectors = [vector for batch, _ in batches for vector in batch]
+        await self.providers.database.chunks_handler.upsert_entries(
+            [
+                VectorEntry(
+                    id=chunk["id"],
+                    vector=Vector(
+                        data=data, type=VectorType.FIXED, length=len(data)
+                    ),
+                    document_id=document_id,
+                    owner_id=chunk["owner_id"],
+                    collection_ids=chunk["collection_ids"],
+                    text=text,
+                    metadata=chunk["metadata"],
+                )
+                for (chunk, text), data in zip(enriched, vectors, strict=True)
+            ]
         )
 
     async def chunk_enrichment(
@@ -783,8 +961,14 @@ class IngestionService:
         chunk_enrichment_settings: ChunkEnrichmentSettings,
     ) -> int:
         """
-        Example function that modifies chunk text via an LLM then re-embeds
-        and re-stores all chunks for the given document.
+        Rewrites the chunks of a document via an LLM, then re-embeds and
+        updates them in place.
+
+        At most `concurrent_requests` chunks are with the LLM at a time, and
+        rewritten chunks are stored every `checkpoint_batch_size`. Stored
+        chunks carry their enrichment status, so a restarted enrichment only
+        handles the chunks that were not stored yet. Neighbouring chunks are
+        always given to the LLM as they were before enrichment.
         """
         list_document_chunks = (
             await self.providers.database.chunks_handler.list_document_chunks(
@@ -793,48 +977,85 @@ class IngestionService:
                 limit=-1,
             )
         )["results"]
+        source_texts = [
+            chunk["metadata"].get("original_text", chunk["text"])
+            for chunk in list_document_chunks
+        ]
+        pending = [
+            chunk_idx
+            for chunk_idx, chunk in enumerate(list_document_chunks)
+            if "chunk_enrichment_status" not in chunk["metadata"]
+        ]
+        if not pending:
+            return 0
+        if len(pending) < len(list_document_chunks):
+            logger.info(
+                f"Resuming enrichment of document {document_id}: "
+                f"{len(list_document_chunks) - len(pending)} chunks done."
+            )
 
-        new_vector_entries: list[VectorEntry] = []
-        tasks = []
+        # The prompts are formatted locally for every chunk
+        prompts_handler = self.providers.database.prompts_handler
+        system_prompt = await prompts_handler.get_cached_prompt("system")
+        task_prompt = await prompts_handler.get_cached_prompt(
+            chunk_enrichment_settings.chunk_enrichment_prompt
+            or "chunk_enrichment"
+        )
+
+        concurrency_limit = max(
+            chunk_enrichment_settings.concurrent_requests, 1
+        )
+        checkpoint_size = max(
+            chunk_enrichment_settings.checkpoint_batch_size, 1
+        )
+        tasks: set[asyncio.Task] = set()
+        enriched: list[tuple[dict, str]] = []
         total_completed = 0
 
-        for chunk_idx, chunk in enumerate(list_document_chunks):
-            tasks.append(
-                self._get_enriched_chunk_text(
-                    chunk_idx=chunk_idx,
-                    chunk=chunk,
-                    document_id=document_id,
-                    document_summary=document_summary,
-                    chunk_enrichment_settings=chunk_enrichment_settings,
-                    list_document_chunks=list_document_chunks,
-                )
+        async def enrich(chunk_idx: int) -> tuple[dict, str]:
+            chunk = list_document_chunks[chunk_idx]
+            return chunk, await self._get_enriched_chunk_text(
+                chunk_idx=chunk_idx,
+                chunk=chunk,
+                source_texts=source_texts,
+                document_summary=document_summary,
+                chunk_enrichment_settings=chunk_enrichment_settings,
+                system_prompt=system_prompt,
+                task_prompt=task_prompt,
             )
 
-            # Process in batches of e.g. 128 concurrency
-            if len(tasks) == 128:
-                new_vector_entries.extend(await asyncio.gather(*tasks))
-                total_completed += 128
-                logger.info(
-                    f"Completed {total_completed} out of {len(list_document_chunks)} chunks for document {document_id}"
-                )
-                tasks = []
-
-        # Finish any remaining tasks
-        new_vector_entries.extend(await asyncio.gather(*tasks))
-        logger.info(
-            f"Completed enrichment of {len(list_document_chunks)} chunks for document {document_id}"
-        )
+        async def checkpoint(size: int) -> None:
+            nonlocal enriched, total_completed
+            batch, enriched = enriched[:size], enriched[size:]
+            await self._store_enriched_chunks(document_id, batch)
+            total_completed += len(batch)
+            logger.info(
+                f"Completed {total_completed} out of {len(pending)} chunks for document {document_id}"
+            )
 
-        # Delete old chunks from vector db
-        await self.providers.database.chunks_handler.delete(
-            filters={"document_id": document_id}
-        )
+        try:
+            for position, chunk_idx in enumerate(pending):
+                tasks.add(asyncio.create_task(enrich(chunk_idx)))
+                # Wait at the limit, and for all of them after the last one
+                while len(tasks) >= concurrency_limit or (
+                    position == len(pending) - 1 and tasks
+                ):
+                    done, tasks = await asyncio.wait(
+                        tasks, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    enriched.extend(task.result() for task in done)
+                    while len(enriched) >= checkpoint_size:
+                        await checkpoint(checkpoint_size)
+            if enriched:
+                await checkpoint(len(enriched))
+        finally:
+            for task in tasks:
+                task.cancel()
 
-        # Insert the newly enriched entries
-        await self.providers.database.chunks_handler.upsert_entries(
-            new_vector_entries
+        logger.info(
+            f"Completed enrichment of {len(pending)} chunks for document {document_id}"
         )
-        return len(new_vector_entries)
+        return total_completed
 
     async def list_chunks(
         self,
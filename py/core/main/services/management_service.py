@@ -2,7 +2,7 @@ import logging
 import os
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import IO, Any, BinaryIO, Optional, Tuple
+from typing import IO, Any, AsyncIterator, Callable, Optional, Tuple
 from uuid import UUID
 
 import toml
@@ -24,6 +24,7 @@ from core.telemetry.telemetry_decorator import telemetry_event
 from ..abstractions import R2RProviders
 from ..config import R2RConfig
 from .base import Service
+from .chunk_quota_service import ChunkQuotaService
 
 logger = logging.getLogger()
 
@@ -33,11 +34,13 @@ class ManagementService(Service):
         self,
         config: R2RConfig,
         providers: R2RProviders,
+        chunk_quota: ChunkQuotaService,
     ):
         super().__init__(
             config,
             providers,
         )
+        self.chunk_quota = chunk_quota
 
     @telemetry_event("AppSettings")
     async def app_settings(self):
@@ -224,9 +227,14 @@ class ManagementService(Service):
     @telemetry_event("DownloadFile")
     async def download_file(
         self, document_id: UUID
-    ) -> Optional[Tuple[str, BinaryIO, int]]:
-        if result := await self.providers.database.files_handler.retrieve_file(
-            document_id
+    ) -> Optional[
+        Tuple[str, Callable[[int, Optional[int]], AsyncIterator[bytes]], int]
+    ]:
+        if (
+            result
+            := await self.providers.database.files_handler.retrieve_file_stream(
+                document_id
+            )
         ):
             return result
         return None
@@ -237,7 +245,7 @@ class ManagementService(Service):
         document_ids: Optional[list[UUID]] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-    ) -> tuple[str, BinaryIO, int]:
+    ) -> tuple[str, AsyncIterator[bytes]]:
         return (
             await self.providers.database.files_handler.retrieve_files_as_zip(
                 document_ids=document_ids,
@@ -869,12 +877,7 @@ class ManagementService(Service):
         return self.config.app.default_max_documents_per_user
 
     async def get_user_max_chunks(self, user_id: UUID) -> int | None:
-        user = await self.providers.database.users_handler.get_user_by_id(
-            user_id
-        )
-        if user.limits_overrides and "max_chunks" in user.limits_overrides:
-            return user.limits_overrides["max_chunks"]
-        return self.config.app.default_max_chunks_per_user
+        return await self.chunk_quota.get_max_chunks(user_id)
 
     async def get_user_max_collections(self, user_id: UUID) -> int | None:
         user = await self.providers.database.users_handler.get_user_by_id(
@@ -1057,11 +1060,7 @@ class ManagementService(Service):
             )
         )["total_entries"]
         max_chunks = await self.get_user_max_chunks(user_id)
-        used_chunks = (
-            await self.providers.database.chunks_handler.list_chunks(
-                limit=1, offset=0, filters={"owner_id": user_id}
-            )
-        )["total_entries"]
+        used_chunks = await self.chunk_quota.get_chunk_count(user_id)
 
         max_collections = await self.get_user_max_collections(user_id)
         used_collections = (
@@ -1074,7 +1073,11 @@ class ManagementService(Service):
             "chunks": {
                 "limit": max_chunks,
                 "used": used_chunks,
-                "remaining": max_chunks - used_chunks,
+                "remaining": (
+                    max_chunks - used_chunks
+                    if max_chunks is not None
+                    else None
+                ),
             },
             "documents": {
                 "limit": max_documents,
@@ -3,6 +3,7 @@ import json
 import logging
 import time
 import uuid
+from contextlib import asynccontextmanager
 from copy import deepcopy
 from datetime import datetime
 from typing import Any, Optional
@@ -43,6 +44,7 @@ from core.base import (
 )
 from core.base.api.models import RAGResponse, User
 from core.telemetry.telemetry_decorator import telemetry_event
+from core.utils import get_tokenizer
 from shared.api.models.management.responses import MessageResponse
 
 from ..abstractions import R2RProviders
@@ -52,9 +54,6 @@ from .base import Service
 logger = logging.getLogger()
 
 
-import tiktoken
-
-
 def convert_nonserializable_objects(obj):
     if isinstance(obj, dict):
         new_obj = {}
@@ -125,11 +124,7 @@ def tokens_count_for_message(message, encoding):
 
 def num_tokens_from_messages(messages, model="gpt-4o"):
     """Return the number of tokens used by a list of messages for both user and assistant."""
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        logger.warning("Warning: model not found. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
+    encoding = get_tokenizer(model)
 
     tokens = 0
     for i, message in enumerate(messages):
@@ -139,6 +134,42 @@ def num_tokens_from_messages(messages, model="gpt-4o"):
     return tokens
 
 
+class QueryPlan:
+    """
+    Per-request state shared by every search leg of a single query.
+
+    The query embedding is computed at most once, on first use, and reused
+    by chunk, graph and document search. Stage timings are recorded so they
+    can be surfaced in the search response metadata.
+    """
+
+    def __init__(self, query: str, embedding_provider: Any):
+        self.query = query
+        self.embedding_provider = embedding_provider
+        self.timings: dict[str, float] = {}
+        self._embedding_task: Optional[asyncio.Task] = None
+
+    async def get_query_embedding(self) -> list[float]:
+        if self._embedding_task is None:
+            self._embedding_task = asyncio.create_task(self._embed_query())
+        # Shield so that one cancelled leg does not cancel the shared call
+        return await asyncio.shield(self._embedding_task)
+
+    async def _embed_query(self) -> list[float]:
+        async with self.timed("embedding"):
+            return await self.embedding_provider.async_get_embedding(
+                self.query, purpose=EmbeddingPurpose.QUERY
+            )
+
+    @asynccontextmanager
+    async def timed(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = round(time.perf_counter() - start, 4)
+
+
 class RetrievalService(Service):
     def __init__(
         self,
@@ -194,12 +225,13 @@ class RetrievalService(Service):
             if isinstance(val, UUID):
                 search_settings.filters[f] = str(val)
 
-        # 2) Vector search & graph search in parallel
+        # 2) Vector search & graph search in parallel, sharing one embedding
+        query_plan = QueryPlan(query, self.providers.completion_embedding)
         vector_task = asyncio.create_task(
-            self._vector_search_logic(query, search_settings)
+            self._vector_search_logic(query, search_settings, query_plan)
         )
         graph_task = asyncio.create_task(
-            self._graph_search_logic(query, search_settings)
+            self._graph_search_logic(query, search_settings, query_plan)
         )
 
         (
@@ -208,9 +240,11 @@ class RetrievalService(Service):
         ) = await asyncio.gather(vector_task, graph_task)
 
         # 3) Wrap up in an `AggregateSearchResult`, or your CombinedSearchResponse
+        query_plan.timings["total"] = round(time.time() - t0, 4)
         aggregated_result = AggregateSearchResult(
             chunk_search_results=chunk_search_results,
             graph_search_results=graph_search_results_results,
+            metadata={"timings": query_plan.timings},
         )
 
         # If your higher-level code returns as_dict(), do that here:
@@ -229,10 +263,11 @@ class RetrievalService(Service):
         self,
         query: str,
         search_settings: SearchSettings,
+        query_plan: Optional[QueryPlan] = None,
     ) -> list[ChunkSearchResult]:
         """
         Equivalent to your old VectorSearchPipe.search, but simplified:
-         • embed query
+         • embed query (once per request, via the query plan)
          • do fulltext, semantic, or hybrid search
          • optional re-rank
          • return list of ChunkSearchResult
@@ -241,18 +276,26 @@ class RetrievalService(Service):
         if not search_settings.chunk_settings.enabled:
             return []
 
-        # 1) embed the query
-        query_vector = (
-            await self.providers.completion_embedding.async_get_embedding(
-                query, purpose=EmbeddingPurpose.QUERY
-            )
+        query_plan = query_plan or QueryPlan(
+            query, self.providers.completion_embedding
         )
+        async with query_plan.timed("chunk_search"):
+            return await self._run_chunk_search(
+                query, search_settings, query_plan
+            )
 
-        # 2) Decide which search to run
+    async def _run_chunk_search(
+        self,
+        query: str,
+        search_settings: SearchSettings,
+        query_plan: QueryPlan,
+    ) -> list[ChunkSearchResult]:
+        # 1) Decide which search to run, embedding the query only if needed
         if (
             search_settings.use_fulltext_search
             and search_settings.use_semantic_search
         ) or search_settings.use_hybrid_search:
+            query_vector = await query_plan.get_query_embedding()
             raw_results = (
                 await self.providers.database.chunks_handler.hybrid_search(
                     query_vector=query_vector,
@@ -268,6 +311,7 @@ class RetrievalService(Service):
                 )
             )
         elif search_settings.use_semantic_search:
+            query_vector = await query_plan.get_query_embedding()
             raw_results = (
                 await self.providers.database.chunks_handler.semantic_search(
                     query_vector=query_vector,
@@ -280,12 +324,12 @@ class RetrievalService(Service):
                 "At least one of use_fulltext_search or use_semantic_search must be True"
             )
 
-        # 3) Re-rank if you want a second pass
+        # 2) Re-rank if you want a second pass
         reranked = await self.providers.completion_embedding.arerank(
             query=query, results=raw_results, limit=search_settings.limit
         )
 
-        # 4) Possibly add "Document Title" prefix
+        # 3) Possibly add "Document Title" prefix
         final_results = []
         for r in reranked:
             # If requested, or if you always do this:
@@ -303,101 +347,117 @@ class RetrievalService(Service):
         self,
         query: str,
         search_settings: SearchSettings,
+        query_plan: Optional[QueryPlan] = None,
     ) -> list[GraphSearchResult]:
         """
         Mirrors GraphSearchSearchPipe logic:
-          • embed the query
+          • embed the query (once per request, via the query plan)
           • search entities, relationships, communities
           • yield GraphSearchResult
         """
-        results = []
         # bail early if disabled
         if not search_settings.graph_settings.enabled:
-            return results
+            return []
 
-        # embed query
-        query_embedding = (
-            await self.providers.completion_embedding.async_get_embedding(
-                query
-            )
+        query_plan = query_plan or QueryPlan(
+            query, self.providers.completion_embedding
         )
+        query_embedding = await query_plan.get_query_embedding()
+        async with query_plan.timed("graph_search"):
+            return await self._run_graph_search(
+                query, search_settings, query_embedding
+            )
 
+    async def _run_graph_search(
+        self,
+        query: str,
+        search_settings: SearchSettings,
+        query_embedding: list[float],
+    ) -> list[GraphSearchResult]:
         base_limit = search_settings.limit
         graph_limits = search_settings.graph_settings.limits or {}
 
-        # Entity search
-        entity_limit = graph_limits.get("entities", base_limit)
-        entity_cursor = self.providers.database.graphs_handler.graph_search(
-            query,
-            search_type="entities",
-            limit=entity_limit,
-            query_embedding=query_embedding,
-            property_names=["name", "description", "id"],
-            filters=search_settings.filters,
-        )
-        async for ent in entity_cursor:
-            # Build the GraphSearchResult object
-            score = ent.get("similarity_score")
-            metadata = ent.get("metadata", {})
-            # If there's a possibility that "metadata" is a JSON string, parse it:
-            if isinstance(metadata, str):
-                try:
-                    metadata = json.loads(metadata)
-                except:
-                    pass
+        # Entity, relationship and community lookups are independent, so they
+        # are issued together and merged back in this order.
+        searches: list[dict[str, Any]] = [
+            {
+                "search_type": "entities",
+                "limit": graph_limits.get("entities", base_limit),
+                "property_names": ["name", "description", "id"],
+            },
+            {
+                "search_type": "relationships",
+                "limit": graph_limits.get("relationships", base_limit),
+                "property_names": [
+                    "id",
+                    "subject",
+                    "predicate",
+                    "object",
+                    "description",
+                    "subject_id",
+                    "object_id",
+                ],
+            },
+            {
+                "search_type": "communities",
+                "limit": graph_limits.get("communities", base_limit),
+                "property_names": [
+                    "id",
+                    "name",
+                    "summary",
+                ],
+            },
+        ]
+
+        graphs_handler = self.providers.database.graphs_handler
+        if search_settings.graph_settings.union_query:
+            rows_per_search = await graphs_handler.graph_search_batch(
+                query,
+                searches=searches,
+                query_embedding=query_embedding,
+                filters=search_settings.filters,
+            )
+        else:
+
+            async def _drain(search: dict[str, Any]) -> list[dict[str, Any]]:
+                return [
+                    row
+                    async for row in graphs_handler.graph_search(
+                        query,
+                        query_embedding=query_embedding,
+                        filters=search_settings.filters,
+                        **search,
+                    )
+                ]
+
+            rows_per_search = await asyncio.gather(
+                *(_drain(search) for search in searches)
+            )
 
-            # store
+        entity_rows, relationship_rows, community_rows = rows_per_search
+        results: list[GraphSearchResult] = []
+        for ent in entity_rows:
             results.append(
-                GraphSearchResult(
-                    content=GraphEntityResult(
+                self._to_graph_search_result(
+                    query,
+                    search_settings,
+                    ent,
+                    GraphSearchResultType.ENTITY,
+                    GraphEntityResult(
                         name=ent.get("name", ""),
                         description=ent.get("description", ""),
                         id=ent.get("id", None),
                     ),
-                    result_type=GraphSearchResultType.ENTITY,
-                    score=score if search_settings.include_scores else None,
-                    metadata=(
-                        {
-                            **(metadata or {}),
-                            "associated_query": query,
-                        }
-                        if search_settings.include_metadatas
-                        else None
-                    ),
                 )
             )
-
-        # Relationship search
-        rel_limit = graph_limits.get("relationships", base_limit)
-        rel_cursor = self.providers.database.graphs_handler.graph_search(
-            query,
-            search_type="relationships",
-            limit=rel_limit,
-            query_embedding=query_embedding,
-            property_names=[
-                "id",
-                "subject",
-                "predicate",
-                "object",
-                "description",
-                "subject_id",
-                "object_id",
-            ],
-            filters=search_settings.filters,
-        )
-        async for rel in rel_cursor:
-            score = rel.get("similarity_score")
-            metadata = rel.get("metadata", {})
-            # Possibly parse if it's JSON in a string
-            if isinstance(metadata, str):
-                try:
-                    metadata = json.loads(metadata)
-                except:
-                    pass
-
+        for rel in relationship_rows:
             results.append(
-                GraphSearchResult(
-                    content=GraphRelationshipResult(
+                self._to_graph_search_result(
+                    query,
+                    search_settings,
+                    rel,
+                    GraphSearchResultType.RELATIONSHIP,
+                    GraphRelationshipResult(
                         id=rel.get("id", None),
                         subject=rel.get("subject", ""),
                         predicate=rel.get("predicate", ""),
@@ -406,64 +466,58 @@ class RetrievalService(Service):
                         object_id=rel.get("object_id", None),
                         description=rel.get("description", ""),
                     ),
-                    result_type=GraphSearchResultType.RELATIONSHIP,
-                    score=score if search_settings.include_scores else None,
-                    metadata=(
-                        {
-                            **(metadata or {}),
-                            "associated_query": query,
-                        }
-                        if search_settings.include_metadatas
-                        else None
-                    ),
                 )
             )
-
-        # Community search
-        comm_limit = graph_limits.get("communities", base_limit)
-        comm_cursor = self.providers.database.graphs_handler.graph_search(
-            query,
-            search_type="communities",
-            limit=comm_limit,
-            query_embedding=query_embedding,
-            property_names=[
-                "id",
-                "name",
-                "summary",
-            ],
-            filters=search_settings.filters,
-        )
-        async for comm in comm_cursor:
-            score = comm.get("similarity_score")
-            metadata = comm.get("metadata", {})
-            if isinstance(metadata, str):
-                try:
-                    metadata = json.loads(metadata)
-                except:
-                    pass
-
+        for comm in community_rows:
             results.append(
-                GraphSearchResult(
-                    content=GraphCommunityResult(
+                self._to_graph_search_result(
+                    query,
+                    search_settings,
+                    comm,
+                    GraphSearchResultType.COMMUNITY,
+                    GraphCommunityResult(
                         id=comm.get("id", None),
                         name=comm.get("name", ""),
                         summary=comm.get("summary", ""),
                     ),
-                    result_type=GraphSearchResultType.COMMUNITY,
-                    score=score if search_settings.include_scores else None,
-                    metadata=(
-                        {
-                            **(metadata or {}),
-                            "associated_query": query,
-                        }
-                        if search_settings.include_metadatas
-                        else None
-                    ),
                 )
             )
 
         return results
 
+    @staticmethod
+    def _to_graph_search_result(
+        query: str,
+        search_settings: SearchSettings,
+        row: dict[str, Any],
+        result_type: GraphSearchResultType,
+        content: GraphEntityResult
+        | GraphRelationshipResult
+        | GraphCommunityResult,
+    ) -> GraphSearchResult:
+        score = row.get("similarity_score")
+        metadata = row.get("metadata", {})
+        # If there's a possibility that "metadata" is a JSON string, parse it:
+        if isinstance(metadata, str):
+            try:
+                metadata = json.loads(metadata)
+            except:
+                pass
+
+        return GraphSearchResult(
+            content=content,
+            result_type=result_type,
+            score=score if search_settings.include_scores else None,
+            metadata=(
+                {
+                    **(metadata or {}),
+                    "associated_query": query,
+                }
+                if search_settings.include_metadatas
+                else None
+            ),
+        )
+
     @telemetry_event("SearchDocuments")
     async def search_documents(
         self,
@@ -471,6 +525,12 @@ class RetrievalService(Service):
         settings: SearchSettings,
         query_embedding: Optional[list[float]] = None,
     ) -> list[DocumentResponse]:
+        if query_embedding is None and (
+            settings.use_semantic_search or settings.use_hybrid_search
+        ):
+            query_embedding = await QueryPlan(
+                query, self.providers.completion_embedding
+            ).get_query_embedding()
         return (
             await self.providers.database.documents_handler.search_documents(
                 query_text=query,
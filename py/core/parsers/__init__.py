@@ -27,6 +27,7 @@ __all__ = [
     "RSTParser",
     "TIFFParser",
     "TSVParser",
+    "TSVParserAdvanced",
     "XLSParser",
     "XLSXParser",
     "XLSXParserAdvanced",
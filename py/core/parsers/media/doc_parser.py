@@ -11,6 +11,7 @@ from core.base.providers import (
     DatabaseProvider,
     IngestionConfig,
 )
+from core.parsers.sanitize import strip_binary_artifacts
 
 
 class DOCParser(AsyncParser[str | bytes]):
@@ -94,7 +95,7 @@ class DOCParser(AsyncParser[str | bytes]):
     def _clean_text(self, text: str) -> list[str]:
         """Clean and split the extracted text into paragraphs."""
         # Remove binary artifacts and control characters
-        text = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\xFF]", "", text)
+        text = strip_binary_artifacts(text)
 
         # Remove multiple spaces and newlines
         text = re.sub(r"\s+", " ", text)
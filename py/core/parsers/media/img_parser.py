@@ -19,6 +19,8 @@ logger = logging.getLogger()
 
 
 class ImageParser(AsyncParser[str | bytes]):
+    requires_providers = True
+
     def __init__(
         self,
         config: IngestionConfig,
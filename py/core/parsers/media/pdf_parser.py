@@ -3,27 +3,30 @@
 # Standard library imports
 import asyncio
 import base64
+import hashlib
 import logging
-import string
+import os
+import tempfile
 import time
-import unicodedata
 from io import BytesIO
-from typing import AsyncGenerator
+from pathlib import Path
+from typing import AsyncGenerator, Optional
 
 # Third-party imports
-from pdf2image import convert_from_bytes, convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from pdf2image.exceptions import PDFInfoNotInstalledError
 from PIL import Image
 from pypdf import PdfReader
 
 # Local application imports
 from core.base.abstractions import GenerationConfig
-from core.base.parsers.base_parser import AsyncParser
+from core.base.parsers.base_parser import AsyncParser, binary_stream
 from core.base.providers import (
     CompletionProvider,
     DatabaseProvider,
     IngestionConfig,
 )
+from core.parsers.sanitize import sanitize_text
 from shared.abstractions import PDFParsingError, PopplerNotFoundError
 
 logger = logging.getLogger()
@@ -32,6 +35,8 @@ logger = logging.getLogger()
 class VLMPDFParser(AsyncParser[str | bytes]):
     """A parser for PDF documents using vision models for page processing."""
 
+    accepts_buffer = True
+
     def __init__(
         self,
         config: IngestionConfig,
@@ -43,56 +48,22 @@ class VLMPDFParser(AsyncParser[str | bytes]):
         self.config = config
         self.vision_prompt_text = None
 
-    async def convert_pdf_to_images(
-        self, data: str | bytes
-    ) -> list[Image.Image]:
-        """
-        Convert PDF pages to images asynchronously using in-memory conversion.
-        """
-        logger.info("Starting PDF conversion to images.")
-        start_time = time.perf_counter()
-        options = {
-            "dpi": 300,  # You can make this configurable via self.config if needed
-            "fmt": "jpeg",
-            "thread_count": 4,
-            "paths_only": False,  # Return PIL Image objects instead of writing to disk
-        }
-        try:
-            if isinstance(data, bytes):
-                images = await asyncio.to_thread(
-                    convert_from_bytes, data, **options
-                )
-            else:
-                images = await asyncio.to_thread(
-                    convert_from_path, data, **options
-                )
-            elapsed = time.perf_counter() - start_time
-            logger.info(
-                f"PDF conversion completed in {elapsed:.2f} seconds, total pages: {len(images)}"
-            )
-            return images
-        except PDFInfoNotInstalledError:
-            logger.error(
-                "PDFInfoNotInstalledError encountered during PDF conversion."
-            )
-            raise PopplerNotFoundError()
-        except Exception as err:
-            logger.error(
-                f"Error converting PDF to images: {err} type: {type(err)}"
-            )
-            raise PDFParsingError(f"Failed to process PDF: {str(err)}", err)
-
     async def process_page(
-        self, image: Image.Image, page_num: int
+        self, image: Image.Image | bytes, page_num: int
     ) -> dict[str, str]:
-        """Process a single PDF page using the vision model."""
+        """
+        Process a single PDF page using the vision model. `image` may also be
+        the page already encoded as JPEG.
+        """
         page_start = time.perf_counter()
         try:
-            # Convert PIL image to JPEG bytes in-memory
-            buf = BytesIO()
-            image.save(buf, format="JPEG")
-            buf.seek(0)
-            image_data = buf.read()
+            if isinstance(image, bytes):
+                image_data = image
+            else:
+                # Convert PIL image to JPEG bytes in-memory
+                buf = BytesIO()
+                image.save(buf, format="JPEG")
+                image_data = buf.getvalue()
             image_base64 = base64.b64encode(image_data).decode("utf-8")
 
             # Configure generation parameters
@@ -144,12 +115,40 @@ class VLMPDFParser(AsyncParser[str | bytes]):
             )
             raise
 
+    def count_pages(self, pdf_path: str) -> int:
+        return pdfinfo_from_path(pdf_path)["Pages"]
+
+    def render_pages(
+        self, pdf_path: str, first_page: int, last_page: int
+    ) -> dict[int, bytes]:
+        """Rasterizes a page range to JPEG bytes, one poppler call per range."""
+        images = convert_from_path(
+            pdf_path,
+            dpi=300,
+            fmt="jpeg",
+            first_page=first_page,
+            last_page=last_page,
+            thread_count=1,
+        )
+        pages = {}
+        for page_num, image in enumerate(images, first_page):
+            buf = BytesIO()
+            image.save(buf, format="JPEG")
+            pages[page_num] = buf.getvalue()
+            image.close()
+        return pages
+
     async def ingest(
         self, data: str | bytes, maintain_order: bool = True, **kwargs
     ) -> AsyncGenerator[dict[str, str | int], None]:
         """
-        Ingest PDF data and yield the text description for each page using the vision model.
-        (This version yields a string per page rather than a dictionary.)
+        Ingest PDF data and yield the text description for each page using
+        the vision model.
+
+        Pages are rasterized in batches only as the page window reaches them,
+        so at most `vision_pdf_page_window` pages are held or described at a
+        time. With `maintain_order` pages are yielded in order, otherwise as
+        they finish.
         """
         ingest_start = time.perf_counter()
         logger.info("Starting PDF ingestion using VLMPDFParser.")
@@ -161,57 +160,206 @@ class VLMPDFParser(AsyncParser[str | bytes]):
             )
             logger.info("Retrieved vision prompt text from database.")
 
+        if isinstance(data, str):
+            data = await asyncio.to_thread(Path(data).read_bytes)
+
+        cache = None
+        if self.config.vision_pdf_cache_dir:
+            cache = _PageCache(
+                self.config.vision_pdf_cache_dir,
+                data,
+                self.config.vision_pdf_model or self.config.app.vlm,
+                self.vision_prompt_text,
+            )
+
+        window = max(self.config.vision_pdf_page_window, 1)
+        batch_size = max(self.config.vision_pdf_render_batch, 1)
+        renders: dict[int, asyncio.Task] = {}
+        pending: dict[int, int] = {}
+        in_flight: dict[asyncio.Task, int] = {}
+
         try:
-            # Convert PDF to images (in-memory)
-            images = await self.convert_pdf_to_images(data)
-
-            # Create asynchronous tasks for processing each page
-            tasks = {
-                asyncio.create_task(
-                    self.process_page(image, page_num)
-                ): page_num
-                for page_num, image in enumerate(images, 1)
-            }
-
-            if maintain_order:
-                pending = set(tasks.keys())
-                results = {}
-                next_page = 1
-                while pending:
-                    done, pending = await asyncio.wait(
-                        pending, return_when=asyncio.FIRST_COMPLETED
+            with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+                # Written once so each page range is rendered from disk
+                await asyncio.to_thread(pdf_file.write, data)
+                await asyncio.to_thread(pdf_file.flush)
+                page_count = await self._run_poppler(
+                    self.count_pages, pdf_file.name
+                )
+
+                async def render(first_page: int) -> dict[int, bytes]:
+                    last_page = min(first_page + batch_size - 1, page_count)
+                    pages = {}
+                    if cache:
+                        pages = await cache.get_pages(first_page, last_page)
+                    if len(pages) < last_page - first_page + 1:
+                        pages = await self._run_poppler(
+                            self.render_pages,
+                            pdf_file.name,
+                            first_page,
+                            last_page,
+                        )
+                        if cache:
+                            await cache.put_pages(pages)
+                    return pages
+
+                def release(page_num: int) -> None:
+                    # A batch is dropped once each of its pages is described
+                    first_page = page_num - (page_num - 1) % batch_size
+                    left = pending.setdefault(
+                        first_page,
+                        min(batch_size, page_count - first_page + 1),
                     )
+                    if (task := renders.get(first_page)) and task.done():
+                        task.result().pop(page_num, None)
+                    if left > 1:
+                        pending[first_page] = left - 1
+                    else:
+                        del pending[first_page]
+                        renders.pop(first_page, None)
+
+                async def describe(page_num: int) -> str:
+                    if (
+                        cache
+                        and (content := await cache.get_result(page_num))
+                        is not None
+                    ):
+                        release(page_num)
+                        return content
+                    first_page = page_num - (page_num - 1) % batch_size
+                    if first_page not in renders:
+                        renders[first_page] = asyncio.create_task(
+                            render(first_page)
+                        )
+                    image = (await renders[first_page])[page_num]
+                    release(page_num)
+                    result = await self.process_page(image, page_num)
+                    if cache:
+                        await cache.put_result(page_num, result["content"])
+                    return result["content"]
+
+                next_page = 1
+                while next_page <= page_count or in_flight:
+                    while next_page <= page_count and len(in_flight) < window:
+                        task = asyncio.create_task(describe(next_page))
+                        in_flight[task] = next_page
+                        next_page += 1
+
+                    if maintain_order:
+                        done = [next(iter(in_flight))]
+                        await done[0]
+                    else:
+                        done, _ = await asyncio.wait(
+                            in_flight, return_when=asyncio.FIRST_COMPLETED
+                        )
                     for task in done:
-                        result = await task
-                        page_num = int(result["page"])
-                        results[page_num] = result
-                        while next_page in results:
-                            yield {
-                                "content": results[next_page]["content"],
-                                "page_number": next_page,
-                            }
-                            results.pop(next_page)
-                            next_page += 1
-            else:
-                # Yield results as tasks complete
-                for coro in asyncio.as_completed(tasks.keys()):
-                    result = await coro
-                    yield {
-                        "content": result["content"],
-                        "page_number": int(result["page"]),
-                    }
+                        yield {
+                            "content": task.result(),
+                            "page_number": in_flight.pop(task),
+                        }
+
             total_elapsed = time.perf_counter() - ingest_start
             logger.info(
-                f"Completed PDF ingestion in {total_elapsed:.2f} seconds using VLMPDFParser."
+                f"Completed PDF ingestion of {page_count} pages in {total_elapsed:.2f} seconds using VLMPDFParser."
             )
         except Exception as e:
             logger.error(f"Error processing PDF: {str(e)}")
             raise
+        finally:
+            for task in [*in_flight, *renders.values()]:
+                task.cancel()
+
+    async def _run_poppler(self, func, *args):
+        try:
+            return await asyncio.to_thread(func, *args)
+        except PDFInfoNotInstalledError:
+            logger.error(
+                "PDFInfoNotInstalledError encountered during PDF conversion."
+            )
+            raise PopplerNotFoundError()
+        except Exception as err:
+            logger.error(
+                f"Error converting PDF to images: {err} type: {type(err)}"
+            )
+            raise PDFParsingError(f"Failed to process PDF: {str(err)}", err)
+
+
+class _PageCache:
+    """
+    On-disk cache of one document's rendered pages and of their vision model
+    descriptions, keyed by the document's hash. Descriptions are further
+    keyed by the model and prompt that produced them.
+
+    A page's image is only kept until its description is stored, so the
+    cache holds rendered pages for descriptions still in progress and text
+    for the rest.
+    """
+
+    def __init__(self, root: str, data: bytes, model: str, prompt: str):
+        document_dir = Path(root) / hashlib.sha256(data).hexdigest()
+        settings_key = hashlib.sha256(
+            f"{model}\x00{prompt}".encode()
+        ).hexdigest()[:16]
+        self.pages_dir = document_dir / "pages"
+        self.results_dir = document_dir / "results" / settings_key
+
+    async def get_pages(
+        self, first_page: int, last_page: int
+    ) -> dict[int, bytes]:
+        return await asyncio.to_thread(self._read_pages, first_page, last_page)
+
+    async def put_pages(self, pages: dict[int, bytes]) -> None:
+        for page_num, image in pages.items():
+            if await asyncio.to_thread(self._result_path(page_num).exists):
+                continue
+            await asyncio.to_thread(
+                self._write, self._page_path(page_num), image
+            )
+
+    async def get_result(self, page_num: int) -> Optional[str]:
+        path = self._result_path(page_num)
+        if not await asyncio.to_thread(path.exists):
+            return None
+        return await asyncio.to_thread(path.read_text, encoding="utf-8")
+
+    async def put_result(self, page_num: int, content: str) -> None:
+        await asyncio.to_thread(
+            self._write,
+            self._result_path(page_num),
+            content.encode("utf-8"),
+        )
+        await asyncio.to_thread(
+            self._page_path(page_num).unlink, missing_ok=True
+        )
+
+    def _page_path(self, page_num: int) -> Path:
+        return self.pages_dir / f"{page_num:05d}.jpg"
+
+    def _result_path(self, page_num: int) -> Path:
+        return self.results_dir / f"{page_num:05d}.txt"
+
+    def _read_pages(self, first_page: int, last_page: int) -> dict[int, bytes]:
+        pages = {}
+        for page_num in range(first_page, last_page + 1):
+            path = self._page_path(page_num)
+            if path.exists():
+                pages[page_num] = path.read_bytes()
+        return pages
+
+    @staticmethod
+    def _write(path: Path, content: bytes) -> None:
+        # Written aside and renamed so readers never see a partial file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(f"{path.suffix}.{os.getpid()}.partial")
+        partial.write_bytes(content)
+        os.replace(partial, path)
 
 
 class BasicPDFParser(AsyncParser[str | bytes]):
     """A parser for PDF data."""
 
+    accepts_buffer = True
+
     def __init__(
         self,
         config: IngestionConfig,
@@ -229,36 +377,12 @@ class BasicPDFParser(AsyncParser[str | bytes]):
         """Ingest PDF data and yield text from each page."""
         if isinstance(data, str):
             raise ValueError("PDF data must be in bytes format.")
-        pdf = self.PdfReader(BytesIO(data))
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text is not None:
-                page_text = "".join(
-                    filter(
-                        lambda x: (
-                            unicodedata.category(x)
-                            in [
-                                "Ll",
-                                "Lu",
-                                "Lt",
-                                "Lm",
-                                "Lo",
-                                "Nl",
-                                "No",
-                            ]  # Keep letters and numbers
-                            or "\u4e00" <= x <= "\u9fff"  # Chinese characters
-                            or "\u0600" <= x <= "\u06ff"  # Arabic characters
-                            or "\u0400" <= x <= "\u04ff"  # Cyrillic letters
-                            or "\u0370" <= x <= "\u03ff"  # Greek letters
-                            or "\u0e00" <= x <= "\u0e7f"  # Thai
-                            or "\u3040" <= x <= "\u309f"  # Japanese Hiragana
-                            or "\u30a0" <= x <= "\u30ff"  # Katakana
-                            or x in string.printable
-                        ),
-                        page_text,
-                    )
-                )  # Keep characters in common languages ; # Filter out non-printable characters
-                yield page_text
+        with binary_stream(data) as stream:
+            pdf = self.PdfReader(stream)
+            for page in pdf.pages:
+                page_text = page.extract_text()
+                if page_text is not None:
+                    yield sanitize_text(page_text)
 
 
 class PDFParserUnstructured(AsyncParser[str | bytes]):
@@ -0,0 +1,126 @@
+"""
+Character filters shared by the parsers that clean up extracted text.
+
+A filter is a set of code points to drop, computed once over the whole of
+Unicode and compiled into a regular expression that removes runs of them
+from a page in a single pass. The Basic Multilingual Plane and the
+supplementary planes get separate patterns: characters of the first are
+looked up in a table by the regex engine, while the second can only be
+matched against a list of ranges, so it is only applied to the runs of
+such characters.
+"""
+
+import re
+import string
+import sys
+import unicodedata
+from typing import Iterable, Iterator
+
+# Unicode categories of letters and numbers, kept in any script
+TEXT_CATEGORIES = frozenset({"Ll", "Lu", "Lt", "Lm", "Lo", "Nl", "No"})
+
+# Scripts whose every code point is kept, marks and punctuation included
+TEXT_RANGES = (
+    (0x4E00, 0x9FFF),  # CJK unified ideographs
+    (0x0600, 0x06FF),  # Arabic
+    (0x0400, 0x04FF),  # Cyrillic
+    (0x0370, 0x03FF),  # Greek
+    (0x0E00, 0x0E7F),  # Thai
+    (0x3040, 0x309F),  # Hiragana
+    (0x30A0, 0x30FF),  # Katakana
+)
+
+_PRINTABLE = frozenset(string.printable)
+
+# Control characters and byte values left over from binary Word streams
+BINARY_ARTIFACTS = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\xFF]")
+
+
+def is_text_character(char: str) -> bool:
+    """Whether `sanitize_text` keeps `char`."""
+    point = ord(char)
+    return (
+        unicodedata.category(char) in TEXT_CATEGORIES
+        or any(low <= point <= high for low, high in TEXT_RANGES)
+        or char in _PRINTABLE
+    )
+
+
+def _runs(points: Iterable[int]) -> Iterator[tuple[int, int]]:
+    """Groups ascending code points into inclusive (first, last) runs."""
+    # Code points are never negative, so -2 starts no run
+    first = last = -2
+    for point in points:
+        if point == last + 1:
+            last = point
+            continue
+        if first >= 0:
+            yield first, last
+        first = last = point
+    if first >= 0:
+        yield first, last
+
+
+def _character_class(runs: Iterable[tuple[int, int]]) -> str:
+    return "".join(
+        f"\\U{first:08x}" if first == last else f"\\U{first:08x}-\\U{last:08x}"
+        for first, last in runs
+    )
+
+
+# Any run of characters outside the Basic Multilingual Plane
+_SUPPLEMENTARY = re.compile(r"[\U00010000-\U0010ffff]+")
+
+
+class CharacterFilter:
+    """Removes the characters whose code points are in `dropped`."""
+
+    def __init__(self, dropped: Iterable[int]):
+        dropped = sorted(dropped)
+        basic = [point for point in dropped if point <= 0xFFFF]
+        supplementary = [point for point in dropped if point > 0xFFFF]
+        self._basic = re.compile(f"[{_character_class(_runs(basic))}]+")
+        self._supplementary = (
+            re.compile(f"[{_character_class(_runs(supplementary))}]+")
+            if supplementary
+            else None
+        )
+
+    def __call__(self, text: str) -> str:
+        text = self._basic.sub("", text)
+        if self._supplementary is not None:
+            text = _SUPPLEMENTARY.sub(self._filter_supplementary, text)
+        return text
+
+    def _filter_supplementary(self, match: re.Match) -> str:
+        return self._supplementary.sub("", match.group())  # type: ignore
+
+
+def _build_text_filter() -> CharacterFilter:
+    category = unicodedata.category
+    dropped = {
+        point
+        for point in range(sys.maxunicode + 1)
+        if category(chr(point)) not in TEXT_CATEGORIES
+    }
+    for low, high in TEXT_RANGES:
+        dropped.difference_update(range(low, high + 1))
+    dropped.difference_update(map(ord, string.printable))
+    return CharacterFilter(dropped)
+
+
+# Built at import, so the first parse does not stall the event loop on it
+_TEXT_FILTER = _build_text_filter()
+
+
+def sanitize_text(text: str) -> str:
+    """
+    Keeps letters and numbers of any script, the whole of a few common
+    scripts and printable ASCII, dropping control characters, symbols and
+    the punctuation of other scripts.
+    """
+    return _TEXT_FILTER(text)
+
+
+def strip_binary_artifacts(text: str) -> str:
+    return BINARY_ARTIFACTS.sub("", text)
@@ -8,7 +8,7 @@ from .org_parser import ORGParser
 from .p7s_parser import P7SParser
 from .rst_parser import RSTParser
 from .tiff_parser import TIFFParser
-from .tsv_parser import TSVParser
+from .tsv_parser import TSVParser, TSVParserAdvanced
 from .xls_parser import XLSParser
 from .xlsx_parser import XLSXParser, XLSXParserAdvanced
 
@@ -24,6 +24,7 @@ __all__ = [
     "RSTParser",
     "TIFFParser",
     "TSVParser",
+    "TSVParserAdvanced",
     "XLSParser",
     "XLSXParser",
     "XLSXParserAdvanced",
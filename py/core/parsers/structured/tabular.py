@@ -0,0 +1,200 @@
+# type: ignore
+"""
+Helpers shared by the table-aware CSV, TSV and XLSX parsers.
+
+Rows are read incrementally and packed under a repeated header into chunks
+that fit the ingestion chunk size, so one chunk holds as many rows as the
+budget allows instead of one row per chunk. Spreadsheet tables are found as
+4-connected blocks of non-empty cells with a row-by-row labeling pass that
+only keeps the rows of tables that are still open.
+"""
+
+import codecs
+import csv
+from io import BytesIO, TextIOWrapper
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from core.base import ChunkingStrategy, IngestionConfig
+
+# Rows measured per call into the tokenizer
+MEASURE_BATCH_SIZE = 512
+
+MeasureBatch = Callable[[list[str]], list[int]]
+
+
+def iter_delimited_rows(
+    data: str | bytes, delimiter: str = ","
+) -> Iterator[list[str]]:
+    """Reads delimited rows without decoding the whole file up front."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    stream = TextIOWrapper(
+        BytesIO(data), encoding="utf-8-sig", errors="replace", newline=""
+    )
+    yield from csv.reader(stream, delimiter=delimiter)
+
+
+def sniff_delimiter(
+    data: str | bytes, delimiters: str = ",;", sample_size: int = 65536
+) -> str:
+    sample = data[:sample_size]
+    if isinstance(sample, bytes):
+        sample = codecs.decode(sample, "utf-8", errors="ignore")
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=delimiters).delimiter
+    except csv.Error:
+        return delimiters[0]
+
+
+def row_budget(config: IngestionConfig, **kwargs) -> tuple[int, MeasureBatch]:
+    """
+    The size a packed chunk may reach and how rows are measured against it,
+    following the chunking settings so the splitter leaves packed chunks
+    intact: tokens for the token strategy, characters otherwise.
+    """
+    chunk_size = kwargs.get("chunk_size") or config.chunk_size
+    strategy = kwargs.get("chunking_strategy") or config.chunking_strategy
+    if strategy != ChunkingStrategy.TOKEN:
+        return chunk_size, lambda rows: [len(row) for row in rows]
+
+    from core.utils import get_tokenizer
+
+    tokenizer = get_tokenizer(
+        kwargs.get("chunk_tokenizer") or config.chunk_tokenizer
+    )
+    return chunk_size, lambda rows: [
+        len(tokens) for tokens in tokenizer.encode_ordinary_batch(rows)
+    ]
+
+
+def pack_rows(
+    header: Optional[str],
+    rows: Iterable[str],
+    budget: int,
+    measure_batch: MeasureBatch,
+) -> Iterator[str]:
+    """
+    Greedily packs `rows` into newline-joined chunks that start with
+    `header` and stay within `budget`. A row too large to share a chunk is
+    emitted with the header on its own.
+    """
+    header_size = measure_batch([header])[0] + 1 if header else 0
+    rows = iter(rows)
+    current: list[str] = []
+    size = header_size
+
+    def emit() -> str:
+        body = "\n".join(current)
+        return f"{header}\n{body}" if header else body
+
+    while batch := list(islice(rows, MEASURE_BATCH_SIZE)):
+        for row, row_size in zip(batch, measure_batch(batch), strict=True):
+            row_size += 1  # the joining newline
+            if current and size + row_size > budget:
+                yield emit()
+                current, size = [], header_size
+            current.append(row)
+            size += row_size
+    if current:
+        yield emit()
+
+
+def _runs(row: Sequence[Any]) -> tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) columns of the non-empty runs in a row."""
+    filled = np.not_equal(np.array(row, dtype=object), None)
+    edges = np.diff(np.concatenate(([0], filled.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+class _Table:
+    __slots__ = ("parent", "first_row", "last_row", "first_col", "last_col")
+
+    def __init__(self, row: int, first_col: int, last_col: int):
+        self.parent = self
+        self.first_row = self.last_row = row
+        self.first_col, self.last_col = first_col, last_col
+
+    def root(self) -> "_Table":
+        table = self
+        while table.parent is not table:
+            table.parent = table.parent.parent
+            table = table.parent
+        return table
+
+    def absorb(self, other: "_Table") -> None:
+        other.parent = self
+        self.first_row = min(self.first_row, other.first_row)
+        self.last_row = max(self.last_row, other.last_row)
+        self.first_col = min(self.first_col, other.first_col)
+        self.last_col = max(self.last_col, other.last_col)
+
+
+def iter_tables(
+    rows: Iterable[Sequence[Any]],
+) -> Iterator[list[list[str]]]:
+    """
+    Yields every 4-connected block of non-empty cells in `rows` as the
+    string cells of its bounding box, as soon as the block has ended.
+    Empty cells inside a box become empty strings.
+    """
+    buffered: dict[int, Sequence[Any]] = {}
+    open_runs: list[tuple[int, int, _Table]] = []
+
+    def extract(table: _Table) -> list[list[str]]:
+        width = table.last_col - table.first_col + 1
+        box = []
+        for r in range(table.first_row, table.last_row + 1):
+            cells = list(buffered[r][table.first_col : table.last_col + 1])
+            cells += [None] * (width - len(cells))
+            box.append(["" if cell is None else str(cell) for cell in cells])
+        return box
+
+    def close(tables: Iterable[_Table]) -> Iterator[list[list[str]]]:
+        for table in tables:
+            yield extract(table)
+        first_open = min(
+            (table.root().first_row for *_, table in open_runs),
+            default=row_index + 1,
+        )
+        for r in [r for r in buffered if r < first_open]:
+            del buffered[r]
+
+    row_index = -1
+    for row_index, row in enumerate(rows):
+        starts, ends = _runs(row)
+        if len(starts):
+            buffered[row_index] = row
+
+        previous_tables = {table.root() for *_, table in open_runs}
+        previous_starts = np.array([start for start, *_ in open_runs])
+        previous_ends = np.array([end for _, end, _ in open_runs])
+        # Previous-row runs [lo, hi) overlap each run of this row
+        lows = np.searchsorted(previous_ends, starts, side="right")
+        highs = np.searchsorted(previous_starts, ends, side="left")
+
+        runs = []
+        for start, end, lo, hi in zip(starts, ends, lows, highs, strict=True):
+            table = _Table(row_index, start, end - 1)
+            for _, _, neighbour in open_runs[lo:hi]:
+                neighbour = neighbour.root()
+                if neighbour is not table:
+                    neighbour.absorb(table)
+                    table = neighbour
+            table.last_row = row_index
+            table.first_col = min(table.first_col, start)
+            table.last_col = max(table.last_col, end - 1)
+            runs.append((start, end, table))
+        open_runs = runs
+
+        # Tables merged into one that continues are roots no longer
+        ended = {table.root() for table in previous_tables} - {
+            table.root() for *_, table in open_runs
+        }
+        yield from close(sorted(ended, key=lambda t: t.first_row))
+
+    remaining = {table.root() for *_, table in open_runs}
+    open_runs = []
+    yield from close(sorted(remaining, key=lambda t: t.first_row))
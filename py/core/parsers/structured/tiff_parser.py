@@ -20,6 +20,8 @@ logger = logging.getLogger(__name__)
 class TIFFParser(AsyncParser[str | bytes]):
     """Parser for TIFF image files."""
 
+    requires_providers = True
+
     def __init__(
         self,
         config: IngestionConfig,
@@ -5,7 +5,7 @@ from .crypto import (
     NaClCryptoConfig,
     NaClCryptoProvider,
 )
-from .database import PostgresDatabaseProvider
+from .database import PostgresDatabaseProvider, PostgresEmbeddingCache
 from .email import (
     AsyncSMTPEmailProvider,
     ConsoleMockEmailProvider,
@@ -16,6 +16,11 @@ from .embeddings import (
     OllamaEmbeddingProvider,
     OpenAIEmbeddingProvider,
 )
+from .file import (
+    LocalFileStorageProvider,
+    PostgresFileStorageProvider,
+    S3FileStorageProvider,
+)
 from .ingestion import (  # type: ignore
     R2RIngestionConfig,
     R2RIngestionProvider,
@@ -54,6 +59,11 @@ __all__ = [
     "OpenAIEmbeddingProvider",
     # Database
     "PostgresDatabaseProvider",
+    "PostgresEmbeddingCache",
+    # File storage
+    "LocalFileStorageProvider",
+    "PostgresFileStorageProvider",
+    "S3FileStorageProvider",
     # Email
     "AsyncSMTPEmailProvider",
     "ConsoleMockEmailProvider",
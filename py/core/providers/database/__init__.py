@@ -1,5 +1,7 @@
+from .embedding_cache import PostgresEmbeddingCache
 from .postgres import PostgresDatabaseProvider
 
 __all__ = [
     "PostgresDatabaseProvider",
+    "PostgresEmbeddingCache",
 ]
@@ -8,6 +8,8 @@ import asyncpg
 
 from core.base.providers import DatabaseConnectionManager
 
+from .vector_codecs import register_vector_codecs
+
 logger = logging.getLogger()
 
 
@@ -30,6 +32,7 @@ class SemaphoreConnectionPool:
                 self.connection_string,
                 max_size=self.postgres_configuration_settings.max_connections,
                 statement_cache_size=self.postgres_configuration_settings.statement_cache_size,
+                init=register_vector_codecs,
             )
 
             logger.info(
@@ -40,6 +43,13 @@ class SemaphoreConnectionPool:
                 f"Error {e} occurred while attempting to connect to relational database."
             ) from e
 
+    async def reload_type_codecs(self):
+        """
+        Replaces the open connections so that the vector codecs are registered
+        for types created after they were opened.
+        """
+        await self.pool.expire_connections()
+
     @asynccontextmanager
     async def get_connection(self):
         async with self.semaphore:
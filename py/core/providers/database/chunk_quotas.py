@@ -0,0 +1,165 @@
+from typing import Optional
+from uuid import UUID
+
+from core.base import Handler, VectorTableName
+
+from .base import PostgresConnectionManager
+
+
+class PostgresChunkQuotasHandler(Handler):
+    """
+    Per-owner chunk counters, kept up to date by triggers on the chunks table
+    so usage never has to be counted from the chunks themselves. Inserts and
+    deletes are counted per statement; an update only fires the trigger for
+    the rows whose `owner_id` actually changed.
+
+    Ingestion checks the remaining quota before storing. The insert trigger
+    is the backstop for concurrent ingestions of the same owner: a statement
+    that takes an owner past `max_chunks` fails as a whole. Such inserts
+    serialize on the counter row, so the check is atomic.
+    """
+
+    TABLE_NAME = "chunk_quotas"
+
+    def __init__(
+        self, project_name: str, connection_manager: PostgresConnectionManager
+    ):
+        super().__init__(project_name, connection_manager)
+
+    async def create_tables(self):
+        table_name = self._get_table_name(
+            PostgresChunkQuotasHandler.TABLE_NAME
+        )
+        chunks_table_name = self._get_table_name(VectorTableName.CHUNKS)
+
+        table_exists = await self.connection_manager.fetchrow_query(
+            "SELECT to_regclass($1) IS NOT NULL AS exists", [table_name]
+        )
+
+        query = f"""
+        CREATE TABLE IF NOT EXISTS {table_name} (
+            owner_id UUID PRIMARY KEY,
+            chunk_count BIGINT NOT NULL DEFAULT 0,
+            max_chunks BIGINT
+        );
+
+        CREATE OR REPLACE FUNCTION {self.project_name}.count_inserted_chunks()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO {table_name} (owner_id, chunk_count)
+            SELECT owner_id, COUNT(*) FROM new_rows
+            WHERE owner_id IS NOT NULL
+            GROUP BY owner_id
+            ON CONFLICT (owner_id) DO UPDATE
+            SET chunk_count = {table_name}.chunk_count + EXCLUDED.chunk_count;
+
+            IF EXISTS (
+                SELECT 1 FROM {table_name}
+                WHERE owner_id IN (SELECT owner_id FROM new_rows)
+                AND max_chunks IS NOT NULL
+                AND chunk_count > max_chunks
+            ) THEN
+                RAISE EXCEPTION 'Owner has exceeded the maximum number of allowed chunks'
+                USING ERRCODE = 'check_violation';
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION {self.project_name}.count_deleted_chunks()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE {table_name} q
+            SET chunk_count = GREATEST(q.chunk_count - d.removed, 0)
+            FROM (
+                SELECT owner_id, COUNT(*) AS removed FROM old_rows
+                WHERE owner_id IS NOT NULL
+                GROUP BY owner_id
+            ) d
+            WHERE q.owner_id = d.owner_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION {self.project_name}.count_reassigned_chunks()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF OLD.owner_id IS NOT NULL THEN
+                UPDATE {table_name}
+                SET chunk_count = GREATEST(chunk_count - 1, 0)
+                WHERE owner_id = OLD.owner_id;
+            END IF;
+            IF NEW.owner_id IS NOT NULL THEN
+                INSERT INTO {table_name} (owner_id, chunk_count)
+                VALUES (NEW.owner_id, 1)
+                ON CONFLICT (owner_id) DO UPDATE
+                SET chunk_count = {table_name}.chunk_count + 1;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS count_inserted_chunks ON {chunks_table_name};
+        CREATE TRIGGER count_inserted_chunks
+            AFTER INSERT ON {chunks_table_name}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION {self.project_name}.count_inserted_chunks();
+
+        DROP TRIGGER IF EXISTS count_deleted_chunks ON {chunks_table_name};
+        CREATE TRIGGER count_deleted_chunks
+            AFTER DELETE ON {chunks_table_name}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION {self.project_name}.count_deleted_chunks();
+
+        DROP TRIGGER IF EXISTS count_reassigned_chunks ON {chunks_table_name};
+        CREATE TRIGGER count_reassigned_chunks
+            AFTER UPDATE OF owner_id ON {chunks_table_name}
+            FOR EACH ROW
+            WHEN (OLD.owner_id IS DISTINCT FROM NEW.owner_id)
+            EXECUTE FUNCTION {self.project_name}.count_reassigned_chunks();
+        """
+        await self.connection_manager.execute_query(query)
+
+        if not table_exists["exists"]:
+            # Seed the counters from the chunks stored before they existed
+            await self.connection_manager.execute_query(
+                f"""
+                INSERT INTO {table_name} (owner_id, chunk_count)
+                SELECT owner_id, COUNT(*) FROM {chunks_table_name}
+                WHERE owner_id IS NOT NULL
+                GROUP BY owner_id
+                ON CONFLICT (owner_id) DO NOTHING
+                """
+            )
+
+    async def set_max_chunks(
+        self, owner_id: UUID, max_chunks: Optional[int]
+    ) -> int:
+        """
+        Records the limit the triggers enforce for `owner_id` and returns the
+        owner's current chunk count.
+        """
+        query = f"""
+        INSERT INTO {self._get_table_name(PostgresChunkQuotasHandler.TABLE_NAME)}
+        (owner_id, max_chunks)
+        VALUES ($1, $2)
+        ON CONFLICT (owner_id) DO UPDATE SET max_chunks = EXCLUDED.max_chunks
+        RETURNING chunk_count
+        """
+        result = await self.connection_manager.fetchrow_query(
+            query, [owner_id, max_chunks]
+        )
+        return result["chunk_count"]
+
+    async def get_chunk_count(self, owner_id: UUID) -> int:
+        query = f"""
+        SELECT chunk_count
+        FROM {self._get_table_name(PostgresChunkQuotasHandler.TABLE_NAME)}
+        WHERE owner_id = $1
+        """
+        result = await self.connection_manager.fetchrow_query(
+            query, [owner_id]
+        )
+        return result["chunk_count"] if result else 0
@@ -1,13 +1,14 @@
-import copy
+import asyncio
 import json
 import logging
 import math
 import time
 import uuid
-from typing import Any, Optional, TypedDict
+from typing import Any, Optional, Sequence, TypedDict
 from uuid import UUID
 
 import numpy as np
+from asyncpg.exceptions import CheckViolationError
 
 from core.base import (
     ChunkSearchResult,
@@ -49,9 +50,9 @@ def index_measure_to_ops(
 def quantize_vector_to_binary(
     vector: list[float] | np.ndarray,
     threshold: float = 0.0,
-) -> bytes:
+) -> np.ndarray:
     """
-    Quantizes a float vector to a binary vector string for PostgreSQL bit type.
+    Quantizes a float vector to a boolean array for the PostgreSQL bit type.
     Used when quantization_type is INT1.
 
     Args:
@@ -59,19 +60,10 @@ def quantize_vector_to_binary(
         threshold (float, optional): Threshold for binarization. Defaults to 0.0.
 
     Returns:
-        str: Binary string representation for PostgreSQL bit type
+        np.ndarray: Boolean array, sent as `bit` by the binary bit codec
     """
-    # Convert input to numpy array if it isn't already
-    if not isinstance(vector, np.ndarray):
-        vector = np.array(vector)
-
-    # Convert to binary (1 where value > threshold, 0 otherwise)
-    binary_vector = (vector > threshold).astype(int)
-
-    # Convert to string of 1s and 0s
-    # Convert to string of 1s and 0s, then to bytes
-    binary_string = "".join(map(str, binary_vector))
-    return binary_string.encode("ascii")
+    # 1 where value > threshold, 0 otherwise
+    return np.asarray(vector) > threshold
 
 
 class HybridSearchIntermediateResult(TypedDict):
@@ -90,10 +82,12 @@ class PostgresChunksHandler(Handler):
         connection_manager: PostgresConnectionManager,
         dimension: int,
         quantization_type: VectorQuantizationType,
+        copy_upsert_threshold: int = 0,
     ):
         super().__init__(project_name, connection_manager)
         self.dimension = dimension
         self.quantization_type = quantization_type
+        self.copy_upsert_threshold = copy_upsert_threshold
 
     async def create_tables(self):
         # Check for old table name first
@@ -179,7 +173,7 @@ class PostgresChunksHandler(Handler):
                     entry.document_id,
                     entry.owner_id,
                     entry.collection_ids,
-                    str(entry.vector.data),
+                    entry.vector.data,
                     quantize_vector_to_binary(
                         entry.vector.data
                     ),  # Convert to binary
@@ -209,7 +203,7 @@ class PostgresChunksHandler(Handler):
                     entry.document_id,
                     entry.owner_id,
                     entry.collection_ids,
-                    str(entry.vector.data),
+                    entry.vector.data,
                     entry.text,
                     json.dumps(entry.metadata),
                 ),
@@ -219,7 +213,28 @@ class PostgresChunksHandler(Handler):
         """
         Batch upsert function that handles vector quantization only when quantization_type is INT1.
         Matches the table schema where vec_binary column only exists for INT1 quantization.
+        Batches of at least `copy_upsert_threshold` entries are loaded through COPY.
         """
+        try:
+            await self._upsert_entries(entries)
+        except CheckViolationError:
+            # Raised by the chunk quota trigger; nothing of the batch is kept
+            document_ids = ", ".join(
+                sorted({str(entry.document_id) for entry in entries})
+            )
+            raise R2RException(
+                status_code=403,
+                message=f"Storing the chunks of document {document_ids} exceeds the owner's maximum number of allowed chunks.",
+            )
+
+    async def _upsert_entries(self, entries: list[VectorEntry]) -> None:
+        if (
+            self.copy_upsert_threshold
+            and len(entries) >= self.copy_upsert_threshold
+        ):
+            await self._copy_upsert_entries(entries)
+            return
+
         if self.quantization_type == VectorQuantizationType.INT1:
             bit_dim = (
                 "" if math.isnan(self.dimension) else f"({self.dimension})"
@@ -245,7 +260,7 @@ class PostgresChunksHandler(Handler):
                     entry.document_id,
                     entry.owner_id,
                     entry.collection_ids,
-                    str(entry.vector.data),
+                    entry.vector.data,
                     quantize_vector_to_binary(
                         entry.vector.data
                     ),  # Convert to binary
@@ -276,7 +291,7 @@ class PostgresChunksHandler(Handler):
                     entry.document_id,
                     entry.owner_id,
                     entry.collection_ids,
-                    str(entry.vector.data),
+                    entry.vector.data,
                     entry.text,
                     json.dumps(entry.metadata),
                 )
@@ -285,9 +300,101 @@ class PostgresChunksHandler(Handler):
 
             await self.connection_manager.execute_many(query, params)
 
-    async def semantic_search(
-        self, query_vector: list[float], search_settings: SearchSettings
-    ) -> list[ChunkSearchResult]:
+    async def _copy_upsert_entries(self, entries: list[VectorEntry]) -> None:
+        """
+        Bulk upsert through a staging table. Rows are sent with a binary COPY,
+        vectors in pgvector's binary format through the pool's type codecs,
+        and merged into the chunks table with a single
+        `INSERT ... SELECT ... ON CONFLICT`.
+        """
+        quantized = self.quantization_type == VectorQuantizationType.INT1
+        columns = [
+            "id",
+            "document_id",
+            "owner_id",
+            "collection_ids",
+            "vec",
+            *(["vec_binary"] if quantized else []),
+            "text",
+            "metadata",
+        ]
+        vector_col = (
+            f"vector({self.dimension})" if self.dimension > 0 else "vector"
+        )
+        binary_col = (
+            ""
+            if not quantized
+            else (
+                "vec_binary bit varying,"
+                if math.isnan(self.dimension)
+                else f"vec_binary bit({self.dimension}),"
+            )
+        )
+
+        # Later entries win, as with the row-by-row upsert
+        records = [
+            (
+                entry.id,
+                entry.document_id,
+                entry.owner_id,
+                entry.collection_ids,
+                entry.vector.data,
+                *(
+                    [quantize_vector_to_binary(entry.vector.data)]
+                    if quantized
+                    else []
+                ),
+                entry.text,
+                json.dumps(entry.metadata),
+            )
+            for entry in {entry.id: entry for entry in entries}.values()
+        ]
+
+        staging_table = f"{PostgresChunksHandler.TABLE_NAME}_staging"
+        column_list = ", ".join(columns)
+        updates = ",\n            ".join(
+            f"{column} = EXCLUDED.{column}" for column in columns[1:]
+        )
+        create_staging_query = f"""
+        CREATE TEMP TABLE {staging_table} (
+            id UUID,
+            document_id UUID,
+            owner_id UUID,
+            collection_ids UUID[],
+            vec {vector_col},
+            {binary_col}
+            text TEXT,
+            metadata JSONB
+        ) ON COMMIT DROP;
+        """
+        merge_query = f"""
+        INSERT INTO {self._get_table_name(PostgresChunksHandler.TABLE_NAME)}
+        ({column_list})
+        SELECT {column_list} FROM {staging_table}
+        ON CONFLICT (id) DO UPDATE SET
+            {updates};
+        """
+
+        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
+            async with conn.transaction():
+                await conn.execute(create_staging_query)
+                await conn.copy_records_to_table(
+                    staging_table, records=records, columns=columns
+                )
+                await conn.execute(merge_query)
+
+    def _build_semantic_search_query(
+        self,
+        query_vector: list[float],
+        search_settings: SearchSettings,
+        params: Optional[list[Any]] = None,
+    ) -> tuple[str, list[Any]]:
+        """
+        Builds the semantic search query and its parameters.
+
+        Placeholders are numbered after any values already present in
+        `params`, so the query can be embedded inside a larger statement.
+        """
         try:
             imeasure_obj = IndexMeasure(
                 search_settings.chunk_settings.index_measure
@@ -304,7 +411,8 @@ class PostgresChunksHandler(Handler):
             f"{table_name}.text",
         ]
 
-        params: list[str | int | bytes] = []
+        params = params if params is not None else []
+        vector_idx = len(params) + 1
 
         # For binary vectors (INT1), implement two-stage search
         if self.quantization_type == VectorQuantizationType.INT1:
@@ -329,7 +437,7 @@ class PostgresChunksHandler(Handler):
             bit_dim = (
                 "" if math.isnan(self.dimension) else f"({self.dimension})"
             )
-            stage1_distance = f"{table_name}.vec_binary {binary_search_measure_repr} $1::bit{bit_dim}"
+            stage1_distance = f"{table_name}.vec_binary {binary_search_measure_repr} ${vector_idx}::bit{bit_dim}"
             stage1_param = binary_query
 
             cols.append(
@@ -381,7 +489,7 @@ class PostgresChunksHandler(Handler):
                     extended_limit,  # First stage limit
                     search_settings.offset,
                     search_settings.limit,  # Final limit
-                    str(query_vector),  # For re-ranking
+                    query_vector,  # For re-ranking
                 ]
             )
 
@@ -390,8 +498,8 @@ class PostgresChunksHandler(Handler):
             vector_dim = (
                 "" if math.isnan(self.dimension) else f"({self.dimension})"
             )
-            distance_calc = f"{table_name}.vec {search_settings.chunk_settings.index_measure.pgvector_repr} $1::vector{vector_dim}"
-            query_param = str(query_vector)
+            distance_calc = f"{table_name}.vec {search_settings.chunk_settings.index_measure.pgvector_repr} ${vector_idx}::vector{vector_dim}"
+            query_param = query_vector
 
             if search_settings.include_scores:
                 cols.append(f"({distance_calc}) AS distance")
@@ -420,6 +528,14 @@ class PostgresChunksHandler(Handler):
             """
             params.extend([search_settings.limit, search_settings.offset])
 
+        return query, params
+
+    async def semantic_search(
+        self, query_vector: list[float], search_settings: SearchSettings
+    ) -> list[ChunkSearchResult]:
+        query, params = self._build_semantic_search_query(
+            query_vector, search_settings
+        )
         results = await self.connection_manager.fetch_query(query, params)
 
         return [
@@ -443,13 +559,23 @@ class PostgresChunksHandler(Handler):
             for result in results
         ]
 
-    async def full_text_search(
-        self, query_text: str, search_settings: SearchSettings
-    ) -> list[ChunkSearchResult]:
-        conditions = []
-        params: list[str | int | bytes] = [query_text]
+    def _build_full_text_search_query(
+        self,
+        query_text: str,
+        search_settings: SearchSettings,
+        params: Optional[list[Any]] = None,
+    ) -> tuple[str, list[Any]]:
+        """
+        Builds the full-text search query and its parameters.
 
-        conditions.append("fts @@ websearch_to_tsquery('english', $1)")
+        Placeholders are numbered after any values already present in
+        `params`, so the query can be embedded inside a larger statement.
+        """
+        params = params if params is not None else []
+        params.append(query_text)
+        text_idx = len(params)
+
+        conditions = [f"fts @@ websearch_to_tsquery('english', ${text_idx})"]
 
         if search_settings.filters:
             filter_condition, params = apply_filters(
@@ -468,7 +594,7 @@ class PostgresChunksHandler(Handler):
                 collection_ids,
                 text,
                 metadata,
-                ts_rank(fts, websearch_to_tsquery('english', $1), 32) as rank
+                ts_rank(fts, websearch_to_tsquery('english', ${text_idx}), 32) as rank
             FROM {self._get_table_name(PostgresChunksHandler.TABLE_NAME)}
             {where_clause}
             ORDER BY rank DESC
@@ -482,6 +608,14 @@ class PostgresChunksHandler(Handler):
                 search_settings.hybrid_settings.full_text_limit,
             ]
         )
+        return query, params
+
+    async def full_text_search(
+        self, query_text: str, search_settings: SearchSettings
+    ) -> list[ChunkSearchResult]:
+        query, params = self._build_full_text_search_query(
+            query_text, search_settings
+        )
 
         results = await self.connection_manager.fetch_query(query, params)
         return [
@@ -497,6 +631,32 @@ class PostgresChunksHandler(Handler):
             for r in results
         ]
 
+    @staticmethod
+    def _hybrid_leg_settings(
+        search_settings: SearchSettings,
+    ) -> tuple[SearchSettings, SearchSettings]:
+        """
+        Derives the per-leg settings for a hybrid search.
+
+        Both legs over-fetch by `offset` so that pagination is applied to
+        the fused ranking. Shallow copies are sufficient as neither leg
+        mutates the nested settings objects.
+        """
+        semantic_settings = search_settings.model_copy(
+            update={"limit": search_settings.limit + search_settings.offset}
+        )
+        full_text_settings = search_settings.model_copy(
+            update={
+                "hybrid_settings": search_settings.hybrid_settings.model_copy(
+                    update={
+                        "full_text_limit": search_settings.hybrid_settings.full_text_limit
+                        + search_settings.offset
+                    }
+                )
+            }
+        )
+        return semantic_settings, full_text_settings
+
     async def hybrid_search(
         self,
         query_text: str,
@@ -517,20 +677,20 @@ class PostgresChunksHandler(Handler):
                 "The `full_text_limit` must be greater than or equal to the `limit`."
             )
 
-        semantic_settings = copy.deepcopy(search_settings)
-        semantic_settings.limit += search_settings.offset
+        if search_settings.hybrid_settings.server_side_rrf:
+            return await self._hybrid_search_server_side(
+                query_text, query_vector, search_settings
+            )
 
-        full_text_settings = copy.deepcopy(search_settings)
-        full_text_settings.hybrid_settings.full_text_limit += (
-            search_settings.offset
+        semantic_settings, full_text_settings = self._hybrid_leg_settings(
+            search_settings
         )
 
-        semantic_results: list[ChunkSearchResult] = await self.semantic_search(
-            query_vector, semantic_settings
+        # Each leg acquires its own pooled connection, so they run concurrently
+        semantic_results, full_text_results = await asyncio.gather(
+            self.semantic_search(query_vector, semantic_settings),
+            self.full_text_search(query_text, full_text_settings),
         )
-        full_text_results: list[
-            ChunkSearchResult
-        ] = await self.full_text_search(query_text, full_text_settings)
 
         semantic_limit = search_settings.limit
         full_text_limit = search_settings.hybrid_settings.full_text_limit
@@ -601,6 +761,127 @@ class PostgresChunksHandler(Handler):
             for result in offset_results
         ]
 
+    async def _hybrid_search_server_side(
+        self,
+        query_text: str,
+        query_vector: list[float],
+        search_settings: SearchSettings,
+    ) -> list[ChunkSearchResult]:
+        """
+        Performs hybrid search with reciprocal rank fusion evaluated in
+        Postgres, so both legs and the fusion cost a single round trip.
+
+        Mirrors the client-side fusion exactly: missing ranks default to the
+        configured limits, candidates outside twice the limits are dropped
+        and ties keep the semantic-first insertion order.
+        """
+        semantic_settings, full_text_settings = self._hybrid_leg_settings(
+            search_settings
+        )
+        # Distances are needed to rank the semantic leg; metadata visibility
+        # is re-applied below when the rows are materialized.
+        semantic_settings = semantic_settings.model_copy(
+            update={"include_scores": True, "include_metadatas": True}
+        )
+
+        semantic_query, params = self._build_semantic_search_query(
+            query_vector, semantic_settings
+        )
+        full_text_query, params = self._build_full_text_search_query(
+            query_text, full_text_settings, params
+        )
+
+        hybrid_settings = search_settings.hybrid_settings
+        idx = len(params)
+        params.extend(
+            [
+                search_settings.limit,
+                hybrid_settings.full_text_limit,
+                float(hybrid_settings.rrf_k),
+                float(hybrid_settings.semantic_weight),
+                float(hybrid_settings.full_text_weight),
+                search_settings.offset,
+                search_settings.limit,
+            ]
+        )
+        semantic_limit = f"${idx + 1}::int"
+        full_text_limit = f"${idx + 2}::int"
+        rrf_k = f"${idx + 3}::float8"
+        semantic_weight = f"${idx + 4}::float8"
+        full_text_weight = f"${idx + 5}::float8"
+
+        query = f"""
+        WITH semantic AS (
+            {semantic_query}
+        ), semantic_ranked AS (
+            SELECT *, ROW_NUMBER() OVER (ORDER BY distance) AS semantic_rank
+            FROM semantic
+        ), full_text AS (
+            {full_text_query}
+        ), full_text_ranked AS (
+            SELECT *, ROW_NUMBER() OVER (ORDER BY rank DESC) AS full_text_rank
+            FROM full_text
+        ), combined AS (
+            SELECT
+                COALESCE(s.id, f.id) AS id,
+                COALESCE(s.document_id, f.document_id) AS document_id,
+                COALESCE(s.owner_id, f.owner_id) AS owner_id,
+                COALESCE(s.collection_ids, f.collection_ids) AS collection_ids,
+                COALESCE(s.text, f.text) AS text,
+                COALESCE(s.metadata, f.metadata) AS metadata,
+                s.id IS NOT NULL AS in_semantic,
+                COALESCE(s.semantic_rank, {semantic_limit}) AS semantic_rank,
+                COALESCE(f.full_text_rank, {full_text_limit}) AS full_text_rank,
+                COALESCE(s.semantic_rank, f.full_text_rank) AS insertion_rank
+            FROM semantic_ranked s
+            FULL OUTER JOIN full_text_ranked f ON s.id = f.id
+        )
+        SELECT
+            id,
+            document_id,
+            owner_id,
+            collection_ids,
+            text,
+            metadata,
+            in_semantic,
+            semantic_rank,
+            full_text_rank,
+            (
+                (1.0::float8 / ({rrf_k} + semantic_rank)) * {semantic_weight}
+                + (1.0::float8 / ({rrf_k} + full_text_rank)) * {full_text_weight}
+            ) / ({semantic_weight} + {full_text_weight}) AS rrf_score
+        FROM combined
+        WHERE semantic_rank <= {semantic_limit} * 2
+        AND full_text_rank <= {full_text_limit} * 2
+        ORDER BY rrf_score DESC, in_semantic DESC, insertion_rank
+        OFFSET ${idx + 6}
+        LIMIT ${idx + 7}
+        """
+
+        results = await self.connection_manager.fetch_query(query, params)
+
+        return [
+            ChunkSearchResult(
+                id=UUID(str(r["id"])),
+                document_id=UUID(str(r["document_id"])),
+                owner_id=UUID(str(r["owner_id"])),
+                collection_ids=r["collection_ids"],
+                text=r["text"],
+                score=float(r["rrf_score"]),
+                metadata={
+                    **(
+                        json.loads(r["metadata"])
+                        if search_settings.include_metadatas
+                        or not r["in_semantic"]
+                        else {}
+                    ),
+                    "semantic_rank": int(r["semantic_rank"]),
+                    "full_text_rank": int(r["full_text_rank"]),
+                },
+            )
+            for r in results
+        ]
+
     async def delete(
         self, filters: dict[str, Any]
     ) -> dict[str, dict[str, str]]:
@@ -627,6 +908,62 @@ class PostgresChunksHandler(Handler):
             for result in results
         }
 
+    async def get_document_chunk_hashes(
+        self, document_id: UUID
+    ) -> list[tuple[UUID, str]]:
+        """
+        The id of every chunk of a document with the SHA-256 of its UTF-8
+        text as parsed, before any enrichment, in chunk order, so versions
+        can be compared without reading the text back.
+        """
+        query = f"""
+        SELECT id, encode(sha256(convert_to(COALESCE(metadata->>'original_text', text), 'UTF8')), 'hex') AS content_hash
+        FROM {self._get_table_name(PostgresChunksHandler.TABLE_NAME)}
+        WHERE document_id = $1
+        ORDER BY (metadata->>'chunk_order')::integer;
+        """
+        results = await self.connection_manager.fetch_query(
+            query, (document_id,)
+        )
+        return [(row["id"], row["content_hash"]) for row in results]
+
+    async def update_chunk_metadata(
+        self, metadatas: dict[UUID, dict], keep_keys: Sequence[str] = ()
+    ) -> None:
+        """
+        Replaces the metadata of many chunks in one statement, carrying
+        over the stored values of `keep_keys`.
+        """
+        if not metadatas:
+            return
+        query = f"""
+        UPDATE {self._get_table_name(PostgresChunksHandler.TABLE_NAME)} AS c
+        SET metadata = (
+            SELECT COALESCE(jsonb_object_agg(key, value), '{{}}'::jsonb)
+            FROM jsonb_each(c.metadata)
+            WHERE key = ANY($3::text[])
+        ) || u.metadata
+        FROM unnest($1::uuid[], $2::jsonb[]) AS u(id, metadata)
+        WHERE c.id = u.id;
+        """
+        await self.connection_manager.execute_query(
+            query,
+            (
+                list(metadatas.keys()),
+                [json.dumps(metadata) for metadata in metadatas.values()],
+                list(keep_keys),
+            ),
+        )
+
+    async def delete_chunks(self, ids: list[UUID]) -> None:
+        if not ids:
+            return
+        query = f"""
+        DELETE FROM {self._get_table_name(PostgresChunksHandler.TABLE_NAME)}
+        WHERE id = ANY($1::uuid[]);
+        """
+        await self.connection_manager.execute_query(query, (ids,))
+
     async def assign_document_chunks_to_collection(
         self, document_id: UUID, collection_id: UUID
     ) -> None:
@@ -705,7 +1042,7 @@ class PostgresChunksHandler(Handler):
                     "text": result["text"],
                     "metadata": json.loads(result["metadata"]),
                     "vector": (
-                        json.loads(result["vec"]) if include_vectors else None
+                        result["vec"].tolist() if include_vectors else None
                     ),
                 }
                 for result in results
@@ -1105,7 +1442,7 @@ class PostgresChunksHandler(Handler):
                     "text": result["text"],
                     "metadata": json.loads(result["metadata"]),
                     "vector": (
-                        json.loads(result["vec"]) if include_vectors else None
+                        result["vec"].tolist() if include_vectors else None
                     ),
                 }
                 for result in results
@@ -648,27 +648,12 @@ class PostgresDocumentsHandler(Handler):
 
             documents = []
             for row in results:
-                # Safely handle the embedding
-                embedding = None
-                if (
-                    "summary_embedding" in row
+                embedding = (
+                    row["summary_embedding"].tolist()
+                    if "summary_embedding" in row
                     and row["summary_embedding"] is not None
-                ):
-                    try:
-                        # The embedding is stored as a string like "[0.1, 0.2, ...]"
-                        embedding_str = row["summary_embedding"]
-                        if embedding_str.startswith(
-                            "["
-                        ) and embedding_str.endswith("]"):
-                            embedding = [
-                                float(x)
-                                for x in embedding_str[1:-1].split(",")
-                                if x
-                            ]
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to parse embedding for document {row['id']}: {e}"
-                        )
+                    else None
+                )
 
                 documents.append(
                     DocumentResponse(
@@ -709,7 +694,7 @@ class PostgresDocumentsHandler(Handler):
         """Search documents using semantic similarity with their summary embeddings."""
 
         where_clauses = ["summary_embedding IS NOT NULL"]
-        params: list[str | int | bytes] = [str(query_embedding)]
+        params: list[Any] = [query_embedding]
 
         vector_dim = (
             "" if math.isnan(self.dimension) else f"({self.dimension})"
@@ -783,11 +768,7 @@ class PostgresDocumentsHandler(Handler):
                 created_at=row["created_at"],
                 updated_at=row["updated_at"],
                 summary=row["summary"],
-                summary_embedding=[
-                    float(x)
-                    for x in row["summary_embedding"][1:-1].split(",")
-                    if x
-                ],
+                summary_embedding=row["summary_embedding"].tolist(),
                 total_tokens=row["total_tokens"],
             )
             for row in results
@@ -869,12 +850,8 @@ class PostgresDocumentsHandler(Handler):
                 updated_at=row["updated_at"],
                 summary=row["summary"],
                 summary_embedding=(
-                    [
-                        float(x)
-                        for x in row["summary_embedding"][1:-1].split(",")
-                        if x
-                    ]
-                    if row["summary_embedding"]
+                    row["summary_embedding"].tolist()
+                    if row["summary_embedding"] is not None
                     else None
                 ),
                 total_tokens=row["total_tokens"],
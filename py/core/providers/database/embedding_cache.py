@@ -0,0 +1,259 @@
+from array import array
+from typing import Optional
+
+from core.base import EmbeddingCache, Handler
+
+from .base import PostgresConnectionManager
+
+
+class PostgresEmbeddingCacheHandler(Handler):
+    """Table of cached embeddings, shared by every API replica."""
+
+    TABLE_NAME = "embedding_cache"
+
+    def __init__(
+        self, project_name: str, connection_manager: PostgresConnectionManager
+    ):
+        super().__init__(project_name, connection_manager)
+
+    async def create_tables(self):
+        query = f"""
+        CREATE TABLE IF NOT EXISTS {self._get_table_name(PostgresEmbeddingCacheHandler.TABLE_NAME)} (
+            key TEXT PRIMARY KEY,
+            embedding BYTEA NOT NULL,
+            expires_at TIMESTAMPTZ,
+            last_accessed_at TIMESTAMPTZ DEFAULT NOW()
+        );
+        CREATE INDEX IF NOT EXISTS idx_{self.project_name}_{PostgresEmbeddingCacheHandler.TABLE_NAME}_last_accessed_at
+        ON {self._get_table_name(PostgresEmbeddingCacheHandler.TABLE_NAME)} (last_accessed_at);
+        """
+        await self.connection_manager.execute_query(query)
+
+    async def get_entries(self, keys: list[str]) -> dict[str, bytes]:
+        """Fetch the unexpired entries for `keys`."""
+        query = f"""
+        SELECT key, embedding
+        FROM {self._get_table_name(PostgresEmbeddingCacheHandler.TABLE_NAME)}
+        WHERE key = ANY($1::text[])
+        AND (expires_at IS NULL OR expires_at > NOW())
+        """
+        results = await self.connection_manager.fetch_query(query, [keys])
+        return {row["key"]: row["embedding"] for row in results}
+
+    async def touch_entries(self, keys: list[str]) -> None:
+        """Refresh the access time of `keys`, which were recently read."""
+        query = f"""
+        UPDATE {self._get_table_name(PostgresEmbeddingCacheHandler.TABLE_NAME)}
+        SET last_accessed_at = NOW()
+        WHERE key = ANY($1::text[])
+        """
+        await self.connection_manager.execute_query(query, [keys])
+
+    async def upsert_entries(
+        self, entries: dict[str, bytes], ttl_seconds: Optional[float] = None
+    ) -> None:
+        query = f"""
+        INSERT INTO {self._get_table_name(PostgresEmbeddingCacheHandler.TABLE_NAME)}
+        (key, embedding, expires_at, last_accessed_at)
+        SELECT key, embedding,
+            CASE WHEN $3::float8 IS NULL THEN NULL
+                 ELSE NOW() + make_interval(secs => $3::float8) END,
+            NOW()
+        FROM unnest($1::text[], $2::bytea[]) AS t(key, embedding)
+        ON CONFLICT (key) DO UPDATE SET
+            embedding = EXCLUDED.embedding,
+            expires_at = EXCLUDED.expires_at,
+            last_accessed_at = EXCLUDED.last_accessed_at
+        """
+        await self.connection_manager.execute_query(
+            query, [list(entries.keys()), list(entries.values()), ttl_seconds]
+        )
+
+    async def evict(self, max_entries: int) -> int:
+        """
+        Delete expired entries and trim the table to the `max_entries` most
+        recently used ones. Returns the number of deleted rows.
+        """
+        query = f"""
+        WITH stale AS (
+            SELECT key FROM {self._get_table_name(PostgresEmbeddingCacheHandler.TABLE_NAME)}
+            WHERE expires_at <= NOW()
+            UNION
+            (
+                SELECT key FROM {self._get_table_name(PostgresEmbeddingCacheHandler.TABLE_NAME)}
+                ORDER BY last_accessed_at DESC
+                OFFSET $1
+            )
+        )
+        DELETE FROM {self._get_table_name(PostgresEmbeddingCacheHandler.TABLE_NAME)}
+        WHERE key IN (SELECT key FROM stale)
+        RETURNING key
+        """
+        results = await self.connection_manager.fetch_query(
+            query, [max_entries]
+        )
+        return len(results)
+
+
+class PostgresEmbeddingCache(EmbeddingCache):
+    """
+    `EmbeddingCache` backend stored in `PostgresEmbeddingCacheHandler`.
+
+    Trimming the table sorts all of it, so it is only trimmed back to
+    `max_entries` once `evict_every` entries were written since the last
+    trim. Reads refresh access times in batches of `touch_batch_size`.
+    """
+
+    def __init__(
+        self,
+        handler: PostgresEmbeddingCacheHandler,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        evict_every: Optional[int] = None,
+        touch_batch_size: int = 256,
+    ):
+        super().__init__()
+        self.handler = handler
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evict_every = evict_every or max(1, max_entries // 10)
+        self.touch_batch_size = touch_batch_size
+        self._written = 0
+        self._touched: set[str] = set()
+
+    async def _get_many(self, keys: list[str]) -> dict[str, array]:
+        found: dict[str, array] = {}
+        for key, data in (await self.handler.get_entries(keys)).items():
+            vector = array("f")
+            vector.frombytes(data)
+            found[key] = vector
+        self._touched.update(found)
+        if len(self._touched) >= self.touch_batch_size:
+            await self._flush_touched()
+        return found
+
+    async def _set_many(self, entries: dict[str, array]) -> None:
+        await self.handler.upsert_entries(
+            {key: vector.tobytes() for key, vector in entries.items()},
+            self.ttl_seconds,
+        )
+        self._written += len(entries)
+        if self._written >= self.evict_every:
+            self._written = 0
+            # Recent reads must count before least recently used are dropped
+            await self._flush_touched()
+            self.evictions += await self.handler.evict(self.max_entries)
+
+    async def _flush_touched(self) -> None:
+        keys, self._touched = list(self._touched), set()
+        if keys:
+            await self.handler.touch_entries(keys)
+
+
+class PostgresChunkEmbeddingsHandler(Handler):
+    """
+    Content-addressed store of chunk embeddings.
+
+    Rows are keyed by a hash of the normalized chunk text, the embedding
+    model and the prefix it is embedded with, so identical chunks across
+    document versions or documents are only embedded once.
+
+    Rows not reused for `ttl_seconds` are dropped, checked once every
+    `gc_every` rows written. A reused row's last use is refreshed at most
+    once per `touch_interval_seconds`.
+    """
+
+    TABLE_NAME = "chunk_embeddings"
+
+    def __init__(
+        self,
+        project_name: str,
+        connection_manager: PostgresConnectionManager,
+        ttl_seconds: Optional[float] = None,
+        gc_every: int = 10_000,
+        touch_interval_seconds: float = 86_400,
+    ):
+        super().__init__(project_name, connection_manager)
+        self.ttl_seconds = ttl_seconds
+        self.gc_every = gc_every
+        self.touch_interval_seconds = touch_interval_seconds
+        self._written = 0
+
+    async def create_tables(self):
+        query = f"""
+        CREATE TABLE IF NOT EXISTS {self._get_table_name(PostgresChunkEmbeddingsHandler.TABLE_NAME)} (
+            content_hash TEXT PRIMARY KEY,
+            embedding BYTEA NOT NULL,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            last_used_at TIMESTAMPTZ DEFAULT NOW()
+        );
+        ALTER TABLE {self._get_table_name(PostgresChunkEmbeddingsHandler.TABLE_NAME)}
+        ADD COLUMN IF NOT EXISTS last_used_at TIMESTAMPTZ DEFAULT NOW();
+        CREATE INDEX IF NOT EXISTS idx_{self.project_name}_{PostgresChunkEmbeddingsHandler.TABLE_NAME}_last_used_at
+        ON {self._get_table_name(PostgresChunkEmbeddingsHandler.TABLE_NAME)} (last_used_at);
+        """
+        await self.connection_manager.execute_query(query)
+
+    async def get_embeddings(
+        self, content_hashes: list[str]
+    ) -> dict[str, list[float]]:
+        """
+        Fetch the stored embeddings of `content_hashes`, refreshing the last
+        use of the rows that were not used recently.
+        """
+        query = f"""
+        WITH touched AS (
+            UPDATE {self._get_table_name(PostgresChunkEmbeddingsHandler.TABLE_NAME)}
+            SET last_used_at = NOW()
+            WHERE content_hash = ANY($1::text[])
+            AND last_used_at < NOW() - make_interval(secs => $2::float8)
+        )
+        SELECT content_hash, embedding
+        FROM {self._get_table_name(PostgresChunkEmbeddingsHandler.TABLE_NAME)}
+        WHERE content_hash = ANY($1::text[])
+        """
+        results = await self.connection_manager.fetch_query(
+            query, [content_hashes, self.touch_interval_seconds]
+        )
+        embeddings: dict[str, list[float]] = {}
+        for row in results:
+            vector = array("f")
+            vector.frombytes(row["embedding"])
+            embeddings[row["content_hash"]] = vector.tolist()
+        return embeddings
+
+    async def upsert_embeddings(
+        self, embeddings: dict[str, list[float]]
+    ) -> None:
+        query = f"""
+        INSERT INTO {self._get_table_name(PostgresChunkEmbeddingsHandler.TABLE_NAME)}
+        (content_hash, embedding)
+        SELECT * FROM unnest($1::text[], $2::bytea[])
+        ON CONFLICT (content_hash) DO NOTHING
+        """
+        await self.connection_manager.execute_query(
+            query,
+            [
+                list(embeddings.keys()),
+                [array("f", v).tobytes() for v in embeddings.values()],
+            ],
+        )
+        self._written += len(embeddings)
+        if self.ttl_seconds is not None and self._written >= self.gc_every:
+            self._written = 0
+            await self.delete_unused(self.ttl_seconds)
+
+    async def delete_unused(self, max_age_seconds: float) -> int:
+        """
+        Delete the embeddings not used for `max_age_seconds`. Returns the
+        number of deleted rows.
+        """
+        query = f"""
+        DELETE FROM {self._get_table_name(PostgresChunkEmbeddingsHandler.TABLE_NAME)}
+        WHERE last_used_at < NOW() - make_interval(secs => $1::float8)
+        RETURNING content_hash
+        """
+        results = await self.connection_manager.fetch_query(
+            query, [max_age_seconds]
+        )
+        return len(results)
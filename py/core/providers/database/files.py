@@ -1,41 +1,108 @@
 import io
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
-from io import BytesIO
-from typing import BinaryIO, Optional
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Optional,
+)
 from uuid import UUID
 from zipfile import ZipFile
 
-import asyncpg
-from fastapi import HTTPException
-
-from core.base import Handler, R2RException
+from core.base import (
+    AppConfig,
+    FileConfig,
+    FileStorageProvider,
+    Handler,
+    R2RException,
+)
 
+from ..file.postgres import PostgresFileStorageProvider
 from .base import PostgresConnectionManager
 
 logger = logging.getLogger()
 
+# Bytes read from an in-memory file per chunk when storing it
+STORE_CHUNK_SIZE = 1024 * 1024
+
+# Streams bytes [start, end) of a stored file
+ByteRangeStream = Callable[[int, Optional[int]], AsyncIterator[bytes]]
+
+
+class _ZipSink(io.RawIOBase):
+    """
+    A write-only, unseekable file for `ZipFile`, which then describes each
+    entry after its data, so the archive can be handed out as it is written.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
 
 class PostgresFilesHandler(Handler):
-    """PostgreSQL implementation of the FileHandler."""
+    """
+    PostgreSQL implementation of the FileHandler.
+
+    The files table records each document's file; its bytes are kept by a
+    `FileStorageProvider`. Files in large objects have their `oid` set,
+    files in any other store their `storage_key`, so files stored before
+    switching to another provider remain readable.
+    """
 
     TABLE_NAME = "files"
 
     connection_manager: PostgresConnectionManager
 
+    def __init__(
+        self,
+        project_name: str,
+        connection_manager: PostgresConnectionManager,
+        storage: Optional[FileStorageProvider] = None,
+    ):
+        super().__init__(project_name, connection_manager)
+        self.large_objects = PostgresFileStorageProvider(
+            FileConfig(app=AppConfig(), provider="postgres"),
+            connection_manager,
+        )
+        self.storage = storage or self.large_objects
+
     async def create_tables(self) -> None:
         """Create the necessary tables for file storage."""
         query = f"""
         CREATE TABLE IF NOT EXISTS {self._get_table_name(PostgresFilesHandler.TABLE_NAME)} (
             document_id UUID PRIMARY KEY,
             name TEXT NOT NULL,
-            oid OID NOT NULL,
+            oid OID,
+            storage_key TEXT,
             size BIGINT NOT NULL,
             type TEXT,
             created_at TIMESTAMPTZ DEFAULT NOW(),
             updated_at TIMESTAMPTZ DEFAULT NOW()
         );
 
+        ALTER TABLE {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
+        ADD COLUMN IF NOT EXISTS storage_key TEXT,
+        ALTER COLUMN oid DROP NOT NULL;
+
+        CREATE INDEX IF NOT EXISTS idx_files_storage_key
+        ON {self._get_table_name(PostgresFilesHandler.TABLE_NAME)} (storage_key);
+
         -- Create trigger for updating the updated_at timestamp
         CREATE OR REPLACE FUNCTION {self.project_name}.update_files_updated_at()
         RETURNS TRIGGER AS $$
@@ -59,25 +126,47 @@ class PostgresFilesHandler(Handler):
         self,
         document_id: UUID,
         file_name: str,
-        file_oid: int,
+        file_oid: Optional[int],
         file_size: int,
         file_type: Optional[str] = None,
+        storage_key: Optional[str] = None,
     ) -> None:
-        """Add or update a file entry in storage."""
+        """
+        Add or update a file entry in storage. A file in the storage
+        provider is recorded while holding its key's lock, so the bytes
+        cannot be released by another file sharing them in the meantime.
+        """
         query = f"""
         INSERT INTO {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
-        (document_id, name, oid, size, type)
-        VALUES ($1, $2, $3, $4, $5)
+        (document_id, name, oid, size, type, storage_key)
+        VALUES ($1, $2, $3, $4, $5, $6)
         ON CONFLICT (document_id) DO UPDATE SET
             name = EXCLUDED.name,
             oid = EXCLUDED.oid,
             size = EXCLUDED.size,
             type = EXCLUDED.type,
+            storage_key = EXCLUDED.storage_key,
             updated_at = NOW();
         """
-        await self.connection_manager.execute_query(
-            query, [document_id, file_name, file_oid, file_size, file_type]
-        )
+        async with self._lock_storage_key(storage_key) as conn:
+            await conn.execute(
+                query,
+                document_id,
+                file_name,
+                file_oid,
+                file_size,
+                file_type,
+                storage_key,
+            )
+            # Released by a file with the same content before this one
+            # was recorded
+            if storage_key is not None and not await self.storage.exists(
+                storage_key
+            ):
+                raise R2RException(
+                    status_code=409,
+                    message="The file was removed while being stored, please upload it again.",
+                )
 
     async def store_file(
         self,
@@ -87,82 +176,108 @@ class PostgresFilesHandler(Handler):
         file_type: Optional[str] = None,
     ) -> None:
         """Store a new file in the database."""
-        size = file_content.getbuffer().nbytes
 
-        async with (  # type: ignore
-            self.connection_manager.pool.get_connection() as conn
-        ):
-            async with conn.transaction():
-                oid = await conn.fetchval("SELECT lo_create(0)")
-                await self._write_lobject(conn, oid, file_content)
-                await self.upsert_file(
-                    document_id, file_name, oid, size, file_type
-                )
+        async def chunks():
+            while chunk := file_content.read(STORE_CHUNK_SIZE):
+                yield chunk
 
-    async def _write_lobject(
-        self, conn, oid: int, file_content: io.BytesIO
-    ) -> None:
-        """Write content to a large object."""
-        lobject = await conn.fetchval("SELECT lo_open($1, $2)", oid, 0x20000)
+        await self.store_file_stream(
+            document_id, file_name, chunks(), file_type
+        )
 
-        try:
-            chunk_size = 8192  # 8 KB chunks
-            while True:
-                if chunk := file_content.read(chunk_size):
-                    await conn.execute(
-                        "SELECT lowrite($1, $2)", lobject, chunk
-                    )
-                else:
-                    break
+    async def store_file_stream(
+        self,
+        document_id: UUID,
+        file_name: str,
+        chunks: AsyncIterable[bytes],
+        file_type: Optional[str] = None,
+        max_size: Optional[int] = None,
+    ) -> tuple[int, str]:
+        """
+        Store a file written chunk by chunk, so only one chunk is held in
+        memory at a time.
+
+        Returns the file's size and sha256 hex digest. A file exceeding
+        `max_size` is rejected with a 413 as soon as the limit is passed and
+        nothing is stored.
+        """
+        stored = await self.storage.store(chunks, max_size=max_size)
+        if self.storage is self.large_objects:
+            oid, storage_key = int(stored.key), None
+        else:
+            oid, storage_key = None, stored.key
 
-            await conn.execute("SELECT lo_close($1)", lobject)
+        try:
+            await self.upsert_file(
+                document_id,
+                file_name,
+                oid,
+                stored.size,
+                file_type,
+                storage_key,
+            )
+        except Exception:
+            await self._release(self.storage, stored.key)
+            raise
 
-        except Exception as e:
-            await conn.execute("SELECT lo_unlink($1)", oid)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to write to large object: {e}",
-            ) from e
+        return stored.size, stored.sha256
 
     async def retrieve_file(
         self, document_id: UUID
     ) -> Optional[tuple[str, BinaryIO, int]]:
         """Retrieve a file from storage."""
-        query = f"""
-        SELECT name, oid, size
-        FROM {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
-        WHERE document_id = $1
-        """
+        file_name, storage, key, size = await self._get_file_record(
+            document_id
+        )
+        file_content = b"".join([chunk async for chunk in storage.stream(key)])
+        return file_name, io.BytesIO(file_content), size
 
-        result = await self.connection_manager.fetchrow_query(
-            query, [document_id]
+    @asynccontextmanager
+    async def open_file(
+        self, document_id: UUID
+    ) -> AsyncIterator[tuple[str, bytes | memoryview, int]]:
+        """
+        Open a file as a read-only bytes-like buffer, memory-mapped when the
+        storage provider allows it, that is valid until the block exits.
+        """
+        file_name, storage, key, size = await self._get_file_record(
+            document_id
         )
-        if not result:
-            raise R2RException(
-                status_code=404,
-                message=f"File for document {document_id} not found",
-            )
+        async with storage.open(key) as file_content:
+            yield file_name, file_content, size
 
-        file_name, oid, size = (
-            result["name"],
-            result["oid"],
-            result["size"],
+    async def retrieve_file_stream(
+        self, document_id: UUID
+    ) -> tuple[str, ByteRangeStream, int]:
+        """
+        Retrieve a file as a function streaming any byte range of it,
+        `stream(start, end)` yielding bytes [start, end) one chunk at a
+        time.
+        """
+        file_name, storage, key, size = await self._get_file_record(
+            document_id
         )
 
-        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
-            file_content = await self._read_lobject(conn, oid)
-            return file_name, io.BytesIO(file_content), size
+        def stream(
+            start: int = 0, end: Optional[int] = None
+        ) -> AsyncIterator[bytes]:
+            return storage.stream(key, start, end)
+
+        return file_name, stream, size
 
     async def retrieve_files_as_zip(
         self,
         document_ids: Optional[list[UUID]] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-    ) -> tuple[str, BinaryIO, int]:
-        """Retrieve multiple files and return them as a zip file."""
+    ) -> tuple[str, AsyncIterator[bytes]]:
+        """
+        Retrieve multiple files as a zip archive that is written while it
+        is streamed, each entry as its file is read.
+        """
 
         query = f"""
-        SELECT document_id, name, oid, size
+        SELECT document_id, name, oid, storage_key, size
         FROM {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
         WHERE 1=1
         """
@@ -190,99 +305,107 @@ class PostgresFilesHandler(Handler):
                 message="No files found matching the specified criteria",
             )
 
-        zip_buffer = BytesIO()
-        total_size = 0
-
-        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
-            with ZipFile(zip_buffer, "w") as zip_file:
+        async def stream() -> AsyncIterator[bytes]:
+            sink = _ZipSink()
+            with ZipFile(sink, "w") as zip_file:
                 for record in results:
-                    file_content = await self._read_lobject(
-                        conn, record["oid"]
-                    )
-
-                    zip_file.writestr(record["name"], file_content)
-                    total_size += record["size"]
+                    storage, key = self._locate(record)
+                    with zip_file.open(
+                        record["name"], "w", force_zip64=True
+                    ) as entry:
+                        async for chunk in storage.stream(key):
+                            entry.write(chunk)
+                            if data := sink.drain():
+                                yield data
+                    # The entry's data descriptor
+                    yield sink.drain()
+            # The central directory, written on close
+            yield sink.drain()
 
-        zip_buffer.seek(0)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         zip_filename = f"files_export_{timestamp}.zip"
 
-        return zip_filename, zip_buffer, zip_buffer.getbuffer().nbytes
+        return zip_filename, stream()
 
-    async def _read_lobject(self, conn, oid: int) -> bytes:
-        """Read content from a large object."""
-        file_data = io.BytesIO()
-        chunk_size = 8192
+    async def _get_file_record(
+        self, document_id: UUID
+    ) -> tuple[str, FileStorageProvider, str, int]:
+        query = f"""
+        SELECT name, oid, storage_key, size
+        FROM {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
+        WHERE document_id = $1
+        """
 
-        async with conn.transaction():
-            try:
-                lo_exists = await conn.fetchval(
-                    "SELECT EXISTS(SELECT 1 FROM pg_largeobject WHERE loid = $1)",
-                    oid,
-                )
-                if not lo_exists:
-                    raise R2RException(
-                        status_code=404,
-                        message=f"Large object {oid} not found.",
-                    )
+        result = await self.connection_manager.fetchrow_query(
+            query, [document_id]
+        )
+        if not result:
+            raise R2RException(
+                status_code=404,
+                message=f"File for document {document_id} not found",
+            )
 
-                lobject = await conn.fetchval(
-                    "SELECT lo_open($1, 262144)", oid
-                )
+        storage, key = self._locate(result)
+        return result["name"], storage, key, result["size"]
 
-                if lobject is None:
-                    raise R2RException(
-                        status_code=404,
-                        message=f"Failed to open large object {oid}.",
-                    )
+    def _locate(self, record) -> tuple[FileStorageProvider, str]:
+        """The storage provider holding a file and its key there."""
+        if record["storage_key"] is None:
+            return self.large_objects, str(record["oid"])
+        return self.storage, record["storage_key"]
 
-                while True:
-                    chunk = await conn.fetchval(
-                        "SELECT loread($1, $2)", lobject, chunk_size
+    @asynccontextmanager
+    async def _lock_storage_key(
+        self, key: Optional[str]
+    ) -> AsyncIterator[Any]:
+        """
+        A transaction holding the advisory lock of a storage key, if any,
+        which serializes recording and releasing files that share it.
+        """
+        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
+            async with conn.transaction():
+                if key is not None:
+                    await conn.execute(
+                        "SELECT pg_advisory_xact_lock(hashtext($1))", key
                     )
-                    if not chunk:
-                        break
-                    file_data.write(chunk)
-            except asyncpg.exceptions.UndefinedObjectError as e:
-                raise R2RException(
-                    status_code=404,
-                    message=f"Failed to read large object {oid}: {e}",
-                )
-            finally:
-                await conn.execute("SELECT lo_close($1)", lobject)
+                yield conn
 
-        return file_data.getvalue()
+    async def _release(self, storage: FileStorageProvider, key: str) -> None:
+        """Deletes stored bytes unless another file shares them."""
+        if storage is self.large_objects:
+            await storage.delete(key)
+            return
+        query = f"""
+        SELECT EXISTS(
+            SELECT 1
+            FROM {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
+            WHERE storage_key = $1
+        )
+        """
+        async with self._lock_storage_key(key) as conn:
+            if not await conn.fetchval(query, key):
+                await storage.delete(key)
 
     async def delete_file(self, document_id: UUID) -> bool:
         """Delete a file from storage."""
         query = f"""
-        SELECT oid FROM {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
+        DELETE FROM {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
         WHERE document_id = $1
+        RETURNING oid, storage_key
         """
 
-        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
-            async with conn.transaction():
-                oid = await conn.fetchval(query, document_id)
-                if not oid:
-                    raise R2RException(
-                        status_code=404,
-                        message=f"File for document {document_id} not found",
-                    )
-
-                await self._delete_lobject(conn, oid)
-
-                delete_query = f"""
-                DELETE FROM {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
-                WHERE document_id = $1
-                """
-                await conn.execute(delete_query, document_id)
+        record = await self.connection_manager.fetchrow_query(
+            query, [document_id]
+        )
+        if not record:
+            raise R2RException(
+                status_code=404,
+                message=f"File for document {document_id} not found",
+            )
 
+        await self._release(*self._locate(record))
         return True
 
-    async def _delete_lobject(self, conn, oid: int) -> None:
-        """Delete a large object."""
-        await conn.execute("SELECT lo_unlink($1)", oid)
-
     async def get_files_overview(
         self,
         offset: int,
@@ -294,7 +417,7 @@ class PostgresFilesHandler(Handler):
         conditions = []
         params: list[str | list[str] | int] = []
         query = f"""
-        SELECT document_id, name, oid, size, type, created_at, updated_at
+        SELECT document_id, name, oid, storage_key, size, type, created_at, updated_at
         FROM {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
         """
 
@@ -325,6 +448,7 @@ class PostgresFilesHandler(Handler):
                 "document_id": row["document_id"],
                 "file_name": row["name"],
                 "file_oid": row["oid"],
+                "storage_key": row["storage_key"],
                 "file_size": row["size"],
                 "file_type": row["type"],
                 "created_at": row["created_at"],
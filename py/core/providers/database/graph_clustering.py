@@ -0,0 +1,173 @@
+"""
+Local hierarchical Leiden clustering, run in a worker process.
+
+Leiden over a large collection graph takes minutes of pure CPU; run inside
+the server it would hold the event loop for all of that time. The graph
+is instead shipped to a spawned worker as an `EdgeList`: node names are
+replaced by integer ids, so the worker receives two NumPy buffers rather
+than a list of relationship objects, and the clusters it returns are
+mapped back to names here.
+
+The worker reports its progress over a queue while it builds the graph
+and clusters it, then sends back the clusters. Cancelling the awaiting
+task terminates the worker, and a worker that dies is reported as such
+rather than waited on.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import queue
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+import numpy as np
+
+logger = logging.getLogger()
+
+# How often the caller checks the worker for progress and completion
+_POLL_INTERVAL = 0.5
+
+# Edges added to the worker's graph between progress reports
+_PROGRESS_EDGES = 100_000
+
+ProgressCallback = Callable[[str, float], Any]
+
+
+class CommunityAssignment(NamedTuple):
+    """
+    The fields of graspologic's `HierarchicalCluster`, with the node name.
+    """
+
+    node: str
+    cluster: int
+    parent_cluster: Optional[int]
+    level: int
+    is_final_cluster: bool
+
+
+@dataclass
+class EdgeList:
+    """
+    A weighted graph as an `(n, 2)` int32 array of node ids, a float32
+    weight per edge, and the node names the ids index into.
+    """
+
+    names: list[str]
+    edges: np.ndarray
+    weights: np.ndarray
+
+    @classmethod
+    def from_triples(
+        cls, triples: Iterable[tuple[str, str, Optional[float]]]
+    ) -> "EdgeList":
+        """
+        Encodes `(subject, object, weight)` triples. Missing weights count
+        as 1.0, as they do for the remote clustering service.
+        """
+        ids: dict[str, int] = {}
+        endpoints: list[int] = []
+        weights: list[float] = []
+        for subject, object, weight in triples:
+            endpoints.append(ids.setdefault(subject, len(ids)))
+            endpoints.append(ids.setdefault(object, len(ids)))
+            weights.append(1.0 if weight is None else weight)
+        return cls(
+            names=list(ids),
+            edges=np.array(endpoints, dtype=np.int32).reshape(-1, 2),
+            weights=np.array(weights, dtype=np.float32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+
+def _cluster_in_worker(
+    edges: np.ndarray,
+    weights: np.ndarray,
+    leiden_params: dict[str, Any],
+    messages: Any,
+) -> None:
+    """
+    Worker process entry point. Reports progress on `messages`, then puts
+    either graspologic's clusters, as plain tuples with the integer node
+    ids, or the exception that stopped it.
+    """
+    try:
+        import networkx as nx
+        from graspologic.partition import hierarchical_leiden
+
+        graph = nx.Graph()
+        for start in range(0, len(weights), _PROGRESS_EDGES):
+            stop = start + _PROGRESS_EDGES
+            graph.add_weighted_edges_from(
+                zip(
+                    edges[start:stop, 0].tolist(),
+                    edges[start:stop, 1].tolist(),
+                    weights[start:stop].tolist(),
+                    strict=True,
+                )
+            )
+            messages.put(("graph", min(stop, len(weights)) / len(weights)))
+
+        messages.put(("leiden", 0.0))
+        clusters = hierarchical_leiden(graph, **leiden_params)
+        messages.put(("leiden", 1.0))
+        messages.put(("result", [tuple(cluster) for cluster in clusters]))
+    except Exception as e:
+        messages.put(("error", e))
+
+
+async def cluster_edges(
+    edge_list: EdgeList,
+    leiden_params: dict[str, Any],
+    on_progress: Optional[ProgressCallback] = None,
+) -> list[CommunityAssignment]:
+    """
+    Runs `hierarchical_leiden` over `edge_list` in a spawned worker.
+
+    `on_progress` is called with the stage, `"graph"` or `"leiden"`, and
+    the fraction of it that is done. A worker that dies without a result,
+    e.g. killed for running out of memory, raises a `RuntimeError`.
+    """
+    context = multiprocessing.get_context("spawn")
+    messages = context.Queue()
+    worker = context.Process(
+        target=_cluster_in_worker,
+        args=(edge_list.edges, edge_list.weights, leiden_params, messages),
+        daemon=True,
+    )
+    worker.start()
+    try:
+        while True:
+            # Whatever a worker put before exiting is readable once it died
+            alive = worker.is_alive()
+            try:
+                kind, payload = await asyncio.to_thread(
+                    messages.get, timeout=_POLL_INTERVAL
+                )
+            except queue.Empty:
+                if not alive:
+                    raise RuntimeError(
+                        "Clustering worker exited with code "
+                        f"{worker.exitcode} before returning communities."
+                    )
+                continue
+            if kind == "result":
+                clusters = payload
+                break
+            if kind == "error":
+                raise payload
+            if on_progress is not None:
+                on_progress(kind, payload)
+    finally:
+        # Also stops a worker still clustering when the caller is cancelled
+        if worker.is_alive():
+            worker.terminate()
+        await asyncio.to_thread(worker.join)
+        messages.close()
+
+    return [
+        CommunityAssignment(edge_list.names[node], *rest)
+        for node, *rest in clusters
+    ]
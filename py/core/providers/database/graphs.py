@@ -8,7 +8,7 @@ import os
 import tempfile
 import time
 from typing import IO, Any, AsyncGenerator, Optional, Tuple
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import asyncpg
 import httpx
@@ -19,6 +19,7 @@ from core.base.abstractions import (
     Community,
     Entity,
     Graph,
+    GraphExtraction,
     GraphExtractionStatus,
     R2RException,
     Relationship,
@@ -28,12 +29,14 @@ from core.base.abstractions import (
 from core.base.api.models import GraphResponse
 from core.base.providers.database import Handler
 from core.base.utils import (
+    _decorate_vector_type,
     _get_vector_column_str,
     generate_entity_document_id,
 )
 
 from .base import PostgresConnectionManager
 from .collections import PostgresCollectionsHandler
+from .graph_clustering import CommunityAssignment, EdgeList, cluster_edges
 
 logger = logging.getLogger()
 
@@ -128,9 +131,6 @@ class PostgresEntitiesHandler(Handler):
             with contextlib.suppress(json.JSONDecodeError):
                 metadata = json.loads(metadata)
 
-        if isinstance(description_embedding, list):
-            description_embedding = str(description_embedding)
-
         query = f"""
             INSERT INTO {self._get_table_name(table_name)}
             (name, category, description, parent_id, description_embedding, chunk_ids, metadata)
@@ -781,9 +781,6 @@ class PostgresRelationshipsHandler(Handler):
             with contextlib.suppress(json.JSONDecodeError):
                 metadata = json.loads(metadata)
 
-        if isinstance(description_embedding, list):
-            description_embedding = str(description_embedding)
-
         query = f"""
             INSERT INTO {self._get_table_name(table_name)}
             (subject, predicate, object, description, subject_id, object_id,
@@ -1247,9 +1244,6 @@ class PostgresCommunitiesHandler(Handler):
     ) -> Community:
         table_name = "graphs_communities"
 
-        if isinstance(description_embedding, list):
-            description_embedding = str(description_embedding)
-
         query = f"""
             INSERT INTO {self._get_table_name(table_name)}
             (collection_id, name, summary, findings, rating, rating_explanation, description_embedding)
@@ -2133,6 +2127,118 @@ class PostgresGraphsHandler(Handler):
 
         return relationships, count
 
+    async def add_extractions(
+        self,
+        extractions: list[GraphExtraction],
+        store_type: StoreType = StoreType.DOCUMENTS,
+    ) -> tuple[int, int]:
+        """
+        Bulk write a batch of graph extractions in a single transaction.
+
+        Entity ids are assigned up front, so relationship endpoints are
+        resolved by name in memory without reading the entities back. Both
+        tables are then loaded with a binary COPY, which sends the
+        description embeddings in pgvector's binary format. As with
+        one-by-one inserts, a later entity shadows an earlier one of the
+        same name within an extraction, and relationships whose endpoints
+        are not among its entities are skipped.
+
+        Returns:
+            tuple[int, int]: The number of entities and relationships written
+        """
+        entity_records: list[tuple] = []
+        relationship_records: list[tuple] = []
+
+        for extraction in extractions:
+            entity_ids: dict[str, UUID] = {}
+            for entity in extraction.entities:
+                entity_id = uuid4()
+                entity_ids[entity.name] = entity_id
+                entity_records.append(
+                    (
+                        entity_id,
+                        entity.name,
+                        entity.category,
+                        entity.description,
+                        entity.parent_id,
+                        entity.description_embedding,
+                        entity.chunk_ids,
+                        _metadata_json(entity.metadata),
+                    )
+                )
+
+            for relationship in extraction.relationships:
+                subject_id = entity_ids.get(relationship.subject)
+                object_id = entity_ids.get(relationship.object)
+                if any(
+                    id is None
+                    for id in (subject_id, object_id, relationship.parent_id)
+                ):
+                    logger.warning(
+                        f"Missing ID for relationship: {relationship}"
+                    )
+                    continue
+
+                relationship_records.append(
+                    (
+                        relationship.subject,
+                        relationship.predicate,
+                        relationship.object,
+                        relationship.description,
+                        subject_id,
+                        object_id,
+                        relationship.weight,
+                        relationship.chunk_ids,
+                        relationship.parent_id,
+                        relationship.description_embedding,
+                        _metadata_json(relationship.metadata),
+                    )
+                )
+
+        if not entity_records:
+            return 0, 0
+
+        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
+            async with conn.transaction():
+                await conn.copy_records_to_table(
+                    self.entities._get_entity_table_for_store(store_type),
+                    schema_name=self.project_name,
+                    records=entity_records,
+                    columns=[
+                        "id",
+                        "name",
+                        "category",
+                        "description",
+                        "parent_id",
+                        "description_embedding",
+                        "chunk_ids",
+                        "metadata",
+                    ],
+                )
+                if relationship_records:
+                    await conn.copy_records_to_table(
+                        self.relationships._get_relationship_table_for_store(
+                            store_type
+                        ),
+                        schema_name=self.project_name,
+                        records=relationship_records,
+                        columns=[
+                            "subject",
+                            "predicate",
+                            "object",
+                            "description",
+                            "subject_id",
+                            "object_id",
+                            "weight",
+                            "chunk_ids",
+                            "parent_id",
+                            "description_embedding",
+                            "metadata",
+                        ],
+                    )
+
+        return len(entity_records), len(relationship_records)
+
     async def add_entities(
         self,
         entities: list[Entity],
@@ -2287,14 +2393,14 @@ class PostgresGraphsHandler(Handler):
 
         return communities, count
 
-    async def add_community(self, community: Community) -> None:
-        # TODO: Fix in the short term.
-        # we need to do this because postgres insert needs to be a string
-        community.description_embedding = str(community.description_embedding)  # type: ignore[assignment]
-
+    async def add_community(
+        self, community: Community, metadata: Optional[dict] = None
+    ) -> None:
         non_null_attrs = {
             k: v for k, v in community.__dict__.items() if v is not None
         }
+        if metadata is not None:
+            non_null_attrs["metadata"] = json.dumps(metadata)
         columns = ", ".join(non_null_attrs.keys())
         placeholders = ", ".join(
             f"${i + 1}" for i in range(len(non_null_attrs))
@@ -2315,6 +2421,89 @@ class PostgresGraphsHandler(Handler):
             QUERY, [tuple(non_null_attrs.values())]
         )
 
+    async def get_community_memberships(
+        self, collection_id: UUID
+    ) -> list[tuple[UUID, dict]]:
+        """
+        The `community_id` and metadata of every community in the
+        collection. Communities built incrementally record their member
+        nodes there.
+        """
+        QUERY = f"""
+            SELECT community_id, metadata
+            FROM {self._get_table_name("graphs_communities")}
+            WHERE collection_id = $1
+        """
+        rows = await self.connection_manager.fetch_query(
+            QUERY, [collection_id]
+        )
+
+        memberships = []
+        for row in rows:
+            metadata = row["metadata"]
+            if isinstance(metadata, str):
+                metadata = json.loads(metadata)
+            memberships.append((row["community_id"], metadata or {}))
+        return memberships
+
+    async def get_relationship_endpoints(
+        self,
+        collection_id: UUID,
+        created_after: Optional[datetime.datetime] = None,
+    ) -> list[tuple[str, str]]:
+        """
+        The subject and object of the collection's relationships, or of
+        those created after `created_after`.
+        """
+        conditions = ["parent_id = $1"]
+        params: list[Any] = [collection_id]
+        if created_after is not None:
+            conditions.append("created_at > $2")
+            params.append(created_after)
+
+        QUERY = f"""
+            SELECT subject, object
+            FROM {self._get_table_name("graphs_relationships")}
+            WHERE {" AND ".join(conditions)}
+        """
+        rows = await self.connection_manager.fetch_query(QUERY, params)
+        return [(row["subject"], row["object"]) for row in rows]
+
+    async def retire_communities(
+        self,
+        collection_id: UUID,
+        removed: list[UUID],
+        kept: list[UUID],
+        clustered_at: str,
+    ) -> None:
+        """
+        Ends an incremental clustering run: deletes the communities it
+        replaced and stamps the ones it kept with the run's start time.
+        """
+        table_name = self._get_table_name("graphs_communities")
+        DELETE_QUERY = f"""
+            DELETE FROM {table_name}
+            WHERE collection_id = $1 AND community_id = ANY($2)
+        """
+        STAMP_QUERY = f"""
+            UPDATE {table_name}
+            SET metadata = jsonb_set(
+                COALESCE(metadata, '{{}}'::jsonb),
+                '{{clustered_at}}',
+                to_jsonb($3::text)
+            )
+            WHERE collection_id = $1 AND community_id = ANY($2)
+        """
+
+        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
+            async with conn.transaction():
+                if removed:
+                    await conn.execute(DELETE_QUERY, collection_id, removed)
+                if kept:
+                    await conn.execute(
+                        STAMP_QUERY, collection_id, kept, clustered_at
+                    )
+
     async def delete(self, collection_id: UUID) -> None:
         graphs = await self.get(graph_id=collection_id, offset=0, limit=-1)
 
@@ -2350,9 +2539,50 @@ class PostgresGraphsHandler(Handler):
         clustering_mode: str,
     ) -> Tuple[int, Any]:
         """
-        Calls the external clustering service to cluster the graph.
+        Clusters the collection's graph, locally or with the external
+        clustering service.
         """
+        relationships: list[Relationship] | EdgeList
+        if clustering_mode == "remote":
+            relationships = await self._get_all_graph_relationships(
+                collection_id
+            )
+            num_relationships = len(relationships)
+        else:
+            # Local clustering only needs the endpoints and weights
+            rows = await self.connection_manager.fetch_query(
+                f"""
+                SELECT subject, object, weight
+                FROM {self._get_table_name("graphs_relationships")}
+                WHERE parent_id = $1
+                ORDER BY created_at
+                """,
+                [collection_id],
+            )
+            relationships = EdgeList.from_triples(
+                (row["subject"], row["object"], row["weight"]) for row in rows
+            )
+            num_relationships = len(relationships)
+
+        logger.info(
+            f"Clustering over {num_relationships} relationships for {collection_id} with settings: {leiden_params}"
+        )
+        if num_relationships == 0:
+            raise R2RException(
+                message="No relationships found for clustering",
+                status_code=400,
+            )
+
+        return await self._cluster_and_add_community_info(
+            relationships=relationships,
+            leiden_params=leiden_params,
+            collection_id=collection_id,
+            clustering_mode=clustering_mode,
+        )
 
+    async def _get_all_graph_relationships(
+        self, collection_id: UUID
+    ) -> list[Relationship]:
         offset = 0
         page_size = 1000
         all_relationships = []
@@ -2373,21 +2603,7 @@ class PostgresGraphsHandler(Handler):
             if offset >= count:
                 break
 
-        logger.info(
-            f"Clustering over {len(all_relationships)} relationships for {collection_id} with settings: {leiden_params}"
-        )
-        if len(all_relationships) == 0:
-            raise R2RException(
-                message="No relationships found for clustering",
-                status_code=400,
-            )
-
-        return await self._cluster_and_add_community_info(
-            relationships=all_relationships,
-            leiden_params=leiden_params,
-            collection_id=collection_id,
-            clustering_mode=clustering_mode,
-        )
+        return all_relationships
 
     async def _call_clustering_service(
         self, relationships: list[Relationship], leiden_params: dict[str, Any]
@@ -2425,16 +2641,17 @@ class PostgresGraphsHandler(Handler):
 
     async def _create_graph_and_cluster(
         self,
-        relationships: list[Relationship],
+        relationships: list[Relationship] | EdgeList,
         leiden_params: dict[str, Any],
         clustering_mode: str = "remote",
     ) -> Any:
         """
-        Create a graph and cluster it. If clustering_mode='local', use hierarchical_leiden locally.
+        Create a graph and cluster it. If clustering_mode='local', run hierarchical_leiden in a worker process.
         If clustering_mode='remote', call the external service.
         """
 
         if clustering_mode == "remote":
+            assert not isinstance(relationships, EdgeList)
             logger.info("Sending request to external clustering service...")
             communities = await self._call_clustering_service(
                 relationships, leiden_params
@@ -2442,24 +2659,24 @@ class PostgresGraphsHandler(Handler):
             logger.info("Received communities from clustering service.")
             return communities
         else:
-            # Local mode: run hierarchical_leiden directly
-            G = self.nx.Graph()
-            for relationship in relationships:
-                G.add_edge(
-                    relationship.subject,
-                    relationship.object,
-                    weight=relationship.weight,
-                    id=relationship.id,
+            # Local mode: run hierarchical_leiden in a worker process
+            edge_list = (
+                relationships
+                if isinstance(relationships, EdgeList)
+                else EdgeList.from_triples(
+                    (r.subject, r.object, r.weight) for r in relationships
                 )
-
+            )
             logger.info(
-                f"Graph has {len(G.nodes)} nodes and {len(G.edges)} edges"
+                f"Graph has {len(edge_list.names)} nodes and {len(edge_list)} edges"
+            )
+            return await self._compute_leiden_communities(
+                edge_list, leiden_params
             )
-            return await self._compute_leiden_communities(G, leiden_params)
 
     async def _cluster_and_add_community_info(
         self,
-        relationships: list[Relationship],
+        relationships: list[Relationship] | EdgeList,
         leiden_params: dict[str, Any],
         collection_id: UUID,
         clustering_mode: str = "local",
@@ -2502,7 +2719,7 @@ class PostgresGraphsHandler(Handler):
 
     async def get_entity_map(
         self, offset: int, limit: int, document_id: UUID
-    ) -> dict[str, dict[str, list[dict[str, Any]]]]:
+    ) -> dict[str, dict[str, list[Any]]]:
         QUERY1 = f"""
             WITH entities_list AS (
                 SELECT DISTINCT name
@@ -2603,10 +2820,7 @@ class PostgresGraphsHandler(Handler):
         property_names_str = ", ".join(property_names)
 
         # Build the WHERE clause from filters
-        params: list[str | int | bytes] = [
-            json.dumps(query_embedding),
-            limit,
-        ]
+        params: list[Any] = [query_embedding, limit]
         conditions_clause = self._build_filters(filters, params, search_type)
         where_clause = (
             f"WHERE {conditions_clause}" if conditions_clause else ""
@@ -2640,6 +2854,98 @@ class PostgresGraphsHandler(Handler):
             )
             yield output
 
+    async def graph_search_batch(
+        self,
+        query: str,
+        searches: list[dict[str, Any]],
+        query_embedding: list[float],
+        filters: Optional[dict] = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Run several `graph_search` lookups as a single UNION ALL statement.
+
+        Each entry in `searches` accepts the `search_type`, `limit`,
+        `embedding_type` and `property_names` keyword arguments of
+        `graph_search`. Results are returned per search, in the order the
+        searches were given, with the same row structure as `graph_search`.
+        """
+        if query_embedding is None:
+            raise ValueError(
+                "query_embedding must be provided for semantic search"
+            )
+        if not searches:
+            return []
+
+        filters = filters or {}
+        params: list[Any] = [query_embedding]
+        branches = []
+        property_lists = []
+        for branch_idx, search in enumerate(searches):
+            search_type = search.get("search_type", "entities")
+            embedding_type = search.get(
+                "embedding_type", "description_embedding"
+            )
+            property_names = list(
+                search.get("property_names", ["name", "description"])
+            )
+            if "metadata" not in property_names:
+                property_names.append("metadata")
+            property_lists.append(property_names)
+
+            conditions_clause = self._build_filters(
+                filters, params, search_type
+            )
+            where_clause = (
+                f"WHERE {conditions_clause}" if conditions_clause else ""
+            )
+            params.append(search.get("limit", 10))
+            # Rows from different tables are carried as jsonb so the
+            # branches share a column layout.
+            properties_obj = ", ".join(
+                f"'{prop}', {prop}" for prop in property_names
+            )
+            branches.append(
+                f"""
+                (
+                    SELECT
+                        {branch_idx} AS branch,
+                        jsonb_build_object({properties_obj}) AS properties,
+                        ({embedding_type} <=> $1) AS similarity_score
+                    FROM {self._get_table_name(f"graphs_{search_type}")}
+                    {where_clause}
+                    ORDER BY {embedding_type} <=> $1
+                    LIMIT ${len(params)}
+                )
+                """
+            )
+
+        QUERY = f"""
+            SELECT branch, properties, similarity_score
+            FROM ({" UNION ALL ".join(branches)}) AS graph_results
+            ORDER BY branch, similarity_score;
+        """
+
+        results = await self.connection_manager.fetch_query(
+            QUERY, tuple(params)
+        )
+
+        outputs: list[list[dict[str, Any]]] = [[] for _ in searches]
+        for result in results:
+            branch = result["branch"]
+            properties = json.loads(result["properties"])
+            output = {
+                prop: properties[prop]
+                for prop in property_lists[branch]
+                if prop in properties
+            }
+            output["similarity_score"] = (
+                1 - float(result["similarity_score"])
+                if result.get("similarity_score")
+                else "n/a"
+            )
+            outputs[branch].append(output)
+        return outputs
+
     def _build_filters(
         self, filter_dict: dict, parameters: list[Any], search_type: str
     ) -> str:
@@ -2773,33 +3079,36 @@ class PostgresGraphsHandler(Handler):
 
     async def _compute_leiden_communities(
         self,
-        graph: Any,
+        edge_list: EdgeList,
         leiden_params: dict[str, Any],
-    ) -> Any:
-        """Compute Leiden communities."""
-        try:
-            from graspologic.partition import hierarchical_leiden
-
-            if "random_seed" not in leiden_params:
-                leiden_params["random_seed"] = (
-                    7272  # add seed to control randomness
-                )
-
-            start_time = time.time()
-            logger.info(
-                f"Running Leiden clustering with params: {leiden_params}"
+    ) -> list[CommunityAssignment]:
+        """Compute Leiden communities in a worker process."""
+        if "random_seed" not in leiden_params:
+            leiden_params["random_seed"] = (
+                7272  # add seed to control randomness
             )
 
-            community_mapping = hierarchical_leiden(graph, **leiden_params)
+        start_time = time.time()
+        logger.info(f"Running Leiden clustering with params: {leiden_params}")
 
-            logger.info(
-                f"Leiden clustering completed in {time.time() - start_time:.2f} seconds."
-            )
-            return community_mapping
+        def log_progress(stage: str, done: float) -> None:
+            if stage == "graph":
+                logger.info(f"Leiden worker: graph {done:.0%} built")
+            elif done < 1:
+                logger.info("Leiden worker: clustering")
 
+        try:
+            community_mapping = await cluster_edges(
+                edge_list, leiden_params, on_progress=log_progress
+            )
         except ImportError as e:
             raise ImportError("Please install the graspologic package.") from e
 
+        logger.info(
+            f"Leiden clustering completed in {time.time() - start_time:.2f} seconds."
+        )
+        return community_mapping
+
     async def get_existing_document_entity_chunk_ids(
         self, document_id: UUID
     ) -> list[str]:
@@ -2839,24 +3148,73 @@ class PostgresGraphsHandler(Handler):
             "count"
         ]
 
-    async def update_entity_descriptions(self, entities: list[Entity]):
-        query = f"""
-            UPDATE {self._get_table_name("graphs_entities")}
-            SET description = $3, description_embedding = $4
-            WHERE name = $1 AND graph_id = $2
+    async def update_entity_descriptions(
+        self,
+        entities: list[Entity],
+        store_type: StoreType = StoreType.DOCUMENTS,
+    ) -> None:
+        """
+        Sets the description and description embedding of many entities in
+        one transaction. Entities with an id are matched on it; the others
+        update every entity of their name under their parent.
         """
+        if not entities:
+            return
+
+        table_name = self._get_table_name(
+            self.entities._get_entity_table_for_store(store_type)
+        )
+        vector_type = _get_vector_column_str(
+            self.dimension, self.quantization_type
+        )
+        # Sent through the binary vector codecs rather than as text
+        array_type = _decorate_vector_type("[]", self.quantization_type)
+        UPDATE_BY_ID = f"""
+            UPDATE {table_name} AS e
+            SET description = u.description,
+                description_embedding = u.description_embedding::{vector_type},
+                updated_at = NOW()
+            FROM unnest($1::uuid[], $2::text[], $3::{array_type})
+                AS u(id, description, description_embedding)
+            WHERE e.id = u.id
+        """
+        UPDATE_BY_NAME = f"""
+            UPDATE {table_name} AS e
+            SET description = u.description,
+                description_embedding = u.description_embedding::{vector_type},
+                updated_at = NOW()
+            FROM unnest($1::uuid[], $2::text[], $3::text[], $4::{array_type})
+                AS u(parent_id, name, description, description_embedding)
+            WHERE e.parent_id = u.parent_id AND e.name = u.name
+        """
+
+        by_id = [entity for entity in entities if entity.id]
+        by_name = [entity for entity in entities if not entity.id]
+        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
+            async with conn.transaction():
+                if by_id:
+                    await conn.execute(
+                        UPDATE_BY_ID,
+                        [entity.id for entity in by_id],
+                        [entity.description for entity in by_id],
+                        [entity.description_embedding for entity in by_id],
+                    )
+                if by_name:
+                    await conn.execute(
+                        UPDATE_BY_NAME,
+                        [entity.parent_id for entity in by_name],
+                        [entity.name for entity in by_name],
+                        [entity.description for entity in by_name],
+                        [entity.description_embedding for entity in by_name],
+                    )
 
-        inputs = [
-            (
-                entity.name,
-                entity.parent_id,
-                entity.description,
-                entity.description_embedding,
-            )
-            for entity in entities
-        ]
 
-        await self.connection_manager.execute_many(query, inputs)  # type: ignore
+def _metadata_json(metadata: Optional[dict[str, Any] | str]) -> str | None:
+    """Serialize metadata for a JSONB column, as the single-row inserts do."""
+    if isinstance(metadata, str):
+        with contextlib.suppress(json.JSONDecodeError):
+            metadata = json.loads(metadata)
+    return json.dumps(metadata) if metadata else None
 
 
 def _json_serialize(obj):
@@ -10,10 +10,15 @@ from ...base.providers import (
     PostgresConfigurationSettings,
 )
 from .base import PostgresConnectionManager, SemaphoreConnectionPool
+from .chunk_quotas import PostgresChunkQuotasHandler
 from .chunks import PostgresChunksHandler
 from .collections import PostgresCollectionsHandler
 from .conversations import PostgresConversationsHandler
 from .documents import PostgresDocumentsHandler
+from .embedding_cache import (
+    PostgresChunkEmbeddingsHandler,
+    PostgresEmbeddingCacheHandler,
+)
 from .files import PostgresFilesHandler
 from .graphs import (
     PostgresCommunitiesHandler,
@@ -68,6 +73,9 @@ class PostgresDatabaseProvider(DatabaseProvider):
     files_handler: PostgresFilesHandler
     conversations_handler: PostgresConversationsHandler
     limits_handler: PostgresLimitsHandler
+    embedding_cache_handler: PostgresEmbeddingCacheHandler
+    chunk_embeddings_handler: PostgresChunkEmbeddingsHandler
+    chunk_quotas_handler: PostgresChunkQuotasHandler
 
     def __init__(
         self,
@@ -150,6 +158,7 @@ class PostgresDatabaseProvider(DatabaseProvider):
             self.connection_manager,
             self.dimension,
             self.quantization_type,
+            copy_upsert_threshold=config.copy_upsert_threshold,
         )
         self.conversations_handler = PostgresConversationsHandler(
             self.project_name, self.connection_manager
@@ -194,6 +203,17 @@ class PostgresDatabaseProvider(DatabaseProvider):
             connection_manager=self.connection_manager,
             config=self.config,
         )
+        self.embedding_cache_handler = PostgresEmbeddingCacheHandler(
+            self.project_name, self.connection_manager
+        )
+        self.chunk_embeddings_handler = PostgresChunkEmbeddingsHandler(
+            self.project_name,
+            self.connection_manager,
+            ttl_seconds=config.chunk_embeddings_ttl_seconds,
+        )
+        self.chunk_quotas_handler = PostgresChunkQuotasHandler(
+            self.project_name, self.connection_manager
+        )
 
     async def initialize(self):
         logger.info("Initializing `PostgresDatabaseProvider`.")
@@ -213,6 +233,7 @@ class PostgresDatabaseProvider(DatabaseProvider):
             await conn.execute(
                 f'CREATE SCHEMA IF NOT EXISTS "{self.project_name}";'
             )
+        await self.pool.reload_type_codecs()
 
         await self.documents_handler.create_tables()
         await self.collections_handler.create_tables()
@@ -227,6 +248,9 @@ class PostgresDatabaseProvider(DatabaseProvider):
         await self.relationships_handler.create_tables()
         await self.conversations_handler.create_tables()
         await self.limits_handler.create_tables()
+        await self.embedding_cache_handler.create_tables()
+        await self.chunk_embeddings_handler.create_tables()
+        await self.chunk_quotas_handler.create_tables()
 
     def _get_postgres_configuration_settings(
         self, config: DatabaseConfig
@@ -0,0 +1,104 @@
+"""
+Binary asyncpg codecs for pgvector's `vector` and `halfvec` types and for
+`bit`, so vectors are sent and received without a float-to-text round trip.
+
+Vectors decode into NumPy float32 arrays and bit strings into NumPy boolean
+arrays. Encoders accept anything `numpy.asarray` does, as well as the
+`"[1.0, 2.0]"` text form that some callers still pass around.
+"""
+
+import json
+import struct
+from typing import Any
+
+import numpy as np
+from asyncpg import Connection
+
+
+def _as_array(value: Any, dtype: str) -> np.ndarray:
+    if isinstance(value, str):
+        value = json.loads(value)
+    return np.asarray(value, dtype=dtype).ravel()
+
+
+def encode_vector(value: Any) -> bytes:
+    """
+    pgvector's binary `vector` format: the dimension and an unused int16,
+    followed by big-endian float4 values.
+    """
+    array = _as_array(value, ">f4")
+    return struct.pack(">HH", array.size, 0) + array.tobytes()
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    dimension, _ = struct.unpack_from(">HH", data)
+    return np.frombuffer(data, dtype=">f4", count=dimension, offset=4).astype(
+        np.float32
+    )
+
+
+def encode_halfvec(value: Any) -> bytes:
+    """Same layout as `vector`, with big-endian float2 values."""
+    array = _as_array(value, ">f2")
+    return struct.pack(">HH", array.size, 0) + array.tobytes()
+
+
+def decode_halfvec(data: bytes) -> np.ndarray:
+    dimension, _ = struct.unpack_from(">HH", data)
+    return np.frombuffer(data, dtype=">f2", count=dimension, offset=4).astype(
+        np.float32
+    )
+
+
+def encode_bit(value: Any) -> bytes:
+    """
+    Postgres' binary `bit` format: the int32 bit length followed by the bits,
+    most significant first. Accepts boolean arrays or strings of 0s and 1s.
+    """
+    if isinstance(value, (str, bytes)):
+        if isinstance(value, str):
+            value = value.encode("ascii")
+        bits = np.frombuffer(value, dtype=np.uint8) == ord("1")
+    else:
+        bits = np.asarray(value, dtype=bool).ravel()
+    return struct.pack(">i", bits.size) + np.packbits(bits).tobytes()
+
+
+def decode_bit(data: bytes) -> np.ndarray:
+    (length,) = struct.unpack_from(">i", data)
+    return np.unpackbits(
+        np.frombuffer(data, dtype=np.uint8, offset=4), count=length
+    ).astype(bool)
+
+
+VECTOR_CODECS = {
+    "vector": (encode_vector, decode_vector),
+    "halfvec": (encode_halfvec, decode_halfvec),
+    "bit": (encode_bit, decode_bit),
+}
+
+
+async def register_vector_codecs(conn: Connection) -> None:
+    """
+    Registers the binary codecs on `conn` for whichever of the types exist.
+    pgvector's types are missing until the extension has been created.
+    """
+    rows = await conn.fetch(
+        """
+        SELECT t.typname, n.nspname
+        FROM pg_type t
+        JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE t.typname = ANY($1::text[])
+        AND n.nspname NOT LIKE 'pg_toast%'
+        """,
+        list(VECTOR_CODECS),
+    )
+    for row in rows:
+        encoder, decoder = VECTOR_CODECS[row["typname"]]
+        await conn.set_type_codec(
+            row["typname"],
+            schema=row["nspname"],
+            encoder=encoder,
+            decoder=decoder,
+            format="binary",
+        )
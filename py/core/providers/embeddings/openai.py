@@ -2,7 +2,6 @@ import logging
 import os
 from typing import Any
 
-import tiktoken
 from openai import AsyncOpenAI, AuthenticationError, OpenAI
 from openai._types import NOT_GIVEN
 
@@ -12,6 +11,7 @@ from core.base import (
     EmbeddingProvider,
     EmbeddingPurpose,
 )
+from core.utils import get_tokenizer
 
 logger = logging.getLogger()
 
@@ -237,7 +237,7 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
     def tokenize_string(self, text: str, model: str) -> list[int]:
         if model not in OpenAIEmbeddingProvider.MODEL_TO_TOKENIZER:
             raise ValueError(f"OpenAI embedding model {model} not supported.")
-        encoding = tiktoken.get_encoding(
+        encoding = get_tokenizer(
             OpenAIEmbeddingProvider.MODEL_TO_TOKENIZER[model]
         )
         return encoding.encode(text)
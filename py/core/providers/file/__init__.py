@@ -0,0 +1,9 @@
+from .local import LocalFileStorageProvider
+from .postgres import PostgresFileStorageProvider
+from .s3 import S3FileStorageProvider
+
+__all__ = [
+    "LocalFileStorageProvider",
+    "PostgresFileStorageProvider",
+    "S3FileStorageProvider",
+]
@@ -0,0 +1,127 @@
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Optional
+
+from core.base import (
+    FileConfig,
+    FileStorageProvider,
+    R2RException,
+    StoredFile,
+)
+
+logger = logging.getLogger()
+
+# Bytes read from disk per chunk when streaming a file
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class LocalFileStorageProvider(FileStorageProvider):
+    """
+    Stores files on a local or mounted filesystem under the sha256 of their
+    content, so identical uploads share one file, and hands them to parsers
+    memory-mapped.
+    """
+
+    def __init__(self, config: FileConfig):
+        super().__init__(config)
+        self.root = Path(config.root)  # type: ignore
+        self.partial_dir = self.root / "partial"
+
+    async def store(
+        self, chunks: AsyncIterable[bytes], max_size: Optional[int] = None
+    ) -> StoredFile:
+        await asyncio.to_thread(
+            self.partial_dir.mkdir, parents=True, exist_ok=True
+        )
+        fd, partial = await asyncio.to_thread(
+            tempfile.mkstemp, dir=self.partial_dir
+        )
+        size = 0
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as file:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise R2RException(
+                            status_code=413,
+                            message=(
+                                f"File size exceeds maximum of {max_size} bytes."
+                            ),
+                        )
+                    digest.update(chunk)
+                    await asyncio.to_thread(file.write, chunk)
+            key = digest.hexdigest()
+            # A file already stored under this key has the same content
+            await asyncio.to_thread(self._commit, partial, self._path(key))
+        except BaseException:
+            await asyncio.to_thread(Path(partial).unlink, missing_ok=True)
+            raise
+        return StoredFile(key, size, key)
+
+    async def stream(
+        self, key: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        file = await asyncio.to_thread(self._open, key)
+        try:
+            await asyncio.to_thread(file.seek, start)
+            remaining = None if end is None else end - start
+            while remaining is None or remaining > 0:
+                chunk_size = READ_CHUNK_SIZE
+                if remaining is not None:
+                    chunk_size = min(chunk_size, remaining)
+                    remaining -= chunk_size
+                chunk = await asyncio.to_thread(file.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await asyncio.to_thread(file.close)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).is_file)
+
+    @asynccontextmanager
+    async def open(self, key: str) -> AsyncIterator[bytes | memoryview]:
+        file = await asyncio.to_thread(self._open, key)
+        try:
+            if os.fstat(file.fileno()).st_size == 0:
+                # Empty files cannot be mapped
+                yield b""
+                return
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mapped  # type: ignore
+            finally:
+                try:
+                    mapped.close()
+                except BufferError:
+                    # Still exported by a parser; unmapped once released
+                    pass
+        finally:
+            file.close()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def _open(self, key: str):
+        try:
+            return open(self._path(key), "rb")
+        except FileNotFoundError:
+            raise R2RException(
+                status_code=404, message=f"Stored file {key} not found."
+            )
+
+    @staticmethod
+    def _commit(partial: str, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(partial, path)
@@ -0,0 +1,141 @@
+import hashlib
+import logging
+from typing import AsyncIterable, AsyncIterator, Optional
+
+import asyncpg
+from fastapi import HTTPException
+
+from core.base import (
+    DatabaseConnectionManager,
+    FileConfig,
+    FileStorageProvider,
+    R2RException,
+    StoredFile,
+)
+
+logger = logging.getLogger()
+
+# Bytes moved per lowrite or loread call
+LOBJECT_CHUNK_SIZE = 1024 * 1024
+
+
+class PostgresFileStorageProvider(FileStorageProvider):
+    """Stores files as Postgres large objects, keyed by their oid."""
+
+    def __init__(
+        self,
+        config: FileConfig,
+        connection_manager: DatabaseConnectionManager,
+    ):
+        super().__init__(config)
+        self.connection_manager = connection_manager
+
+    async def store(
+        self, chunks: AsyncIterable[bytes], max_size: Optional[int] = None
+    ) -> StoredFile:
+        size = 0
+        digest = hashlib.sha256()
+
+        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
+            # Rolling back the transaction also drops the large object
+            async with conn.transaction():
+                oid = await conn.fetchval("SELECT lo_create(0)")
+                lobject = await conn.fetchval(
+                    "SELECT lo_open($1, $2)", oid, 0x20000
+                )
+                try:
+                    async for chunk in chunks:
+                        size += len(chunk)
+                        if max_size is not None and size > max_size:
+                            raise R2RException(
+                                status_code=413,
+                                message=(
+                                    f"File size exceeds maximum of "
+                                    f"{max_size} bytes."
+                                ),
+                            )
+                        digest.update(chunk)
+                        await conn.execute(
+                            "SELECT lowrite($1, $2)", lobject, chunk
+                        )
+                    await conn.execute("SELECT lo_close($1)", lobject)
+                except R2RException:
+                    raise
+                except Exception as e:
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Failed to write to large object: {e}",
+                    ) from e
+
+        return StoredFile(str(oid), size, digest.hexdigest())
+
+    async def stream(
+        self, key: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
+            async for chunk in self.iter_lobject(conn, int(key), start, end):
+                yield chunk
+
+    async def delete(self, key: str) -> None:
+        await self.connection_manager.execute_query(
+            "SELECT lo_unlink($1)", [int(key)]
+        )
+
+    async def exists(self, key: str) -> bool:
+        result = await self.connection_manager.fetchrow_query(
+            "SELECT EXISTS(SELECT 1 FROM pg_largeobject_metadata WHERE oid = $1)",
+            [int(key)],
+        )
+        return bool(result and result["exists"])
+
+    async def iter_lobject(
+        self, conn, oid: int, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Read bytes [start, end) of a large object on `conn`."""
+        remaining = None if end is None else end - start
+
+        async with conn.transaction():
+            try:
+                lo_exists = await conn.fetchval(
+                    "SELECT EXISTS(SELECT 1 FROM pg_largeobject_metadata WHERE oid = $1)",
+                    oid,
+                )
+                if not lo_exists:
+                    raise R2RException(
+                        status_code=404,
+                        message=f"Large object {oid} not found.",
+                    )
+
+                lobject = await conn.fetchval(
+                    "SELECT lo_open($1, 262144)", oid
+                )
+
+                if lobject is None:
+                    raise R2RException(
+                        status_code=404,
+                        message=f"Failed to open large object {oid}.",
+                    )
+
+                try:
+                    if start:
+                        await conn.execute(
+                            "SELECT lo_lseek64($1, $2, 0)", lobject, start
+                        )
+                    while remaining is None or remaining > 0:
+                        chunk_size = LOBJECT_CHUNK_SIZE
+                        if remaining is not None:
+                            chunk_size = min(chunk_size, remaining)
+                            remaining -= chunk_size
+                        chunk = await conn.fetchval(
+                            "SELECT loread($1, $2)", lobject, chunk_size
+                        )
+                        if not chunk:
+                            break
+                        yield chunk
+                finally:
+                    await conn.execute("SELECT lo_close($1)", lobject)
+            except asyncpg.exceptions.UndefinedObjectError as e:
+                raise R2RException(
+                    status_code=404,
+                    message=f"Failed to read large object {oid}: {e}",
+                )
@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import logging
+from typing import AsyncIterable, AsyncIterator, Optional
+from uuid import uuid4
+
+from core.base import (
+    FileConfig,
+    FileStorageProvider,
+    R2RException,
+    StoredFile,
+)
+
+logger = logging.getLogger()
+
+# Multipart upload part size; every part but the last must be at least 5 MiB
+PART_SIZE = 8 * 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class S3FileStorageProvider(FileStorageProvider):
+    """Stores files in an S3 or S3-compatible bucket."""
+
+    def __init__(self, config: FileConfig):
+        super().__init__(config)
+        try:
+            import boto3
+        except ImportError:
+            raise ImportError(
+                "boto3 not installed. Please install it using `pip install boto3`."
+            )
+        # Unset credentials fall back to boto3's usual environment lookup
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=config.endpoint_url or None,
+            region_name=config.region_name or None,
+            aws_access_key_id=config.aws_access_key_id or None,
+            aws_secret_access_key=config.aws_secret_access_key or None,
+        )
+        self.bucket_name = config.bucket_name
+
+    async def store(
+        self, chunks: AsyncIterable[bytes], max_size: Optional[int] = None
+    ) -> StoredFile:
+        key = f"files/{uuid4()}"
+        upload = await asyncio.to_thread(
+            self.client.create_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=key,
+        )
+        parts: list[dict] = []
+        buffer = bytearray()
+        size = 0
+        digest = hashlib.sha256()
+
+        async def upload_part() -> None:
+            response = await asyncio.to_thread(
+                self.client.upload_part,
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload["UploadId"],
+                PartNumber=len(parts) + 1,
+                Body=bytes(buffer),
+            )
+            parts.append(
+                {"ETag": response["ETag"], "PartNumber": len(parts) + 1}
+            )
+            buffer.clear()
+
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise R2RException(
+                        status_code=413,
+                        message=f"File size exceeds maximum of {max_size} bytes.",
+                    )
+                digest.update(chunk)
+                buffer += chunk
+                if len(buffer) >= PART_SIZE:
+                    await upload_part()
+            if buffer or not parts:
+                await upload_part()
+            await asyncio.to_thread(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload["UploadId"],
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await asyncio.to_thread(
+                self.client.abort_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload["UploadId"],
+            )
+            raise
+        return StoredFile(key, size, digest.hexdigest())
+
+    async def stream(
+        self, key: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        request = {"Bucket": self.bucket_name, "Key": key}
+        if start or end is not None:
+            last = "" if end is None else str(end - 1)
+            request["Range"] = f"bytes={start}-{last}"
+        try:
+            response = await asyncio.to_thread(
+                self.client.get_object, **request
+            )
+        except self.client.exceptions.NoSuchKey:
+            raise R2RException(
+                status_code=404, message=f"Stored file {key} not found."
+            )
+        body = response["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, READ_CHUNK_SIZE):
+                yield chunk
+        finally:
+            body.close()
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(
+            self.client.delete_object, Bucket=self.bucket_name, Key=key
+        )
+
+    async def exists(self, key: str) -> bool:
+        try:
+            await asyncio.to_thread(
+                self.client.head_object, Bucket=self.bucket_name, Key=key
+            )
+        except self.client.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return False
+            raise
+        return True
@@ -12,12 +12,14 @@ from core.base import (
     DocumentType,
     IngestionConfig,
     IngestionProvider,
+    ParserExecutionMode,
     R2RDocumentProcessingError,
-    RecursiveCharacterTextSplitter,
+    RecursiveSpanTextSplitter,
+    RecursiveTokenTextSplitter,
     TextSplitter,
 )
 from core.base.abstractions import DocumentChunk
-from core.utils import generate_extraction_id
+from core.utils import generate_extraction_id, get_tokenizer
 
 from ...database import PostgresDatabaseProvider
 from ...llm import (
@@ -25,6 +27,7 @@ from ...llm import (
     OpenAICompletionProvider,
     R2RCompletionProvider,
 )
+from .parser_executor import ParserExecutor
 
 logger = logging.getLogger()
 
@@ -78,6 +81,7 @@ class R2RIngestionProvider(IngestionProvider):
             "unstructured": parsers.PDFParserUnstructured,
             "zerox": parsers.VLMPDFParser,
         },
+        DocumentType.TSV: {"advanced": parsers.TSVParserAdvanced},
         DocumentType.XLSX: {"advanced": parsers.XLSXParserAdvanced},
     }
 
@@ -110,7 +114,9 @@ class R2RIngestionProvider(IngestionProvider):
         ) = llm_provider
         self.parsers: dict[DocumentType, AsyncParser] = {}
         self.text_splitter = self._build_text_splitter()
+        self.parser_executor = ParserExecutor(self.config)
         self._initialize_parsers()
+        self._validate_parser_execution()
 
         logger.info(
             f"R2RIngestionProvider initialized with config: {self.config}"
@@ -159,7 +165,18 @@ class R2RIngestionProvider(IngestionProvider):
         )
 
         if chunking_strategy == ChunkingStrategy.RECURSIVE:
-            return RecursiveCharacterTextSplitter(
+            return RecursiveSpanTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+            )
+        elif chunking_strategy == ChunkingStrategy.TOKEN:
+            # Sizes are in tokens of the configured tokenizer
+            tokenizer = (
+                ingestion_config_override.get("chunk_tokenizer")
+                or self.config.chunk_tokenizer
+            )
+            return RecursiveTokenTextSplitter(
+                tokenizer=get_tokenizer(tokenizer),
                 chunk_size=chunk_size,
                 chunk_overlap=chunk_overlap,
             )
@@ -196,6 +213,20 @@ class R2RIngestionProvider(IngestionProvider):
         parsed_document: str | DocumentChunk,
         ingestion_config_override: dict,
     ) -> AsyncGenerator[Any, None]:
+        for chunk, _ in self._chunk_with_offsets(
+            parsed_document, ingestion_config_override
+        ):
+            yield chunk
+
+    def _chunk_with_offsets(
+        self,
+        parsed_document: str | DocumentChunk,
+        ingestion_config_override: dict,
+    ):
+        """
+        Yields each chunk together with its `(start, end)` character offsets
+        in the parsed text, or `None` when the splitter does not track them.
+        """
         text_spliiter = self.text_splitter
         if ingestion_config_override:
             text_spliiter = self._build_text_splitter(
@@ -205,6 +236,10 @@ class R2RIngestionProvider(IngestionProvider):
             parsed_document = parsed_document.data
 
         if isinstance(parsed_document, str):
+            if isinstance(text_spliiter, RecursiveSpanTextSplitter):
+                for start, end in text_spliiter.split_spans(parsed_document):
+                    yield parsed_document[start:end], (start, end)
+                return
             chunks = text_spliiter.create_documents([parsed_document])
         else:
             # Assuming parsed_document is already a list of text chunks
@@ -212,7 +247,12 @@ class R2RIngestionProvider(IngestionProvider):
 
         for chunk in chunks:
             yield (
-                chunk.page_content if hasattr(chunk, "page_content") else chunk
+                (
+                    chunk.page_content
+                    if hasattr(chunk, "page_content")
+                    else chunk
+                ),
+                None,
             )
 
     async def parse(  # type: ignore
@@ -228,53 +268,33 @@ class R2RIngestionProvider(IngestionProvider):
             )
         else:
             t0 = time.time()
-            contents = []
             parser_overrides = ingestion_config_override.get(
                 "parser_overrides", {}
             )
-            if document.document_type.value in parser_overrides:
-                logger.info(
-                    f"Using parser_override for {document.document_type} with input value {parser_overrides[document.document_type.value]}"
-                )
-                # TODO - Cleanup this approach to be less hardcoded
-                if (
-                    document.document_type != DocumentType.PDF
-                    or parser_overrides[DocumentType.PDF.value] != "zerox"
-                ):
-                    raise ValueError(
-                        "Only Zerox PDF parser override is available."
-                    )
-                async for chunk in self.parsers[
-                    f"zerox_{DocumentType.PDF.value}"
-                ].ingest(file_content, **ingestion_config_override):
-                    if isinstance(chunk, dict) and chunk.get("content"):
-                        contents.append(chunk)
-                    elif (
-                        chunk
-                    ):  # Handle string output for backward compatibility
-                        contents.append({"content": chunk})
-            else:
-                async for text in self.parsers[document.document_type].ingest(
-                    file_content, **ingestion_config_override
-                ):
-                    if text is not None:
-                        contents.append({"content": text})
-
-            if not contents:
-                logging.warning(
-                    "No valid text content was extracted during parsing"
-                )
-                return
+            contents = self._parse_contents(
+                file_content,
+                document,
+                parser_overrides.get(document.document_type.value),
+                ingestion_config_override,
+            )
 
             iteration = 0
-            for content_item in contents:
+            # Chunk each parsed item as it arrives rather than after parsing
+            async for content_item in contents:
                 chunk_text = content_item["content"]
-                chunks = self.chunk(chunk_text, ingestion_config_override)
+                chunks = self._chunk_with_offsets(
+                    chunk_text, ingestion_config_override
+                )
 
-                for chunk in chunks:
+                for chunk, offsets in chunks:
                     metadata = {**document.metadata, "chunk_order": iteration}
                     if "page_number" in content_item:
                         metadata["page_number"] = content_item["page_number"]
+                    if offsets is not None:
+                        # Character offsets within the parsed text it came from
+                        metadata["start_index"], metadata["end_index"] = (
+                            offsets
+                        )
 
                     extraction = DocumentChunk(
                         id=generate_extraction_id(document.id, iteration),
@@ -287,11 +307,95 @@ class R2RIngestionProvider(IngestionProvider):
                     iteration += 1
                     yield extraction
 
+            if iteration == 0:
+                logging.warning(
+                    "No valid text content was extracted during parsing"
+                )
+                return
+
             logger.debug(
                 f"Parsed document with id={document.id}, title={document.metadata.get('title', None)}, "
                 f"user_id={document.metadata.get('user_id', None)}, metadata={document.metadata} "
                 f"into {iteration} extractions in t={time.time() - t0:.2f} seconds."
             )
 
+    async def _parse_contents(
+        self,
+        file_content: bytes,
+        document: Document,
+        parser_override: Optional[str],
+        ingestion_config_override: dict,
+    ) -> AsyncGenerator[dict, None]:
+        if not parser_override:
+            async for text in self.parser_executor.parse(
+                self.parsers[document.document_type],
+                document.document_type.value,
+                file_content,
+                **ingestion_config_override,
+            ):
+                yield {"content": text}
+            return
+
+        logger.info(
+            f"Using parser_override for {document.document_type} with input value {parser_override}"
+        )
+        parser = self._get_extra_parser(
+            document.document_type, parser_override
+        )
+        if parser_override != "zerox":
+            async for text in self.parser_executor.parse(
+                parser,
+                document.document_type.value,
+                file_content,
+                **ingestion_config_override,
+            ):
+                yield {"content": text}
+            return
+
+        if not isinstance(file_content, (bytes, str)):
+            file_content = bytes(file_content)
+        # Zerox calls the vision model, so it always runs on the event loop
+        async for chunk in parser.ingest(
+            file_content, **ingestion_config_override
+        ):
+            if isinstance(chunk, dict) and chunk.get("content"):
+                yield chunk
+            elif chunk:  # Handle string output for backward compatibility
+                yield {"content": chunk}
+
+    def _validate_parser_execution(self) -> None:
+        # Process workers build their parsers without providers
+        for doc_type, parser in self.parsers.items():
+            if not getattr(parser, "requires_providers", False):
+                continue
+            settings = self.config.get_parser_execution(doc_type.value)
+            if settings.mode == ParserExecutionMode.PROCESS:
+                raise ValueError(
+                    f"The {doc_type.value} parser calls the completion "
+                    "provider and cannot run in process mode."
+                )
+
+    def shutdown(self) -> None:
+        self.parser_executor.shutdown()
+
+    def _get_extra_parser(
+        self, doc_type: DocumentType, parser_name: str
+    ) -> AsyncParser:
+        key = f"{parser_name}_{doc_type.value}"
+        if key not in self.parsers:
+            extra_parsers = R2RIngestionProvider.EXTRA_PARSERS.get(
+                doc_type, {}
+            )
+            if parser_name not in extra_parsers:
+                raise ValueError(
+                    f"Parser override '{parser_name}' is not available for {doc_type.value}."
+                )
+            self.parsers[key] = extra_parsers[parser_name](
+                config=self.config,
+                database_provider=self.database_provider,
+                llm_provider=self.llm_provider,
+            )
+        return self.parsers[key]
+
     def get_parser_for_document_type(self, doc_type: DocumentType) -> Any:
         return self.parsers.get(doc_type)
@@ -0,0 +1,288 @@
+"""
+Runs document parsers inline, on a worker thread or in a process pool.
+
+Parsers are async generators, but most of them do nothing but CPU-bound
+work on the file bytes; run inline, a large PDF or spreadsheet holds the
+event loop for the whole parse. The thread and process backends drive the
+parser's generator on their own event loop and stream each yielded text
+back, so the caller still consumes an async generator.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from multiprocessing.managers import SyncManager
+from typing import Any, AsyncGenerator, Callable, Optional
+
+from core.base import (
+    AsyncParser,
+    IngestionConfig,
+    ParserExecutionMode,
+    ParserExecutionSettings,
+)
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger()
+
+# How often a consumer waiting on a worker checks whether it has died
+_POLL_INTERVAL = 0.5
+
+# Builds a parser in a worker, from the ingestion config alone
+ParserFactory = Callable[..., AsyncParser]
+
+
+class _StreamClosed(Exception):
+    pass
+
+
+def _retrieve_result(future: asyncio.Future) -> None:
+    # Marks the outcome as seen when the consumer has stopped listening
+    if not future.cancelled():
+        future.exception()
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("Parser exceeded its time limit")
+
+
+async def _drain_parser(
+    parser: AsyncParser, data: bytes, kwargs: dict, emit
+) -> None:
+    async for text in parser.ingest(data, **kwargs):
+        if text is not None:
+            emit(text)
+
+
+def _parse_in_worker(
+    parser_factory: ParserFactory,
+    config: IngestionConfig,
+    data: bytes,
+    kwargs: dict,
+    results: Any,
+    timeout: Optional[float],
+    memory_limit_mb: Optional[int],
+) -> None:
+    """
+    Process pool entry point. Puts every text the parser yields on `results`
+    followed by `None`. The limits are enforced inside the worker so a
+    runaway parse fails on its own instead of taking the worker down.
+    """
+    previous_limit = None
+    if memory_limit_mb and resource is not None:
+        previous_limit = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(
+            resource.RLIMIT_AS,
+            (memory_limit_mb * 1024 * 1024, previous_limit[1]),
+        )
+    if timeout:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        parser = parser_factory(
+            config=config, database_provider=None, llm_provider=None
+        )
+        asyncio.run(_drain_parser(parser, data, kwargs, results.put))
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        if previous_limit is not None:
+            resource.setrlimit(resource.RLIMIT_AS, previous_limit)
+        results.put(None)
+
+
+class ParserExecutor:
+    """
+    Dispatches parsing to the backend configured for each document type.
+
+    The process pool and the manager that carries results back from it are
+    started on first use, with the `spawn` start method so workers never
+    inherit the server's event loop or threads. Waiting on those results
+    blocks a thread, so it is done on a pool of as many threads as there are
+    workers rather than on the loop's default executor. Memory caps only apply to
+    the process backend; timeouts apply to all three, though inline and
+    threaded parsers can only be interrupted between yielded texts.
+    """
+
+    def __init__(self, config: IngestionConfig):
+        self.config = config
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._manager: Optional[SyncManager] = None
+        self._result_readers: Optional[ThreadPoolExecutor] = None
+
+    async def parse(
+        self,
+        parser: AsyncParser,
+        document_type: str,
+        data: bytes,
+        **kwargs,
+    ) -> AsyncGenerator[str, None]:
+        settings = self.config.get_parser_execution(document_type)
+        if not isinstance(data, (bytes, str)) and (
+            settings.mode == ParserExecutionMode.PROCESS
+            or not getattr(parser, "accepts_buffer", False)
+        ):
+            # Buffers such as memory-mapped files cannot leave the process
+            data = bytes(data)
+        if settings.mode == ParserExecutionMode.PROCESS:
+            stream = self._parse_in_process(parser, data, kwargs, settings)
+        elif settings.mode == ParserExecutionMode.THREAD:
+            stream = self._parse_in_thread(parser, data, kwargs)
+        else:
+            stream = self._parse_inline(parser, data, kwargs)
+
+        if not settings.timeout:
+            async for text in stream:
+                yield text
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.timeout
+        try:
+            while True:
+                try:
+                    text = await asyncio.wait_for(
+                        stream.__anext__(), max(deadline - loop.time(), 0)
+                    )
+                except StopAsyncIteration:
+                    return
+                yield text
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Parsing {document_type} exceeded {settings.timeout} seconds"
+            ) from None
+        finally:
+            await stream.aclose()
+
+    async def _parse_inline(
+        self, parser: AsyncParser, data: bytes, kwargs: dict
+    ) -> AsyncGenerator[str, None]:
+        async for text in parser.ingest(data, **kwargs):
+            if text is not None:
+                yield text
+
+    async def _parse_in_thread(
+        self, parser: AsyncParser, data: bytes, kwargs: dict
+    ) -> AsyncGenerator[str, None]:
+        loop = asyncio.get_running_loop()
+        results: asyncio.Queue = asyncio.Queue()
+        stopped = threading.Event()
+        end = object()
+
+        def emit(text: str) -> None:
+            if stopped.is_set():
+                raise _StreamClosed()
+            loop.call_soon_threadsafe(results.put_nowait, text)
+
+        def run() -> None:
+            try:
+                asyncio.run(_drain_parser(parser, data, kwargs, emit))
+            except _StreamClosed:
+                pass
+            finally:
+                loop.call_soon_threadsafe(results.put_nowait, end)
+
+        worker = asyncio.ensure_future(asyncio.to_thread(run))
+        worker.add_done_callback(_retrieve_result)
+        try:
+            while (text := await results.get()) is not end:
+                yield text
+            await worker
+        finally:
+            # Abandoned streams stop the parser at its next yield
+            stopped.set()
+
+    async def _parse_in_process(
+        self,
+        parser: AsyncParser,
+        data: bytes,
+        kwargs: dict,
+        settings: ParserExecutionSettings,
+    ) -> AsyncGenerator[str, None]:
+        pool, manager, readers = self._get_pool()
+        loop = asyncio.get_running_loop()
+        results = manager.Queue()
+        future = asyncio.wrap_future(
+            pool.submit(
+                _parse_in_worker,
+                type(parser),
+                self.config,
+                data,
+                kwargs,
+                results,
+                settings.timeout,
+                settings.memory_limit_mb,
+            )
+        )
+        future.add_done_callback(_retrieve_result)
+
+        try:
+            while True:
+                try:
+                    text = await loop.run_in_executor(
+                        readers, partial(results.get, timeout=_POLL_INTERVAL)
+                    )
+                except queue.Empty:
+                    if future.done():
+                        # The worker died before it could finish the stream
+                        await future
+                        raise RuntimeError(
+                            "Parser worker exited early"
+                        ) from None
+                    continue
+                if text is None:
+                    break
+                yield text
+            await future
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise
+
+    def _get_pool(
+        self,
+    ) -> tuple[ProcessPoolExecutor, SyncManager, ThreadPoolExecutor]:
+        with self._lock:
+            context = multiprocessing.get_context("spawn")
+            workers = self.config.parser_process_workers or os.cpu_count()
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=context
+                )
+            if self._manager is None:
+                self._manager = context.Manager()
+            if self._result_readers is None:
+                self._result_readers = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="parser-results"
+                )
+            return self._pool, self._manager, self._result_readers
+
+    def _reset_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                logger.warning("Parser process pool broke; restarting it")
+                self._pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+            if self._result_readers is not None:
+                self._result_readers.shutdown(wait=False)
+                self._result_readers = None
@@ -106,6 +106,7 @@ class UnstructuredIngestionProvider(IngestionProvider):
             "unstructured": parsers.PDFParserUnstructured,  # type: ignore
             "zerox": parsers.VLMPDFParser,  # type: ignore
         },
+        DocumentType.TSV: {"advanced": parsers.TSVParserAdvanced},  # type: ignore
         DocumentType.XLSX: {"advanced": parsers.XLSXParserAdvanced},  # type: ignore
     }
 
@@ -239,6 +240,8 @@ class UnstructuredIngestionProvider(IngestionProvider):
         document: Document,
         ingestion_config_override: dict,
     ) -> AsyncGenerator[DocumentChunk, None]:
+        if not isinstance(file_content, (bytes, str)):
+            file_content = bytes(file_content)
         ingestion_config = copy(
             {
                 **self.config.to_ingestion_request(),
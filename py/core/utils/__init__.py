@@ -17,6 +17,13 @@ from shared.utils.splitter.text import (
     TextSplitter,
 )
 
+from .tokenizer import (
+    count_tokens_batch,
+    count_tokens_for_text,
+    get_tokenizer,
+    register_tokenizer,
+)
+
 __all__ = [
     "format_search_results_for_stream",
     "format_search_results_for_llm",
@@ -33,4 +40,9 @@ __all__ = [
     # Text splitter
     "RecursiveCharacterTextSplitter",
     "TextSplitter",
+    # Tokenizers
+    "get_tokenizer",
+    "register_tokenizer",
+    "count_tokens_for_text",
+    "count_tokens_batch",
 ]
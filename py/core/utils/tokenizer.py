@@ -0,0 +1,67 @@
+"""
+Process-wide registry of tiktoken encodings.
+
+Resolving an encoding means a model-name lookup and, the first time, loading
+its BPE ranks; the registry does that once per name and hands every caller
+the same `Encoding`, which is safe to share between threads.
+"""
+
+import logging
+import threading
+from typing import Iterable
+
+import tiktoken
+
+logger = logging.getLogger()
+
+DEFAULT_ENCODING = "cl100k_base"
+
+_tokenizers: dict[str, tiktoken.Encoding] = {}
+_lock = threading.Lock()
+
+
+def _resolve(name: str) -> tiktoken.Encoding:
+    # Accept provider-prefixed model names such as `openai/gpt-4o`
+    for candidate in (name, name.rsplit("/", 1)[-1]):
+        try:
+            return tiktoken.encoding_for_model(candidate)
+        except KeyError:
+            pass
+        try:
+            return tiktoken.get_encoding(candidate)
+        except ValueError:
+            pass
+    logger.warning(
+        f"No tiktoken encoding for {name}, using {DEFAULT_ENCODING}"
+    )
+    return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
+def get_tokenizer(name: str = DEFAULT_ENCODING) -> tiktoken.Encoding:
+    """Returns the encoding for a model or encoding name."""
+    if (tokenizer := _tokenizers.get(name)) is not None:
+        return tokenizer
+    with _lock:
+        if name not in _tokenizers:
+            _tokenizers[name] = _resolve(name)
+        return _tokenizers[name]
+
+
+def register_tokenizer(name: str, tokenizer: tiktoken.Encoding) -> None:
+    """Makes `tokenizer` the encoding returned for `name`."""
+    with _lock:
+        _tokenizers[name] = tokenizer
+
+
+def count_tokens_for_text(text: str, model: str = "gpt-4o") -> int:
+    return len(get_tokenizer(model).encode_ordinary(text))
+
+
+def count_tokens_batch(
+    texts: Iterable[str], model: str = "gpt-4o"
+) -> list[int]:
+    """Counts the tokens of many texts with one call into the encoder."""
+    return [
+        len(tokens)
+        for tokens in get_tokenizer(model).encode_ordinary_batch(list(texts))
+    ]
@@ -197,11 +197,6 @@ class DocumentResponse(R2RSerializable):
         """Prepare the document info for database entry, extracting certain fields from metadata."""
         now = datetime.now()
 
-        # Format the embedding properly for Postgres vector type
-        embedding = None
-        if self.summary_embedding is not None:
-            embedding = f"[{','.join(str(x) for x in self.summary_embedding)}]"
-
         return {
             "id": self.id,
             "collection_ids": self.collection_ids,
@@ -217,7 +212,7 @@ class DocumentResponse(R2RSerializable):
             "updated_at": self.updated_at or now,
             "ingestion_attempt_number": self.ingestion_attempt_number or 0,
             "summary": self.summary,
-            "summary_embedding": embedding,
+            "summary_embedding": self.summary_embedding,
             "total_tokens": self.total_tokens or 0,  # ensure we pass 0 if None
         }
 
@@ -307,6 +302,14 @@ class ChunkEnrichmentSettings(R2RSerializable):
         default="chunk_enrichment",
         description="The prompt to use for chunk enrichment",
     )
+    concurrent_requests: int = Field(
+        default=16,
+        description="The maximum number of chunks being rewritten by the LLM at once",
+    )
+    checkpoint_batch_size: int = Field(
+        default=64,
+        description="The number of rewritten chunks embedded and stored together. A restarted enrichment skips the chunks already stored.",
+    )
 
 
 class IngestionConfig(R2RSerializable):
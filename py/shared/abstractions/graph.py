@@ -161,6 +161,11 @@ class GraphCreationSettings(R2RSerializable):
         alias="graph_entity_description_prompt",  # TODO - mark deprecated & remove
     )
 
+    graph_entity_descriptions_prompt: str = Field(
+        default="graph_entity_descriptions",
+        description="The prompt to use for describing several entities in one request.",
+    )
+
     entity_types: list[str] = Field(
         default=[],
         description="The types of entities to extract.",
@@ -196,6 +201,16 @@ class GraphCreationSettings(R2RSerializable):
         description="Whether to automatically deduplicate entities.",
     )
 
+    description_batch_size: int = Field(
+        default=8,
+        description="The number of entities described by each LLM request.",
+    )
+
+    description_concurrent_requests: int = Field(
+        default=4,
+        description="The maximum number of entity description requests in flight at once, across all documents.",
+    )
+
 
 class GraphEnrichmentSettings(R2RSerializable):
     """Settings for knowledge graph enrichment."""
@@ -226,6 +241,11 @@ class GraphEnrichmentSettings(R2RSerializable):
         description="Parameters for the Leiden algorithm.",
     )
 
+    incremental_communities: bool = Field(
+        default=False,
+        description="Once communities have been built, only re-cluster and re-summarize the communities that new or removed entities and relationships touch.",
+    )
+
 
 class GraphCommunitySettings(R2RSerializable):
     """Settings for knowledge graph community enrichment."""
@@ -270,6 +270,7 @@ class AggregateSearchResult(R2RSerializable):
     graph_search_results: Optional[list[GraphSearchResult]] = None
     web_search_results: Optional[list[WebSearchResult]] = None
     context_document_results: Optional[list[ContextDocumentResult]] = None
+    metadata: Optional[dict[str, Any]] = None
 
     def __str__(self) -> str:
         return f"AggregateSearchResult(chunk_search_results={self.chunk_search_results}, graph_search_results={self.graph_search_results}, web_search_results={self.web_search_results}, context_document_results={str(self.context_document_results)})"
@@ -299,6 +300,7 @@ class AggregateSearchResult(R2RSerializable):
                 if self.context_document_results
                 else []
             ),
+            "metadata": self.metadata or {},
         }
 
     class Config:
@@ -379,6 +381,13 @@ class HybridSearchSettings(R2RSerializable):
     rrf_k: int = Field(
         default=50, description="K-value for RRF (Rank Reciprocal Fusion)"
     )
+    server_side_rrf: bool = Field(
+        default=False,
+        description=(
+            "Whether to fuse the semantic and full text rankings in a single "
+            "database query instead of in the application"
+        ),
+    )
 
 
 class ChunkSearchSettings(R2RSerializable):
@@ -422,6 +431,13 @@ class GraphSearchSettings(R2RSerializable):
         default=True,
         description="Whether to enable graph search",
     )
+    union_query: bool = Field(
+        default=False,
+        description=(
+            "Whether to search entities, relationships and communities with "
+            "a single UNION ALL query instead of three concurrent queries"
+        ),
+    )
 
 
 class SearchSettings(R2RSerializable):
@@ -513,6 +529,7 @@ class SearchSettings(R2RSerializable):
                     "semantic_weight": 5.0,
                     "full_text_limit": 200,
                     "rrf_k": 50,
+                    "server_side_rrf": False,
                 },
                 "chunk_settings": {
                     "enabled": True,
@@ -526,6 +543,7 @@ class SearchSettings(R2RSerializable):
                     "generation_config": GenerationConfig.Config.json_schema_extra,
                     "max_community_description_length": 65536,
                     "max_llm_queries_for_global_search": 250,
+                    "union_query": False,
                     "limits": {
                         "entity": 20,
                         "relationship": 20,
@@ -18,6 +18,11 @@ from .base_utils import (
     reassign_citations_in_order,
     validate_uuid,
 )
+from .splitter.spans import (
+    RecursiveSpanTextSplitter,
+    RecursiveTokenTextSplitter,
+    TextSpan,
+)
 from .splitter.text import RecursiveCharacterTextSplitter, TextSplitter
 
 __all__ = [
@@ -41,6 +46,9 @@ __all__ = [
     "deep_update",
     # Text splitter
     "RecursiveCharacterTextSplitter",
+    "RecursiveSpanTextSplitter",
+    "RecursiveTokenTextSplitter",
+    "TextSpan",
     "TextSplitter",
     # Vector utils
     "_decorate_vector_type",
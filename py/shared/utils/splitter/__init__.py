@@ -1,3 +1,13 @@
+from .spans import (
+    RecursiveSpanTextSplitter,
+    RecursiveTokenTextSplitter,
+    TextSpan,
+)
 from .text import RecursiveCharacterTextSplitter
 
-__all__ = ["RecursiveCharacterTextSplitter"]
+__all__ = [
+    "RecursiveCharacterTextSplitter",
+    "RecursiveSpanTextSplitter",
+    "RecursiveTokenTextSplitter",
+    "TextSpan",
+]
@@ -0,0 +1,240 @@
+"""
+A recursive character splitter that works on offsets into the source text.
+
+It produces exactly the chunks `RecursiveCharacterTextSplitter` does with
+literal separators kept on the following piece (that splitter's defaults),
+but never copies pieces out of the text: separators are located with
+`str.find` over the span being split, and the merge window is a deque of
+spans carrying their measured lengths, so each piece is measured once and
+dropped from the window in constant time.
+"""
+
+import copy
+import logging
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Callable, NamedTuple, Optional, Protocol
+
+from .text import SplitterDocument, TextSplitter
+
+logger = logging.getLogger()
+
+
+class TextSpan(NamedTuple):
+    start: int
+    end: int
+
+
+class Tokenizer(Protocol):
+    """The part of a tiktoken `Encoding` the token splitter relies on."""
+
+    def encode_ordinary(self, text: str) -> list[int]: ...
+
+    def decode_with_offsets(
+        self, tokens: list[int]
+    ) -> tuple[str, list[int]]: ...
+
+
+# Measures the span text[start:end] of the text being split
+Measure = Callable[[int, int], int]
+
+
+class RecursiveSpanTextSplitter(TextSplitter):
+    """
+    Splits text recursively by literal separators and reports where in the
+    text each chunk came from. `split_text(text)[i]` is always
+    `text[start:end]` for the i-th span of `split_spans(text)`.
+    """
+
+    def __init__(
+        self,
+        separators: Optional[list[str]] = None,
+        chunk_size: int = 4000,
+        chunk_overlap: int = 200,
+        length_function: Callable[[str], int] = len,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=length_function,
+            keep_separator=True,
+            **kwargs,
+        )
+        self._separators = separators or ["\n\n", "\n", " ", ""]
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def split_text(self, text: str) -> list[str]:
+        return [text[start:end] for start, end in self.split_spans(text)]
+
+    def split_spans(self, text: str) -> list[TextSpan]:
+        spans: list[TextSpan] = []
+        self._split_span(
+            text,
+            0,
+            len(text),
+            self._separators,
+            self._measure_for(text),
+            spans,
+        )
+        return spans
+
+    def create_documents(
+        self, texts: list[str], metadatas: Optional[list[dict]] = None
+    ) -> list[SplitterDocument]:
+        """
+        Create documents from a list of texts, recording the exact chunk
+        offsets when `add_start_index` is set.
+        """
+        _metadatas = metadatas or [{}] * len(texts)
+        documents = []
+        for i, text in enumerate(texts):
+            for start, end in self.split_spans(text):
+                metadata = copy.deepcopy(_metadatas[i])
+                if self._add_start_index:
+                    metadata["start_index"] = start
+                    metadata["end_index"] = end
+                documents.append(
+                    SplitterDocument(
+                        page_content=text[start:end], metadata=metadata
+                    )
+                )
+        return documents
+
+    def _measure_for(self, text: str) -> Measure:
+        if self._length_function is len:
+            return lambda start, end: end - start
+        return lambda start, end: self._length_function(text[start:end])
+
+    def _split_span(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        separators: list[str],
+        measure: Measure,
+        spans: list[TextSpan],
+    ) -> None:
+        # Get appropriate separator to use
+        separator = separators[-1]
+        new_separators: list[str] = []
+        for i, _s in enumerate(separators):
+            if _s == "":
+                separator = _s
+                break
+            if text.find(_s, start, end) != -1:
+                separator = _s
+                new_separators = separators[i + 1 :]
+                break
+
+        # Now go merging things, recursively splitting longer pieces.
+        good_pieces: list[tuple[int, int, int]] = []
+        for piece_start, piece_end in self._split_on(
+            text, start, end, separator
+        ):
+            length = measure(piece_start, piece_end)
+            if length < self._chunk_size:
+                good_pieces.append((piece_start, piece_end, length))
+                continue
+            if good_pieces:
+                self._merge_pieces(text, good_pieces, spans)
+                good_pieces = []
+            if not new_separators:
+                spans.append(TextSpan(piece_start, piece_end))
+            else:
+                self._split_span(
+                    text,
+                    piece_start,
+                    piece_end,
+                    new_separators,
+                    measure,
+                    spans,
+                )
+        if good_pieces:
+            self._merge_pieces(text, good_pieces, spans)
+
+    @staticmethod
+    def _split_on(text: str, start: int, end: int, separator: str):
+        """
+        Yields the pieces of `text[start:end]` between occurrences of
+        `separator`, each occurrence starting the piece that follows it.
+        """
+        if not separator:
+            for position in range(start, end):
+                yield position, position + 1
+            return
+
+        piece_start = start
+        position = text.find(separator, start, end)
+        while position != -1:
+            if position > piece_start:
+                yield piece_start, position
+            piece_start = position
+            position = text.find(separator, position + len(separator), end)
+        if end > piece_start:
+            yield piece_start, end
+
+    def _merge_pieces(
+        self,
+        text: str,
+        pieces: list[tuple[int, int, int]],
+        spans: list[TextSpan],
+    ) -> None:
+        window: deque[tuple[int, int, int]] = deque()
+        total = 0
+        for piece in pieces:
+            length = piece[2]
+            if total + length > self._chunk_size:
+                if total > self._chunk_size:
+                    logger.warning(
+                        f"Created a chunk of size {total}, "
+                        f"which is longer than the specified {self._chunk_size}"
+                    )
+                if window:
+                    self._emit(text, window[0][0], window[-1][1], spans)
+                    # Keep on popping if:
+                    # - we have a larger chunk than in the chunk overlap
+                    # - or if we still have any chunks and the length is long
+                    while total > self._chunk_overlap or (
+                        total + length > self._chunk_size and total > 0
+                    ):
+                        total -= window.popleft()[2]
+            window.append(piece)
+            total += length
+        if window:
+            self._emit(text, window[0][0], window[-1][1], spans)
+
+    def _emit(
+        self, text: str, start: int, end: int, spans: list[TextSpan]
+    ) -> None:
+        if self._strip_whitespace:
+            chunk = text[start:end]
+            stripped = chunk.lstrip()
+            start += len(chunk) - len(stripped)
+            end = start + len(stripped.rstrip())
+        if end > start:
+            spans.append(TextSpan(start, end))
+
+
+class RecursiveTokenTextSplitter(RecursiveSpanTextSplitter):
+    """
+    Same splitting, with `chunk_size` and `chunk_overlap` counted in tokens.
+
+    The text is encoded once; a span's length is the number of tokens that
+    start inside it, found by bisecting the token offsets. That can differ
+    from encoding the span on its own by a token at either edge, which is
+    well inside the slack of embedding context limits.
+    """
+
+    def __init__(self, tokenizer: Tokenizer, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._tokenizer = tokenizer
+
+    def _measure_for(self, text: str) -> Measure:
+        _, offsets = self._tokenizer.decode_with_offsets(
+            self._tokenizer.encode_ordinary(text)
+        )
+        return lambda start, end: (
+            bisect_left(offsets, end) - bisect_left(offsets, start)
+        )
@@ -0,0 +1,104 @@
+"""
+Times the PDF text sanitizer against the per-character filter it replaced.
+
+    python tests/scaling/sanitizerBenchmark.py [file.pdf] [--repeat N]
+
+The pages of the given PDF are extracted once with pypdf and cleaned with
+both implementations, which must agree. Without a PDF, pages of mixed
+Latin, Cyrillic, Greek, Arabic, CJK, Devanagari and Thai text are generated.
+"""
+
+import argparse
+import random
+import statistics
+import string
+import time
+import unicodedata
+
+from core.parsers.sanitize import sanitize_text
+
+SAMPLES = [
+    "The quick brown fox jumps over the lazy dog.",
+    "“Curly quotes”, en–dashes, bullets • and non-breaking spaces",
+    "Съешь же ещё этих мягких французских булок, да выпей чаю.",
+    "Ξεσκεπάζω την ψυχοφθόρα βδελυγμία.",
+    "نص حكيم له سر قاطع وذو شأن عظيم مكتوب على ثوب أخضر",
+    "天地玄黄，宇宙洪荒。日月盈昃，辰宿列张。",
+    "いろはにほへと ちりぬるを カタカナ",
+    "ऋषियों को सताने वाले दुष्ट राक्षसों के राजा रावण का सर्वनाश करने वाले",
+    "เป็นมนุษย์สุดประเสริฐเลิศคุณค่า",
+    "Ünïcödé ligatures ﬁ ﬂ, math 𝑥² ≤ ∞, emoji 📄 and \x07 control bytes",
+]
+
+
+def legacy_filter(page_text: str) -> str:
+    return "".join(
+        filter(
+            lambda x: (
+                unicodedata.category(x)
+                in ["Ll", "Lu", "Lt", "Lm", "Lo", "Nl", "No"]
+                or "\u4e00" <= x <= "\u9fff"
+                or "\u0600" <= x <= "\u06ff"
+                or "\u0400" <= x <= "\u04ff"
+                or "\u0370" <= x <= "\u03ff"
+                or "\u0e00" <= x <= "\u0e7f"
+                or "\u3040" <= x <= "\u309f"
+                or "\u30a0" <= x <= "\u30ff"
+                or x in string.printable
+            ),
+            page_text,
+        )
+    )
+
+
+def generated_pages(count: int = 200, lines: int = 60) -> list[str]:
+    rng = random.Random(0)
+    return [
+        "\n".join(rng.choice(SAMPLES) for _ in range(lines))
+        for _ in range(count)
+    ]
+
+
+def pdf_pages(path: str) -> list[str]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def timed(clean, pages: list[str], repeat: int) -> tuple[float, list[str]]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cleaned = [clean(page) for page in pages]
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), cleaned
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("pdf", nargs="?")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    pages = pdf_pages(args.pdf) if args.pdf else generated_pages()
+    print(
+        f"{len(pages)} pages, {sum(map(len, pages))} characters "
+        f"(extracted in {time.perf_counter() - start:.2f}s)"
+    )
+
+    start = time.perf_counter()
+    sanitize_text("")
+    print(f"Filter tables built in {time.perf_counter() - start:.2f}s")
+
+    legacy, expected = timed(legacy_filter, pages, args.repeat)
+    current, cleaned = timed(sanitize_text, pages, args.repeat)
+    assert cleaned == expected, "sanitize_text differs from the old filter"
+
+    print(f"Per-character filter: {legacy:.3f}s")
+    print(f"sanitize_text:        {current:.3f}s ({legacy / current:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
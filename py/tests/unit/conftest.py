@@ -1,5 +1,7 @@
 # tests/conftest.py
+import asyncio
 import os
+from types import SimpleNamespace
 
 import pytest
 
@@ -25,6 +27,69 @@ TEST_DB_CONNECTION_STRING = os.environ.get(
 )
 
 
+class FakeLLM:
+    """
+    Answers each completion with `respond(messages)`, recording the
+    requests and the most that were in flight at once.
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests: list[list[dict]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def aget_completion(self, messages, generation_config):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            self.requests.append(messages)
+            content = self.respond(messages)
+        finally:
+            self.in_flight -= 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+        )
+
+
+@pytest.fixture
+def make_llm():
+    return FakeLLM
+
+
+@pytest.fixture
+def make_service():
+    """
+    Builds a service over fakes, without a database. `config` maps config
+    sections to their settings, `database` names the database handlers and
+    `providers` the other providers; further arguments go to the service.
+    """
+
+    def make(
+        service_class,
+        config=None,
+        database=None,
+        providers=None,
+        **kwargs,
+    ):
+        return service_class(
+            config=SimpleNamespace(
+                **{
+                    section: SimpleNamespace(**settings)
+                    for section, settings in (config or {}).items()
+                }
+            ),
+            providers=SimpleNamespace(
+                database=SimpleNamespace(**(database or {})),
+                **(providers or {}),
+            ),
+            **kwargs,
+        )
+
+    return make
+
+
 @pytest.fixture
 async def db_provider():
     crypto_provider = NaClCryptoProvider(NaClCryptoConfig(app={}))
@@ -0,0 +1,200 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from core.base import EmbeddingPurpose
+from core.main.services.ingestion_service import IngestionService
+from core.providers.database.embedding_cache import (
+    PostgresChunkEmbeddingsHandler,
+)
+
+
+class InMemoryChunkEmbeddings:
+    def __init__(self):
+        self.rows: dict[str, list[float]] = {}
+
+    async def get_embeddings(self, content_hashes):
+        return {h: self.rows[h] for h in content_hashes if h in self.rows}
+
+    async def upsert_embeddings(self, embeddings):
+        for content_hash, vector in embeddings.items():
+            self.rows.setdefault(content_hash, vector)
+
+
+class CountingEmbeddingProvider:
+    def __init__(self, base_model="test-model", prefixes=None):
+        self.config = SimpleNamespace(
+            base_model=base_model,
+            base_dimension=2,
+            concurrent_request_limit=2,
+        )
+        self.prefixes = prefixes or {}
+        self.calls: list[list[str]] = []
+
+    async def async_get_embeddings(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+DEDUPLICATE = {"ingestion": {"deduplicate_chunk_embeddings": True}}
+
+
+@pytest.mark.asyncio
+async def test_identical_chunks_are_embedded_once(make_service):
+    store = InMemoryChunkEmbeddings()
+    provider = CountingEmbeddingProvider()
+    service = make_service(
+        IngestionService,
+        config=DEDUPLICATE,
+        database={"chunk_embeddings_handler": store},
+        providers={"embedding": provider},
+        chunk_quota=None,
+    )
+
+    vectors, reused = await service._get_chunk_embeddings(
+        ["alpha beta", "alpha  beta\n", "gamma"]
+    )
+    assert provider.calls == [["alpha beta", "gamma"]]
+    assert vectors[0] == vectors[1]
+    assert reused == [False, True, False]
+
+    vectors, reused = await service._get_chunk_embeddings(["gamma", "delta"])
+    assert provider.calls[-1] == ["delta"]
+    assert reused == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_store_is_keyed_by_embedding_model(make_service):
+    store = InMemoryChunkEmbeddings()
+    first = make_service(
+        IngestionService,
+        config=DEDUPLICATE,
+        database={"chunk_embeddings_handler": store},
+        providers={"embedding": CountingEmbeddingProvider("model-a")},
+        chunk_quota=None,
+    )
+    await first._get_chunk_embeddings(["alpha"])
+
+    provider = CountingEmbeddingProvider("model-b")
+    second = make_service(
+        IngestionService,
+        config=DEDUPLICATE,
+        database={"chunk_embeddings_handler": store},
+        providers={"embedding": provider},
+        chunk_quota=None,
+    )
+    _, reused = await second._get_chunk_embeddings(["alpha"])
+    assert provider.calls == [["alpha"]]
+    assert reused == [False]
+
+
+@pytest.mark.asyncio
+async def test_deduplication_can_be_disabled(make_service):
+    store = InMemoryChunkEmbeddings()
+    provider = CountingEmbeddingProvider()
+    service = make_service(
+        IngestionService,
+        config={"ingestion": {"deduplicate_chunk_embeddings": False}},
+        database={"chunk_embeddings_handler": store},
+        providers={"embedding": provider},
+        chunk_quota=None,
+    )
+
+    await service._get_chunk_embeddings(["alpha", "alpha"])
+    assert provider.calls == [["alpha", "alpha"]]
+    assert store.rows == {}
+
+
+@pytest.mark.asyncio
+async def test_store_is_keyed_by_embedding_prefix(make_service):
+    store = InMemoryChunkEmbeddings()
+    first = make_service(
+        IngestionService,
+        config=DEDUPLICATE,
+        database={"chunk_embeddings_handler": store},
+        providers={"embedding": CountingEmbeddingProvider()},
+        chunk_quota=None,
+    )
+    await first._get_chunk_embeddings(["alpha"])
+
+    provider = CountingEmbeddingProvider(
+        prefixes={EmbeddingPurpose.INDEX: "passage: "}
+    )
+    second = make_service(
+        IngestionService,
+        config=DEDUPLICATE,
+        database={"chunk_embeddings_handler": store},
+        providers={"embedding": provider},
+        chunk_quota=None,
+    )
+    _, reused = await second._get_chunk_embeddings(["alpha"])
+    assert provider.calls == [["alpha"]]
+    assert reused == [False]
+
+
+@pytest.mark.asyncio
+async def test_embed_document_reports_reuse_per_document(make_service):
+    service = make_service(
+        IngestionService,
+        config=DEDUPLICATE,
+        database={"chunk_embeddings_handler": InMemoryChunkEmbeddings()},
+        providers={"embedding": CountingEmbeddingProvider()},
+        chunk_quota=None,
+    )
+    document_id = uuid.uuid4()
+    chunks = [
+        {
+            "id": uuid.uuid4(),
+            "document_id": document_id,
+            "collection_ids": [],
+            "owner_id": uuid.uuid4(),
+            "data": text,
+            "metadata": {},
+        }
+        for text in ["alpha", "beta", "alpha", "alpha"]
+    ]
+    embedding_reuse: dict = {}
+
+    entries = [
+        entry
+        async for entry in service.embed_document(
+            chunks, embedding_batch_size=4, embedding_reuse=embedding_reuse
+        )
+    ]
+
+    assert len(entries) == 4
+    assert embedding_reuse == {
+        document_id: {"embedded": 4, "reused": 2, "ratio": 0.5}
+    }
+
+
+class RecordingConnectionManager:
+    def __init__(self):
+        self.queries: list[str] = []
+
+    async def execute_query(self, query, params=None):
+        self.queries.append("INSERT")
+
+    async def fetch_query(self, query, params=None):
+        self.queries.append("DELETE")
+        return []
+
+
+@pytest.mark.asyncio
+async def test_unused_embeddings_are_collected_every_gc_every_rows():
+    connections = RecordingConnectionManager()
+    handler = PostgresChunkEmbeddingsHandler(
+        "test", connections, ttl_seconds=60, gc_every=3
+    )
+
+    for i in range(4):
+        await handler.upsert_embeddings({f"h{i}": [0.1]})
+
+    assert connections.queries == [
+        "INSERT",
+        "INSERT",
+        "INSERT",
+        "DELETE",
+        "INSERT",
+    ]
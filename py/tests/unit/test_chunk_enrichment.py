@@ -0,0 +1,169 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from core.base import ChunkEnrichmentSettings
+from core.main.services.ingestion_service import IngestionService
+
+
+def rewrite_chunk(fail_on=()):
+    """Rewrites the chunk between the neighbours of a prompt."""
+
+    def respond(messages):
+        chunk = messages[1]["content"].split("|")[1]
+        if chunk in fail_on:
+            raise RuntimeError("completion failed")
+        return f"{chunk}!"
+
+    return respond
+
+
+def prompts(llm):
+    return sorted(messages[1]["content"] for messages in llm.requests)
+
+
+class FakePrompts:
+    def __init__(self):
+        self.fetched: list[str] = []
+
+    async def get_cached_prompt(self, prompt_name, inputs=None, **kwargs):
+        self.fetched.append(prompt_name)
+        if prompt_name == "system":
+            return "system"
+        return "{preceding_chunks}|{chunk}|{succeeding_chunks}"
+
+    async def get_message_payload(
+        self, system_prompt_override, task_prompt_override, task_inputs
+    ):
+        return [
+            {"role": "system", "content": system_prompt_override},
+            {
+                "role": "user",
+                "content": task_prompt_override.format(**task_inputs),
+            },
+        ]
+
+
+class FakeEmbeddings:
+    def __init__(self, batch_size):
+        self.config = SimpleNamespace(batch_size=batch_size)
+        self.calls: list[list[str]] = []
+
+    async def async_get_embeddings(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+class FakeChunks:
+    def __init__(self, texts, enriched=0):
+        self.rows = {}
+        for order, text in enumerate(texts):
+            metadata = {"chunk_order": order}
+            if order < enriched:
+                metadata.update(
+                    original_text=text, chunk_enrichment_status="success"
+                )
+                text = f"{text}!"
+            chunk_id = uuid4()
+            self.rows[chunk_id] = {
+                "id": chunk_id,
+                "owner_id": uuid4(),
+                "collection_ids": [],
+                "text": text,
+                "metadata": metadata,
+            }
+        self.upserts: list[list] = []
+
+    async def list_document_chunks(self, document_id, offset, limit):
+        return {
+            "results": [
+                {**row, "metadata": dict(row["metadata"])}
+                for row in self.rows.values()
+            ]
+        }
+
+    async def upsert_entries(self, entries):
+        self.upserts.append(entries)
+        for entry in entries:
+            assert entry.id in self.rows
+            self.rows[entry.id].update(
+                text=entry.text, metadata=entry.metadata
+            )
+
+
+CONFIG = {
+    "ingestion": {"deduplicate_chunk_embeddings": False, "chunk_size": 1024},
+    "app": {"fast_llm": "fast"},
+}
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_enriched_in_place_in_bounded_batches(
+    make_service, make_llm
+):
+    texts = [f"c{i}" for i in range(10)]
+    chunks, llm = FakeChunks(texts), make_llm(rewrite_chunk())
+    embeddings = FakeEmbeddings(3)
+    service = make_service(
+        IngestionService,
+        config=CONFIG,
+        database={"chunks_handler": chunks, "prompts_handler": FakePrompts()},
+        providers={"llm": llm, "embedding": embeddings},
+        chunk_quota=None,
+    )
+    settings = ChunkEnrichmentSettings(
+        n_chunks=1, concurrent_requests=3, checkpoint_batch_size=4
+    )
+
+    count = await service.chunk_enrichment(uuid4(), None, settings)
+
+    assert count == 10
+    assert llm.max_in_flight == 3
+    assert all(len(call) <= 3 for call in embeddings.calls)
+    assert [len(batch) for batch in chunks.upserts] == [4, 4, 2]
+    rows = sorted(
+        chunks.rows.values(), key=lambda r: r["metadata"]["chunk_order"]
+    )
+    assert [row["text"] for row in rows] == [f"{t}!" for t in texts]
+    assert all(
+        row["metadata"]["chunk_enrichment_status"] == "success" for row in rows
+    )
+
+
+@pytest.mark.asyncio
+async def test_enrichment_resumes_after_stored_chunks(make_service, make_llm):
+    texts = ["a", "b", "c", "d"]
+    chunks = FakeChunks(texts, enriched=2)
+    llm = make_llm(rewrite_chunk(fail_on={"d"}))
+    service = make_service(
+        IngestionService,
+        config=CONFIG,
+        database={"chunks_handler": chunks, "prompts_handler": FakePrompts()},
+        providers={"llm": llm, "embedding": FakeEmbeddings(8)},
+        chunk_quota=None,
+    )
+
+    count = await service.chunk_enrichment(
+        uuid4(), None, ChunkEnrichmentSettings(n_chunks=1)
+    )
+
+    assert count == 2
+    # Neighbours are given as they were parsed, not as rewritten
+    assert prompts(llm) == ["b|c|d", "c|d|None"]
+    rows = sorted(
+        chunks.rows.values(), key=lambda r: r["metadata"]["chunk_order"]
+    )
+    assert [row["text"] for row in rows] == ["a!", "b!", "c!", "d"]
+    assert rows[3]["metadata"] == {
+        "chunk_order": 3,
+        "original_text": "d",
+        "chunk_enrichment_status": "failed",
+    }
+
+    assert (
+        await service.chunk_enrichment(
+            uuid4(), None, ChunkEnrichmentSettings()
+        )
+        == 0
+    )
@@ -0,0 +1,125 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from core.base import R2RException, Vector, VectorEntry
+from core.main.services.chunk_quota_service import ChunkQuotaService
+from core.main.services.ingestion_service import IngestionService
+
+
+class FakeUsersHandler:
+    def __init__(self, overrides):
+        self.overrides = overrides
+        self.lookups = 0
+
+    async def get_user_by_id(self, user_id):
+        self.lookups += 1
+        return SimpleNamespace(limits_overrides=self.overrides.get(user_id))
+
+
+class FakeChunkQuotasHandler:
+    def __init__(self, counts):
+        self.counts = counts
+        self.max_chunks = {}
+
+    async def set_max_chunks(self, owner_id, max_chunks):
+        self.max_chunks[owner_id] = max_chunks
+        return self.counts.get(owner_id, 0)
+
+    async def get_chunk_count(self, owner_id):
+        return self.counts.get(owner_id, 0)
+
+
+LIMITS = {"app": {"default_max_chunks_per_user": 5}}
+
+
+def make_entry(owner_id):
+    return VectorEntry(
+        id=uuid.uuid4(),
+        document_id=uuid.uuid4(),
+        owner_id=owner_id,
+        collection_ids=[],
+        vector=Vector(data=[0.1, 0.2]),
+        text="chunk",
+        metadata={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_limits_are_resolved_once_per_owner(make_service):
+    owner_id = uuid.uuid4()
+    users = FakeUsersHandler({})
+    quotas = FakeChunkQuotasHandler({owner_id: 2})
+    service = make_service(
+        ChunkQuotaService,
+        config=LIMITS,
+        database={"users_handler": users, "chunk_quotas_handler": quotas},
+    )
+    quota = service.start_ingestion()
+
+    admitted = [await quota.try_reserve(owner_id) for _ in range(5)]
+
+    assert admitted == [True, True, True, False, False]
+    assert users.lookups == 1
+    assert quotas.max_chunks == {owner_id: 5}
+
+
+@pytest.mark.asyncio
+async def test_user_override_and_release(make_service):
+    owner_id = uuid.uuid4()
+    service = make_service(
+        ChunkQuotaService,
+        config=LIMITS,
+        database={
+            "users_handler": FakeUsersHandler({owner_id: {"max_chunks": 2}}),
+            "chunk_quotas_handler": FakeChunkQuotasHandler({}),
+        },
+    )
+    quota = service.start_ingestion()
+
+    assert await quota.try_reserve(owner_id)
+    assert await quota.try_reserve(owner_id)
+    assert not await quota.try_reserve(owner_id)
+
+    # The batch failed to store, so nothing was counted in the database
+    await quota.release([make_entry(owner_id)])
+    assert await quota.try_reserve(owner_id)
+
+
+class FakeChunksHandler:
+    def __init__(self):
+        self.stored = []
+
+    async def upsert_entries(self, entries):
+        self.stored.append(list(entries))
+
+
+@pytest.mark.asyncio
+async def test_document_over_quota_fails_before_its_batch_is_stored(
+    make_service,
+):
+    owner_id = uuid.uuid4()
+    chunk_quota = make_service(
+        ChunkQuotaService,
+        config=LIMITS,
+        database={
+            "users_handler": FakeUsersHandler({}),
+            "chunk_quotas_handler": FakeChunkQuotasHandler({owner_id: 3}),
+        },
+    )
+    chunks = FakeChunksHandler()
+    service = make_service(
+        IngestionService,
+        database={"chunks_handler": chunks},
+        chunk_quota=chunk_quota,
+    )
+    entries = [make_entry(owner_id) for _ in range(3)]
+
+    with pytest.raises(R2RException) as exc_info:
+        async for _ in service.store_embeddings(entries, storage_batch_size=1):
+            pass
+
+    assert exc_info.value.status_code == 403
+    assert str(entries[2].document_id) in exc_info.value.message
+    assert chunks.stored == [entries[:1], entries[1:2]]
@@ -103,6 +103,47 @@ class TestChunks:
         # Cleanup
         await test_client.delete_document(doc_id)
 
+    @pytest.mark.asyncio
+    async def test_copy_upsert_matches_row_upsert(self, chunks_handler):
+        from core.base import Vector, VectorEntry
+
+        document_id = uuid.uuid4()
+        owner_id = uuid.uuid4()
+        entries = [
+            VectorEntry(
+                id=uuid.uuid4(),
+                document_id=document_id,
+                owner_id=owner_id,
+                collection_ids=[],
+                vector=Vector(data=[float(i), 0.5, -0.25, 1.0]),
+                text=f"chunk {i}",
+                metadata={"index": i},
+            )
+            for i in range(4)
+        ]
+        await chunks_handler.upsert_entries(entries[:2])
+
+        chunks_handler.copy_upsert_threshold = 1
+        try:
+            updated = entries[0].model_copy(update={"text": "chunk 0 updated"})
+            await chunks_handler.upsert_entries([updated, *entries[1:]])
+        finally:
+            chunks_handler.copy_upsert_threshold = 0
+
+        results = await chunks_handler.list_document_chunks(
+            document_id, offset=0, limit=10, include_vectors=True
+        )
+        by_id = {str(chunk["id"]): chunk for chunk in results["results"]}
+        assert len(by_id) == 4
+        assert by_id[str(entries[0].id)]["text"] == "chunk 0 updated"
+        for entry in entries[1:]:
+            chunk = by_id[str(entry.id)]
+            assert chunk["text"] == entry.text
+            assert chunk["metadata"]["index"] == entry.metadata["index"]
+            assert chunk["vector"] == pytest.approx(entry.vector.data)
+
+        await chunks_handler.delete({"document_id": {"$eq": str(document_id)}})
+
     @pytest.mark.asyncio
     async def test_retrieve_chunk(
         self, test_client: AsyncR2RTestClient, test_document
@@ -166,6 +207,67 @@ class TestChunks:
         # Cleanup
         await test_client.delete_document(doc_id)
 
+    @pytest.mark.asyncio
+    async def test_hybrid_search_server_side_rrf_matches_client(
+        self, chunks_handler
+    ):
+        from core.base import SearchSettings, Vector, VectorEntry
+
+        document_id = uuid.uuid4()
+        owner_id = uuid.uuid4()
+        texts = [
+            "the quick brown fox",
+            "a quick red fox jumps",
+            "lazy dogs sleep all day",
+            "foxes and dogs are animals",
+            "brown bread for breakfast",
+        ]
+        vectors = [
+            [1.0, 0.0, 0.0, 0.0],
+            [0.9, 0.1, 0.0, 0.0],
+            [0.0, 1.0, 0.0, 0.0],
+            [0.5, 0.5, 0.0, 0.0],
+            [0.0, 0.0, 1.0, 0.0],
+        ]
+        await chunks_handler.upsert_entries(
+            [
+                VectorEntry(
+                    id=uuid.uuid4(),
+                    document_id=document_id,
+                    owner_id=owner_id,
+                    collection_ids=[],
+                    vector=Vector(data=vector),
+                    text=text,
+                    metadata={"index": i},
+                )
+                for i, (text, vector) in enumerate(zip(texts, vectors))
+            ]
+        )
+
+        filters = {"document_id": {"$eq": str(document_id)}}
+        for offset in (0, 1):
+            settings = SearchSettings(
+                use_hybrid_search=True, limit=3, offset=offset, filters=filters
+            )
+            server_side = settings.model_copy(deep=True)
+            server_side.hybrid_settings.server_side_rrf = True
+
+            client_results = await chunks_handler.hybrid_search(
+                "quick fox", [1.0, 0.0, 0.0, 0.0], settings
+            )
+            server_results = await chunks_handler.hybrid_search(
+                "quick fox", [1.0, 0.0, 0.0, 0.0], server_side
+            )
+
+            assert [r.id for r in server_results] == [
+                r.id for r in client_results
+            ]
+            for server, client in zip(server_results, client_results):
+                assert server.score == pytest.approx(client.score)
+                assert server.metadata == client.metadata
+
+        await chunks_handler.delete({"document_id": {"$eq": str(document_id)}})
+
     @pytest.mark.asyncio
     async def test_unauthorized_chunk_access(
         self, test_client: AsyncR2RTestClient, test_document
@@ -0,0 +1,86 @@
+import random
+from uuid import uuid4
+
+from core.base.abstractions import Entity, Relationship
+from core.main.services.graph_service import CommunityIndex, CommunityUpdate
+
+
+def test_community_matches_a_full_scan():
+    rng = random.Random(0)
+    names = [f"node{i}" for i in range(60)]
+    entities = [Entity(name=rng.choice(names)) for _ in range(150)]
+    relationships = [
+        Relationship(
+            subject=rng.choice(names),
+            predicate="related_to",
+            object=rng.choice(names),
+        )
+        for _ in range(400)
+    ]
+    index = CommunityIndex(entities, relationships)
+
+    for size in (1, 5, 20):
+        nodes = rng.sample(names, size) + ["missing"]
+        expected_entities = [e for e in entities if e.name in nodes]
+        expected_relationships = [
+            r
+            for r in relationships
+            if r.subject in nodes and r.object in nodes
+        ]
+
+        community_entities, community_relationships = index.community(nodes)
+
+        assert community_entities == expected_entities
+        assert community_relationships == expected_relationships
+
+
+def make_graph(edges):
+    names = sorted({node for edge in edges for node in edge})
+    entities = [Entity(id=uuid4(), name=name) for name in names]
+    relationships = [
+        Relationship(id=uuid4(), subject=s, predicate="knows", object=o)
+        for s, o in edges
+    ]
+    return entities, relationships
+
+
+def test_update_revisits_communities_touched_by_new_edges():
+    entities, relationships = make_graph([("A", "B"), ("C", "D")])
+    index = CommunityIndex(entities, relationships)
+    stored = [
+        (uuid4(), {"nodes": nodes, "fingerprint": index.fingerprint(nodes)})
+        for nodes in (["A", "B"], ["C", "D"])
+    ]
+
+    added_entities, added_relationships = make_graph([("D", "E")])
+    entities.append(added_entities[1])
+    relationships += added_relationships
+    index = CommunityIndex(entities, relationships)
+    update = CommunityUpdate(stored, index, relationships, [("D", "E")])
+
+    assert update.nodes == {"C", "D", "E"}
+    assert [(r.subject, r.object) for r in update.subgraph(relationships)] == [
+        ("C", "D"),
+        ("D", "E"),
+    ]
+
+    # Re-clustered with the same members and contents, it is kept
+    assert update.keep(["D", "C"], index.fingerprint(["C", "D"]))
+    assert not update.keep(["C", "D", "E"], index.fingerprint(["C", "D", "E"]))
+    assert update.kept == [stored[1][0]]
+    assert update.removed == []
+
+
+def test_update_replaces_communities_whose_contents_changed():
+    entities, relationships = make_graph([("A", "B"), ("B", "C")])
+    index = CommunityIndex(entities, relationships)
+    stored = [
+        (uuid4(), {"nodes": ["A", "B", "C"], "fingerprint": "stale"}),
+        (uuid4(), {}),
+    ]
+
+    update = CommunityUpdate(stored, index, relationships, [])
+
+    assert update.nodes == {"A", "B", "C"}
+    assert not update.keep(["A", "B", "C"], index.fingerprint("ABC"))
+    assert update.removed == [stored[0][0], stored[1][0]]
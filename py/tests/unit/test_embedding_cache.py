@@ -0,0 +1,156 @@
+import pytest
+
+from core.base import (
+    AppConfig,
+    EmbeddingConfig,
+    EmbeddingProvider,
+    EmbeddingPurpose,
+    InMemoryEmbeddingCache,
+)
+from core.providers import PostgresEmbeddingCache
+
+
+class CountingEmbeddingProvider(EmbeddingProvider):
+    def __init__(self, config: EmbeddingConfig):
+        super().__init__(config)
+        self.requested_texts: list[str] = []
+
+    async def _execute_task(self, task):
+        self.requested_texts.extend(task["texts"])
+        return [[float(len(text)), 0.5] for text in task["texts"]]
+
+    def _execute_task_sync(self, task):
+        raise NotImplementedError
+
+    async def async_get_embeddings(
+        self,
+        texts,
+        stage=EmbeddingProvider.Step.BASE,
+        purpose=EmbeddingPurpose.INDEX,
+    ):
+        return await self._execute_with_backoff_async(
+            {"texts": texts, "stage": stage, "purpose": purpose}
+        )
+
+    def rerank(self, query, results, stage=None, limit=10):
+        return results[:limit]
+
+    async def arerank(self, query, results, stage=None, limit=10):
+        return results[:limit]
+
+
+def make_provider(**overrides) -> CountingEmbeddingProvider:
+    config = EmbeddingConfig(
+        app=AppConfig(),
+        provider="litellm",
+        base_model="openai/text-embedding-3-small",
+        base_dimension=2,
+        **overrides,
+    )
+    return CountingEmbeddingProvider(config)
+
+
+@pytest.mark.asyncio
+async def test_query_embeddings_are_served_from_cache():
+    provider = make_provider()
+
+    first = await provider.async_get_embeddings(
+        ["alpha", "beta"], purpose=EmbeddingPurpose.QUERY
+    )
+    second = await provider.async_get_embeddings(
+        ["beta", "gamma", "alpha"], purpose=EmbeddingPurpose.QUERY
+    )
+
+    assert provider.requested_texts == ["alpha", "beta", "gamma"]
+    assert first == [[5.0, 0.5], [4.0, 0.5]]
+    assert second == [[4.0, 0.5], [5.0, 0.5], [5.0, 0.5]]
+    assert provider.cache.stats() == {"hits": 2, "misses": 3, "evictions": 0}
+
+
+@pytest.mark.asyncio
+async def test_index_embeddings_bypass_cache_by_default():
+    provider = make_provider()
+
+    await provider.async_get_embeddings(["alpha"])
+    await provider.async_get_embeddings(["alpha"])
+
+    assert provider.requested_texts == ["alpha", "alpha"]
+
+
+@pytest.mark.asyncio
+async def test_cache_can_be_disabled():
+    provider = make_provider(cache_backend="none")
+
+    assert provider.cache is None
+    await provider.async_get_embeddings(
+        ["alpha"], purpose=EmbeddingPurpose.QUERY
+    )
+    await provider.async_get_embeddings(
+        ["alpha"], purpose=EmbeddingPurpose.QUERY
+    )
+
+    assert provider.requested_texts == ["alpha", "alpha"]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryEmbeddingCache(max_entries=2)
+
+    await cache.set_many({"a": [1.0], "b": [2.0]})
+    await cache.get_many(["a"])
+    await cache.set_many({"c": [3.0]})
+
+    assert await cache.get_many(["a", "b", "c"]) == {"a": [1.0], "c": [3.0]}
+    assert cache.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_expires_entries():
+    cache = InMemoryEmbeddingCache(max_entries=10, ttl_seconds=-1)
+
+    await cache.set_many({"a": [1.0]})
+
+    assert await cache.get_many(["a"]) == {}
+    assert cache.evictions == 1
+
+
+class InMemoryCacheTable:
+    def __init__(self):
+        self.rows: dict[str, bytes] = {}
+        self.touches: list[list[str]] = []
+        self.evictions = 0
+
+    async def get_entries(self, keys):
+        return {key: self.rows[key] for key in keys if key in self.rows}
+
+    async def touch_entries(self, keys):
+        self.touches.append(sorted(keys))
+
+    async def upsert_entries(self, entries, ttl_seconds=None):
+        self.rows.update(entries)
+
+    async def evict(self, max_entries):
+        self.evictions += 1
+        return 0
+
+
+@pytest.mark.asyncio
+async def test_postgres_cache_batches_touches_and_evictions():
+    table = InMemoryCacheTable()
+    cache = PostgresEmbeddingCache(table, max_entries=30, touch_batch_size=2)
+
+    for i in range(5):
+        await cache.set_many({f"k{i}": [float(i)]})
+    assert table.evictions == 1
+
+    await cache.get_many(["k0", "missing"])
+    assert table.touches == []
+    await cache.get_many(["k1"])
+    assert table.touches == [["k0", "k1"]]
+
+    await cache.get_many(["k2"])
+    for i in range(5, 8):
+        await cache.set_many({f"k{i}": [float(i)]})
+    # The pending touch is written before the table is trimmed
+    assert table.touches[-1] == ["k2"]
+    assert table.evictions == 2
@@ -0,0 +1,145 @@
+import asyncio
+import re
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from core.base.abstractions import Entity, GraphCreationSettings
+from core.main.services.graph_service import GraphService
+
+
+def requested_entities(messages):
+    return re.findall(
+        r'<entity id="(\d+)">\nName: (\w+)', messages[0]["content"]
+    )
+
+
+def describe_entities(skip=()):
+    """Describes every entity it is sent, except those named in `skip`."""
+
+    def respond(messages):
+        return "\n".join(
+            f'<entity id="{i}">{name} is described.</entity>'
+            for i, name in requested_entities(messages)
+            if name not in skip
+        )
+
+    return respond
+
+
+class FakePrompts:
+    async def get_message_payload(self, task_prompt_name, task_inputs):
+        return [{"role": "user", "content": task_inputs["entities"]}]
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    async def async_get_embeddings(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+class FakeGraphs:
+    def __init__(self):
+        self.updates: list[list[Entity]] = []
+
+    async def update_entity_descriptions(self, entities, store_type):
+        self.updates.append(list(entities))
+
+
+class FakeDocuments:
+    async def get_documents_overview(self, **kwargs):
+        return {"results": [SimpleNamespace(summary="A summary.")]}
+
+
+def graph_database(batch_size, concurrent_requests):
+    settings = GraphCreationSettings(
+        description_batch_size=batch_size,
+        description_concurrent_requests=concurrent_requests,
+    )
+    return {
+        "config": SimpleNamespace(graph_creation_settings=settings),
+        "prompts_handler": FakePrompts(),
+        "documents_handler": FakeDocuments(),
+        "graphs_handler": FakeGraphs(),
+    }
+
+
+@pytest.mark.asyncio
+async def test_entities_are_described_in_bounded_batches(
+    make_service, make_llm
+):
+    llm = make_llm(describe_entities(skip={"e7"}))
+    service = make_service(
+        GraphService,
+        config={"app": {"fast_llm": "fast"}},
+        database=graph_database(batch_size=3, concurrent_requests=2),
+        providers={"llm": llm, "embedding": FakeEmbeddings()},
+    )
+    entities = [
+        (Entity(name=f"e{i}", parent_id=uuid4()), f"info {i}")
+        for i in range(10)
+    ]
+
+    described = await service._describe_entities(uuid4(), entities)
+
+    assert [
+        len(requested_entities(messages)) for messages in llm.requests
+    ] == [3, 3, 3, 1]
+    assert llm.max_in_flight == 2
+
+    names = [entity.name for entity in described]
+    assert names == [f"e{i}" for i in range(10) if i != 7]
+    assert entities[7][0].description is None
+    assert described[0].description == "e0 is described."
+
+    (embedded,) = service.providers.embedding.calls
+    assert embedded == [entity.description for entity in described]
+    assert described[0].description_embedding == [16.0]
+
+    (updated,) = service.providers.database.graphs_handler.updates
+    assert updated == described
+
+
+@pytest.mark.asyncio
+async def test_nothing_to_describe_makes_no_requests(make_service, make_llm):
+    llm = make_llm(describe_entities())
+    service = make_service(
+        GraphService,
+        config={"app": {"fast_llm": "fast"}},
+        database=graph_database(batch_size=3, concurrent_requests=2),
+        providers={"llm": llm, "embedding": FakeEmbeddings()},
+    )
+
+    assert await service._describe_entities(uuid4(), []) == []
+    assert llm.requests == []
+    assert service.providers.database.graphs_handler.updates == []
+
+
+@pytest.mark.asyncio
+async def test_request_limit_is_shared_across_documents(
+    make_service, make_llm
+):
+    llm = make_llm(describe_entities())
+    service = make_service(
+        GraphService,
+        config={"app": {"fast_llm": "fast"}},
+        database=graph_database(batch_size=1, concurrent_requests=2),
+        providers={"llm": llm, "embedding": FakeEmbeddings()},
+    )
+
+    await asyncio.gather(
+        *(
+            service._describe_entities(
+                uuid4(),
+                [(Entity(name=f"e{i}", parent_id=uuid4()), "info")],
+            )
+            for i in range(6)
+        )
+    )
+
+    assert len(llm.requests) == 6
+    assert llm.max_in_flight == 2
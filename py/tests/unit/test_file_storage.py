@@ -0,0 +1,244 @@
+import hashlib
+from contextlib import asynccontextmanager
+from io import BytesIO
+from types import SimpleNamespace
+from uuid import uuid4
+from zipfile import ZipFile
+
+import pytest
+
+from core.base import AppConfig, FileConfig, R2RException
+from core.providers.database.files import PostgresFilesHandler
+from core.providers.file import LocalFileStorageProvider, postgres
+
+
+class FakeConnection:
+    """Just enough of the large object functions, one object open at once."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.objects: dict[int, bytearray] = {}
+        self.written: list[bytes] = []
+        self.rolled_back = False
+        self.oid = self.position = 0
+
+    async def fetchval(self, query, *args):
+        if "lo_create" in query:
+            self.oid = len(self.objects) + 1
+            self.objects[self.oid] = bytearray()
+            return self.oid
+        if "lo_open" in query:
+            self.oid, self.position = args[0], 0
+            return 0
+        if "loread" in query:
+            data = self.objects[self.oid]
+            chunk = data[self.position : self.position + args[1]]
+            self.position += len(chunk)
+            return bytes(chunk)
+        if "storage_key = $1" in query:
+            return any(
+                row["storage_key"] == args[0] for row in self.manager.rows
+            )
+        return True
+
+    async def execute(self, query, *args):
+        if "lowrite" in query:
+            self.written.append(args[1])
+            self.objects[self.oid] += args[1]
+        elif "lo_lseek64" in query:
+            self.position = args[1]
+        elif "pg_advisory_xact_lock" in query:
+            self.manager.locked.append(args[0])
+        elif "INSERT INTO" in query:
+            await self.manager.execute_query(query, list(args))
+
+    @asynccontextmanager
+    async def transaction(self):
+        try:
+            yield
+        except BaseException:
+            self.rolled_back = True
+            raise
+
+
+class FakeConnectionManager:
+    """Keeps the files table as a list of rows."""
+
+    def __init__(self):
+        self.conn = FakeConnection(self)
+        self.queries: list[list] = []
+        self.rows: list[dict] = []
+        self.locked: list[str] = []
+
+        @asynccontextmanager
+        async def get_connection():
+            yield self.conn
+
+        self.pool = SimpleNamespace(get_connection=get_connection)
+
+    async def execute_query(self, query, params=None):
+        self.queries.append(params)
+        document_id, name, oid, size, _, storage_key = params
+        self.rows.append(
+            {
+                "document_id": document_id,
+                "name": name,
+                "oid": oid,
+                "storage_key": storage_key,
+                "size": size,
+            }
+        )
+
+    async def fetchrow_query(self, query, params=None):
+        row = next(row for row in self.rows if row["document_id"] == params[0])
+        if "DELETE" in query:
+            self.rows.remove(row)
+        return row
+
+    async def fetch_query(self, query, params=None):
+        return self.rows
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    monkeypatch.setattr(postgres, "LOBJECT_CHUNK_SIZE", 4)
+    return PostgresFilesHandler("test", FakeConnectionManager())
+
+
+@pytest.mark.asyncio
+async def test_stream_is_written_in_chunks_with_size_and_hash(handler):
+    document_id = uuid4()
+
+    size, sha256 = await handler.store_file_stream(
+        document_id, "a.txt", chunks(b"hello ", b"world"), "text/plain"
+    )
+
+    assert handler.connection_manager.conn.written == [b"hello ", b"world"]
+    assert (size, sha256) == (11, hashlib.sha256(b"hello world").hexdigest())
+    assert handler.connection_manager.queries == [
+        [document_id, "a.txt", 1, 11, "text/plain", None]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_over_limit_is_rejected_before_storing(handler):
+    with pytest.raises(R2RException) as exc_info:
+        await handler.store_file_stream(
+            uuid4(), "a.txt", chunks(b"1234", b"5678", b"9"), max_size=6
+        )
+
+    assert exc_info.value.status_code == 413
+    assert handler.connection_manager.conn.written == [b"1234"]
+    assert handler.connection_manager.conn.rolled_back
+    assert handler.connection_manager.queries == []
+
+
+@pytest.mark.asyncio
+async def test_byte_ranges_are_read_in_chunks(handler):
+    document_id = uuid4()
+    await handler.store_file(document_id, "a.txt", BytesIO(b"0123456789"))
+
+    name, stream, size = await handler.retrieve_file_stream(document_id)
+
+    assert (name, size) == ("a.txt", 10)
+    assert [chunk async for chunk in stream(0, None)] == [
+        b"0123",
+        b"4567",
+        b"89",
+    ]
+    assert [chunk async for chunk in stream(3, 9)] == [b"3456", b"78"]
+
+
+@pytest.mark.asyncio
+async def test_zip_export_is_streamed_entry_by_entry(handler):
+    contents = {"a.txt": b"first file", "b.bin": bytes(range(256)) * 4}
+    for name, content in contents.items():
+        await handler.store_file(uuid4(), name, BytesIO(content))
+
+    zip_name, stream = await handler.retrieve_files_as_zip()
+    parts = [part async for part in stream]
+
+    assert zip_name.endswith(".zip")
+    assert max(len(part) for part in parts) < 1024
+    with ZipFile(BytesIO(b"".join(parts))) as zip_file:
+        assert {
+            name: zip_file.read(name) for name in zip_file.namelist()
+        } == contents
+
+
+@pytest.fixture
+def local_handler(tmp_path):
+    storage = LocalFileStorageProvider(
+        FileConfig(app=AppConfig(), provider="local", root=str(tmp_path))
+    )
+    return PostgresFilesHandler("test", FakeConnectionManager(), storage)
+
+
+@pytest.mark.asyncio
+async def test_local_storage_shares_identical_files(local_handler):
+    first, second = uuid4(), uuid4()
+    for document_id in (first, second):
+        await local_handler.store_file_stream(
+            document_id, "a.txt", chunks(b"same ", b"bytes")
+        )
+    key = hashlib.sha256(b"same bytes").hexdigest()
+    stored = local_handler.storage.root / key[:2] / key
+
+    assert [
+        row["storage_key"] for row in local_handler.connection_manager.rows
+    ] == [key, key]
+    assert stored.read_bytes() == b"same bytes"
+
+    async with local_handler.open_file(first) as (name, content, size):
+        assert (name, bytes(content[5:]), size) == ("a.txt", b"bytes", 10)
+    _, stream, _ = await local_handler.retrieve_file_stream(second)
+    assert b"".join([chunk async for chunk in stream(2, 7)]) == b"me by"
+
+    await local_handler.delete_file(first)
+    assert stored.exists()
+    await local_handler.delete_file(second)
+    assert not stored.exists()
+    # Recording and releasing each held the lock of the shared key
+    assert local_handler.connection_manager.locked == [key] * 4
+
+
+@pytest.mark.asyncio
+async def test_local_upload_fails_if_released_before_recorded(
+    local_handler, monkeypatch
+):
+    storage = local_handler.storage
+    store = storage.store
+
+    async def store_then_release(chunks, max_size=None):
+        # A file of the same content is deleted right after the commit
+        stored = await store(chunks, max_size)
+        await local_handler._release(storage, stored.key)
+        return stored
+
+    monkeypatch.setattr(storage, "store", store_then_release)
+
+    with pytest.raises(R2RException) as exc_info:
+        await local_handler.store_file_stream(
+            uuid4(), "a.txt", chunks(b"same bytes")
+        )
+
+    assert exc_info.value.status_code == 409
+    assert local_handler.connection_manager.conn.rolled_back
+
+
+@pytest.mark.asyncio
+async def test_local_storage_discards_rejected_upload(local_handler):
+    with pytest.raises(R2RException):
+        await local_handler.store_file_stream(
+            uuid4(), "a.txt", chunks(b"1234", b"5678"), max_size=6
+        )
+
+    assert not any(
+        path.is_file() for path in local_handler.storage.root.rglob("*")
+    )
+    assert local_handler.connection_manager.rows == []
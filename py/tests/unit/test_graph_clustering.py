@@ -0,0 +1,43 @@
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+from core.providers.database import graph_clustering
+from core.providers.database.graph_clustering import EdgeList, cluster_edges
+
+
+def test_edge_list_encodes_names_as_ids():
+    edge_list = EdgeList.from_triples(
+        [
+            ("Ada", "Babbage", 2.0),
+            ("Babbage", "Ada", None),
+            ("Ada", "Ada", 0.5),
+        ]
+    )
+
+    assert edge_list.names == ["Ada", "Babbage"]
+    assert edge_list.edges.dtype == np.int32
+    assert edge_list.edges.tolist() == [[0, 1], [1, 0], [0, 0]]
+    assert edge_list.weights.dtype == np.float32
+    assert edge_list.weights.tolist() == [2.0, 1.0, 0.5]
+    assert len(edge_list) == 3
+
+
+def test_empty_edge_list():
+    edge_list = EdgeList.from_triples([])
+
+    assert edge_list.edges.shape == (0, 2)
+    assert len(edge_list) == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_dying_without_a_result_raises(monkeypatch):
+    # Any target that exits without reporting back stands in for a worker
+    # killed while clustering
+    monkeypatch.setattr(graph_clustering, "_cluster_in_worker", os.kill)
+    edge_list = EdgeList.from_triples([("Ada", "Babbage", 1.0)])
+
+    with pytest.raises(RuntimeError, match="exited with code 1"):
+        await asyncio.wait_for(cluster_edges(edge_list, {}), timeout=60)
@@ -0,0 +1,122 @@
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from core.base import (
+    Entity,
+    GraphExtraction,
+    Relationship,
+    VectorQuantizationType,
+)
+from core.providers.database.graphs import PostgresGraphsHandler
+
+
+class FakeConnection:
+    """Records COPYs and the transaction they ran in."""
+
+    def __init__(self):
+        self.copies: list[tuple[str, list[dict]]] = []
+        self.transactions = 0
+
+    async def copy_records_to_table(
+        self, table_name, *, records, columns, schema_name
+    ):
+        assert self.transactions == 1, "COPY outside of the transaction"
+        self.copies.append(
+            (
+                f"{schema_name}.{table_name}",
+                [dict(zip(columns, record)) for record in records],
+            )
+        )
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.transactions += 1
+        yield
+
+
+def make_handler() -> tuple[PostgresGraphsHandler, FakeConnection]:
+    conn = FakeConnection()
+
+    @asynccontextmanager
+    async def get_connection():
+        yield conn
+
+    handler = PostgresGraphsHandler(
+        project_name="test",
+        connection_manager=SimpleNamespace(
+            pool=SimpleNamespace(get_connection=get_connection)
+        ),
+        dimension=2,
+        quantization_type=VectorQuantizationType.FP32,
+        collections_handler=None,
+    )
+    return handler, conn
+
+
+@pytest.mark.asyncio
+async def test_extractions_are_copied_with_resolved_endpoints():
+    handler, conn = make_handler()
+    document_id = uuid4()
+    extractions = [
+        GraphExtraction(
+            entities=[
+                Entity(
+                    name=name,
+                    parent_id=document_id,
+                    description_embedding=[0.5, 1.0],
+                    metadata={"source": "test"},
+                )
+                for name in ("Ada", "Babbage", "Ada")
+            ],
+            relationships=[
+                Relationship(
+                    subject="Ada",
+                    predicate="worked_with",
+                    object="Babbage",
+                    parent_id=document_id,
+                    description_embedding=[1.0, 0.0],
+                ),
+                Relationship(
+                    subject="Ada",
+                    predicate="met",
+                    object="Faraday",
+                    parent_id=document_id,
+                ),
+            ],
+        ),
+        GraphExtraction(
+            entities=[Entity(name="Babbage", parent_id=document_id)],
+            relationships=[],
+        ),
+    ]
+
+    written = await handler.add_extractions(extractions)
+
+    assert written == (4, 1)
+    assert conn.transactions == 1
+    (entity_table, entities), (relationship_table, relationships) = conn.copies
+    assert entity_table == "test.documents_entities"
+    assert relationship_table == "test.documents_relationships"
+
+    assert len({entity["id"] for entity in entities}) == 4
+    assert entities[0]["description_embedding"] == [0.5, 1.0]
+    assert json.loads(entities[0]["metadata"]) == {"source": "test"}
+    assert entities[3]["metadata"] is None
+
+    # Later entities shadow earlier ones of the same name
+    (relationship,) = relationships
+    assert relationship["subject_id"] == entities[2]["id"]
+    assert relationship["object_id"] == entities[1]["id"]
+    assert relationship["description_embedding"] == [1.0, 0.0]
+
+
+@pytest.mark.asyncio
+async def test_empty_extractions_skip_the_database():
+    handler, conn = make_handler()
+
+    assert await handler.add_extractions([]) == (0, 0)
+    assert conn.transactions == 0
@@ -0,0 +1,115 @@
+import json
+import re
+from uuid import uuid4
+
+import pytest
+
+from core.providers.database.graphs import PostgresGraphsHandler
+
+
+class RecordingConnectionManager:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.queries: list[tuple[str, tuple]] = []
+
+    async def fetch_query(self, query, params=None):
+        self.queries.append((query, params))
+        return self.rows
+
+
+def make_handler(rows=()):
+    return PostgresGraphsHandler(
+        project_name="test",
+        connection_manager=RecordingConnectionManager(rows),
+        collections_handler=None,
+        dimension=2,
+        quantization_type=None,
+    )
+
+
+def row(branch, similarity_score, **properties):
+    return {
+        "branch": branch,
+        "properties": json.dumps(properties),
+        "similarity_score": similarity_score,
+    }
+
+
+@pytest.mark.asyncio
+async def test_each_search_gets_its_own_filter_and_limit():
+    handler = make_handler()
+    collection_id = uuid4()
+
+    await handler.graph_search_batch(
+        "query",
+        searches=[
+            {"search_type": "entities", "limit": 3},
+            {"search_type": "relationships", "limit": 5},
+            {"search_type": "communities", "limit": 7},
+        ],
+        query_embedding=[0.1, 0.2],
+        filters={"collection_ids": {"$overlap": [str(collection_id)]}},
+    )
+
+    [(query, params)] = handler.connection_manager.queries
+    assert query.count("UNION ALL") == 2
+    assert params[0] == [0.1, 0.2]
+    limits = [params[int(n) - 1] for n in re.findall(r"LIMIT \$(\d+)", query)]
+    assert limits == [3, 5, 7]
+    columns = re.findall(r"WHERE (\w+) = ANY\(\$(\d+)::uuid\[\]\)", query)
+    assert [column for column, _ in columns] == [
+        "parent_id",
+        "parent_id",
+        "collection_id",
+    ]
+    assert all(params[int(n) - 1] == [str(collection_id)] for _, n in columns)
+    for table in ("entities", "relationships", "communities"):
+        assert f"graphs_{table}" in query
+
+
+@pytest.mark.asyncio
+async def test_rows_are_returned_per_search_with_requested_properties():
+    handler = make_handler(
+        [
+            row(0, 0.25, name="Alice", description="A person", metadata={}),
+            row(0, 0.5, name="Bob", description="Another", metadata={}),
+            row(2, 0.1, name="Team", summary="Both", metadata={"k": 1}),
+        ]
+    )
+
+    results = await handler.graph_search_batch(
+        "query",
+        searches=[
+            {"search_type": "entities", "property_names": ["name"]},
+            {"search_type": "relationships"},
+            {
+                "search_type": "communities",
+                "property_names": ["name", "summary"],
+            },
+        ],
+        query_embedding=[0.1, 0.2],
+    )
+
+    assert results == [
+        [
+            {"name": "Alice", "metadata": {}, "similarity_score": 0.75},
+            {"name": "Bob", "metadata": {}, "similarity_score": 0.5},
+        ],
+        [],
+        [
+            {
+                "name": "Team",
+                "summary": "Both",
+                "metadata": {"k": 1},
+                "similarity_score": 0.9,
+            }
+        ],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_no_searches_issue_no_query():
+    handler = make_handler()
+
+    assert await handler.graph_search_batch("query", [], [0.1, 0.2]) == []
+    assert handler.connection_manager.queries == []
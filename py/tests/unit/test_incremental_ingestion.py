@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from core.base import DocumentChunk, generate_id
+from core.main.services.ingestion_service import ChunkDiff, IngestionService
+
+
+def make_chunk(text: str, order: int, version: str = "v1"):
+    document_id = generate_id("manual")
+    return DocumentChunk(
+        id=generate_id(f"{order}_{version}"),
+        document_id=document_id,
+        owner_id=uuid4(),
+        collection_ids=[],
+        data=text,
+        metadata={"chunk_order": order, "version": version},
+    )
+
+
+def stored(*texts: str, version: str = "v0"):
+    return [
+        (generate_id(f"{order}_{version}"), ChunkDiff.content_hash(text))
+        for order, text in enumerate(texts)
+    ]
+
+
+class InMemoryChunks:
+    def __init__(self, existing):
+        self.existing = existing
+        self.updated: dict = {}
+        self.deleted: list = []
+
+    async def get_document_chunk_hashes(self, document_id):
+        return self.existing
+
+    async def update_chunk_metadata(self, metadatas, keep_keys=()):
+        self.updated.update(metadatas)
+
+    async def delete_chunks(self, ids):
+        self.deleted.extend(ids)
+
+
+def test_unchanged_chunks_keep_their_ids():
+    existing = stored("intro", "old paragraph", "outro")
+    diff = ChunkDiff(existing)
+
+    new = [make_chunk(t, i) for i, t in enumerate(["intro", "new", "outro"])]
+    kept = [diff.keep(chunk) for chunk in new]
+
+    assert kept == [True, False, True]
+    assert [new[0].id, new[2].id] == [existing[0][0], existing[2][0]]
+    assert diff.kept[existing[2][0]] == {"chunk_order": 2, "version": "v1"}
+    assert diff.removed == [existing[1][0]]
+
+
+def test_repeated_chunks_are_matched_once_each():
+    existing = stored("same", "same")
+    diff = ChunkDiff(existing)
+
+    new = [make_chunk("same", i) for i in range(3)]
+
+    assert [diff.keep(chunk) for chunk in new] == [True, True, False]
+    assert [new[0].id, new[1].id] == [existing[0][0], existing[1][0]]
+    assert new[2].id not in dict(existing)
+    assert diff.removed == []
+
+
+def test_new_chunks_never_reuse_a_stored_id():
+    # A failed ingestion retried with the same version numbers chunks alike
+    existing = stored("a", "b", version="v0")
+    diff = ChunkDiff(existing)
+
+    first, second = make_chunk("b", 0, "v0"), make_chunk("c", 1, "v0")
+
+    assert diff.keep(first) and first.id == existing[1][0]
+    assert not diff.keep(second)
+    assert second.id != existing[1][0]
+    assert diff.removed == [existing[0][0]]
+
+
+def test_previous_version_is_replaced_without_reuse():
+    existing = stored("intro", "outro")
+    diff = ChunkDiff(existing, reuse=False)
+
+    assert not diff.keep(make_chunk("intro", 0))
+    assert diff.removed == [chunk_id for chunk_id, _ in existing]
+
+
+@pytest.mark.asyncio
+async def test_diff_updates_kept_chunks_and_deletes_removed(make_service):
+    chunks = InMemoryChunks(stored("intro", "old"))
+    service = make_service(
+        IngestionService,
+        config={"ingestion": {"incremental_updates": True}},
+        database={"chunks_handler": chunks},
+        chunk_quota=None,
+    )
+    document_info = SimpleNamespace(id=generate_id("manual"))
+
+    diff = await service.start_chunk_diff(document_info, {})
+    diff.keep(make_chunk("intro", 0))
+    diff.keep(make_chunk("new", 1))
+    await service.finish_chunk_diff(document_info, diff)
+
+    assert chunks.updated == {
+        chunks.existing[0][0]: {"chunk_order": 0, "version": "v1"}
+    }
+    assert chunks.deleted == [chunks.existing[1][0]]
+
+    diff = await service.start_chunk_diff(
+        document_info, {"incremental_updates": False}
+    )
+    assert not diff.keep(make_chunk("intro", 0))
@@ -0,0 +1,156 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.base import IngestionStatus, generate_id
+from core.main.orchestration.simple import ingestion_workflow
+from core.main.services.ingestion_service import ChunkDiff
+from core.main.orchestration.simple.ingestion_workflow import (
+    run_ingestion_pipeline,
+)
+
+
+@pytest.fixture(autouse=True)
+def word_token_counter(monkeypatch):
+    # Keep the tests independent of tiktoken's downloadable encodings
+    monkeypatch.setattr(
+        ingestion_workflow,
+        "count_tokens_for_text",
+        lambda text: len(text.split()),
+    )
+
+
+class FakeIngestionService:
+    def __init__(
+        self, n_chunks, queue_size=4, fail_store=False, stored_texts=()
+    ):
+        self.config = SimpleNamespace(
+            ingestion=SimpleNamespace(
+                pipeline_queue_size=queue_size,
+                chunks_for_document_summary=2,
+            )
+        )
+        self.n_chunks = n_chunks
+        self.fail_store = fail_store
+        self.parsed = 0
+        self.stored: list[int] = []
+        self.max_in_flight = 0
+        self.statuses: list[IngestionStatus] = []
+        self.summary_chunks: list[dict] = []
+        self.existing = [
+            (generate_id(text), ChunkDiff.content_hash(text))
+            for text in stored_texts
+        ]
+        self.diff = None
+        self.finished_diff = None
+
+    async def start_chunk_diff(self, document_info, ingestion_config):
+        self.diff = ChunkDiff(self.existing)
+        return self.diff
+
+    async def finish_chunk_diff(self, document_info, diff):
+        self.finished_diff = diff
+
+    async def parse_file(self, document_info, ingestion_config):
+        for i in range(self.n_chunks):
+            self.parsed += 1
+            self.max_in_flight = max(
+                self.max_in_flight, self.parsed - len(self.stored)
+            )
+            yield SimpleNamespace(
+                id=generate_id(f"new_{i}"),
+                data=f"c{i}",
+                metadata={},
+                model_dump=lambda i=i: {"data": f"c{i}"},
+            )
+
+    async def embed_document(self, chunks, embedding_reuse=None):
+        async for chunk in chunks:
+            await asyncio.sleep(0)
+            yield int(chunk["data"][1:])
+
+    async def store_embeddings(self, vectors):
+        async for vector in vectors:
+            if self.fail_store:
+                raise RuntimeError("storage failed")
+            await asyncio.sleep(0.001)
+            self.stored.append(vector)
+            yield "stored"
+
+    async def update_document_status(
+        self, document_info, status, metadata=None
+    ):
+        self.statuses.append(status)
+
+    async def augment_document_info(self, document_info, chunks):
+        self.summary_chunks = chunks
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stores_every_chunk_with_bounded_buffering():
+    service = FakeIngestionService(n_chunks=200)
+    document_info = SimpleNamespace(id=generate_id("doc"), total_tokens=0)
+
+    await run_ingestion_pipeline(service, document_info, {})
+
+    assert service.stored == list(range(200))
+    assert document_info.total_tokens > 0
+    assert [c["data"] for c in service.summary_chunks] == ["c0", "c1"]
+    assert service.statuses == [
+        IngestionStatus.AUGMENTING,
+        IngestionStatus.EMBEDDING,
+        IngestionStatus.STORING,
+    ]
+    # Two queues plus the items held by each stage
+    assert service.max_in_flight <= 2 * 4 + 4
+
+
+@pytest.mark.asyncio
+async def test_pipeline_failure_cancels_other_stages():
+    service = FakeIngestionService(n_chunks=1_000, fail_store=True)
+
+    with pytest.raises(RuntimeError, match="storage failed"):
+        await asyncio.wait_for(
+            run_ingestion_pipeline(
+                service,
+                SimpleNamespace(id=generate_id("doc"), total_tokens=0),
+                {"skip_document_summary": True},
+            ),
+            timeout=5,
+        )
+    assert service.parsed < 1_000
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_chunks_already_stored():
+    service = FakeIngestionService(
+        n_chunks=10, stored_texts=["c3", "c7", "gone"]
+    )
+    document_info = SimpleNamespace(id=generate_id("doc"), total_tokens=0)
+
+    await run_ingestion_pipeline(
+        service, document_info, {"skip_document_summary": True}
+    )
+
+    assert service.stored == [0, 1, 2, 4, 5, 6, 8, 9]
+    assert service.finished_diff is service.diff
+    assert list(service.diff.kept) == [generate_id("c3"), generate_id("c7")]
+    assert service.diff.removed == [generate_id("gone")]
+
+
+@pytest.mark.asyncio
+async def test_removed_chunks_survive_a_failed_store():
+    service = FakeIngestionService(
+        n_chunks=10, fail_store=True, stored_texts=["c3", "gone"]
+    )
+
+    with pytest.raises(RuntimeError, match="storage failed"):
+        await run_ingestion_pipeline(
+            service,
+            SimpleNamespace(id=generate_id("doc"), total_tokens=0),
+            {"skip_document_summary": True},
+        )
+
+    # Nothing was deleted, so the previous version's chunks are all kept
+    assert service.finished_diff is None
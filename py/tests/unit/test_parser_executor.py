@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.base import AppConfig, IngestionConfig, ParserExecutionSettings
+from core.parsers import TextParser
+from core.providers.ingestion.r2r.base import (
+    R2RIngestionConfig,
+    R2RIngestionProvider,
+)
+from core.providers.ingestion.r2r.parser_executor import ParserExecutor
+
+
+class PagedParser:
+    def __init__(self, pages, delay=0.0):
+        self.pages = pages
+        self.delay = delay
+        self.threads: set[int] = set()
+
+    async def ingest(self, data, **kwargs):
+        for page in range(self.pages):
+            self.threads.add(threading.get_ident())
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield f"page {page}"
+        yield None
+
+
+def make_executor(**settings) -> ParserExecutor:
+    config = IngestionConfig(
+        app=AppConfig(),
+        parser_execution={"txt": ParserExecutionSettings(**settings)},
+    )
+    return ParserExecutor(config)
+
+
+async def collect(executor, parser, data=b""):
+    return [text async for text in executor.parse(parser, "txt", data)]
+
+
+@pytest.mark.asyncio
+async def test_thread_mode_streams_pages_off_the_loop():
+    parser = PagedParser(5)
+    texts = await collect(make_executor(mode="thread"), parser)
+
+    assert texts == [f"page {i}" for i in range(5)]
+    assert threading.get_ident() not in parser.threads
+
+
+@pytest.mark.asyncio
+async def test_timeout_stops_slow_parser():
+    executor = make_executor(mode="inline", timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        await collect(executor, PagedParser(100, delay=0.01))
+
+
+@pytest.mark.asyncio
+async def test_process_mode_parses_in_worker():
+    executor = make_executor(mode="process", timeout=60)
+    parser = TextParser(
+        config=executor.config, database_provider=None, llm_provider=None
+    )
+    try:
+        texts = await collect(executor, parser, "héllo".encode())
+    finally:
+        executor.shutdown()
+
+    assert texts == ["héllo"]
+
+
+def test_process_mode_is_rejected_for_parsers_that_need_providers():
+    config = R2RIngestionConfig(
+        app=AppConfig(),
+        parser_execution={"default": ParserExecutionSettings(mode="process")},
+    )
+
+    with pytest.raises(ValueError, match="process mode"):
+        R2RIngestionProvider(config, None, None)
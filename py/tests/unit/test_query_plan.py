@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from core.base import EmbeddingPurpose
+from core.main.services.retrieval_service import QueryPlan
+
+
+class CountingEmbeddingProvider:
+    def __init__(self):
+        self.calls: list[tuple[str, EmbeddingPurpose]] = []
+
+    async def async_get_embedding(self, text, purpose=EmbeddingPurpose.INDEX):
+        self.calls.append((text, purpose))
+        await asyncio.sleep(0.01)
+        return [0.1, 0.2, 0.3, 0.4]
+
+
+@pytest.mark.asyncio
+async def test_query_plan_embeds_once_for_concurrent_legs():
+    provider = CountingEmbeddingProvider()
+    plan = QueryPlan("what is r2r?", provider)
+
+    results = await asyncio.gather(
+        plan.get_query_embedding(),
+        plan.get_query_embedding(),
+        plan.get_query_embedding(),
+    )
+
+    assert provider.calls == [("what is r2r?", EmbeddingPurpose.QUERY)]
+    assert all(r == [0.1, 0.2, 0.3, 0.4] for r in results)
+    assert "embedding" in plan.timings
+
+
+@pytest.mark.asyncio
+async def test_query_plan_records_stage_timings():
+    plan = QueryPlan("query", CountingEmbeddingProvider())
+
+    async with plan.timed("chunk_search"):
+        await asyncio.sleep(0)
+
+    assert plan.timings["chunk_search"] >= 0
@@ -23,6 +23,7 @@ from core.providers.auth import R2RAuthProvider
 from core.providers.database import PostgresDatabaseProvider
 from core.providers.email import ConsoleMockEmailProvider
 from core.providers.embeddings import OpenAIEmbeddingProvider
+from core.providers.file import PostgresFileStorageProvider
 from core.providers.ingestion import R2RIngestionProvider
 from core.providers.llm import OpenAICompletionProvider
 from core.providers.orchestration import SimpleOrchestrationProvider
@@ -50,6 +51,8 @@ def mock_providers():
     # Create other mock providers
     mock_db = create_autospec(PostgresDatabaseProvider)
     mock_db.config = Mock()
+    mock_file = create_autospec(PostgresFileStorageProvider)
+    mock_file.config = Mock()
     mock_ingestion = create_autospec(R2RIngestionProvider)
     mock_ingestion.config = Mock()
     mock_embedding = create_autospec(OpenAIEmbeddingProvider)
@@ -69,6 +72,7 @@ def mock_providers():
     providers = R2RProviders(
         auth=mock_auth,
         database=mock_db,
+        file=mock_file,
         ingestion=mock_ingestion,
         embedding=mock_embedding,
         completion_embedding=mock_completion_embedding,
@@ -84,6 +88,7 @@ def mock_services():
     return R2RServices(
         management=Mock(),
         auth=Mock(),
+        chunk_quota=Mock(),
         ingestion=Mock(),
         retrieval=Mock(),
         graph=Mock(),
@@ -0,0 +1,25 @@
+import sys
+
+from core.parsers.sanitize import (
+    CharacterFilter,
+    is_text_character,
+    sanitize_text,
+)
+
+
+def test_sanitize_text_matches_character_predicate():
+    text = "".join(map(chr, range(sys.maxunicode + 1)))
+
+    assert sanitize_text(text) == "".join(filter(is_text_character, text))
+
+
+def test_sanitize_text_keeps_scripts_and_drops_symbols():
+    text = "Héllo “мир” Γειά 你好 हिन्दी 📄 𝑥²\x07\tend"
+
+    assert sanitize_text(text) == "Héllo мир Γειά 你好 हनद  𝑥²\tend"
+
+
+def test_character_filter_drops_supplementary_runs():
+    drop = CharacterFilter([ord("-"), 0x1F4C4, 0x1F4C5])
+
+    assert drop("a-b📄📅c📆") == "abc📆"
@@ -0,0 +1,70 @@
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook
+
+from core.base import AppConfig, IngestionConfig
+from core.parsers import CSVParserAdvanced, XLSXParserAdvanced
+from core.parsers.structured.tabular import iter_tables
+
+
+@pytest.fixture
+def config():
+    return IngestionConfig(app=AppConfig(), chunk_size=64)
+
+
+def test_iter_tables_finds_separate_blocks():
+    rows = [
+        ("a", "b", None, None),
+        (1, 2, None, "x"),
+        (None, None, None, "y"),
+        (None, None, None, None),
+        ("c", None, None, None),
+        ("d", "e", "f", None),
+    ]
+
+    tables = list(iter_tables(rows))
+
+    assert sorted(tables) == sorted(
+        [
+            [["a", "b"], ["1", "2"]],
+            [["x"], ["y"]],
+            [["c", "", ""], ["d", "e", "f"]],
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_csv_rows_are_packed_under_header(config):
+    data = "id;name\n" + "".join(f"{i};item {i}\n" for i in range(40))
+    parser = CSVParserAdvanced(
+        config=config, database_provider=None, llm_provider=None
+    )
+
+    chunks = [chunk async for chunk in parser.ingest(data.encode())]
+
+    assert 1 < len(chunks) < 40
+    assert all(chunk.startswith("id, name\n") for chunk in chunks)
+    assert all(len(chunk) <= 64 for chunk in chunks)
+    rows = [row for chunk in chunks for row in chunk.split("\n")[1:]]
+    assert rows == [f"{i}, item {i}" for i in range(40)]
+
+
+@pytest.mark.asyncio
+async def test_xlsx_tables_are_chunked_separately(config):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["city", "population"])
+    sheet.append(["Oslo", 700000])
+    sheet.append([])
+    sheet.append([None, None, None, "code", "label"])
+    sheet.append([None, None, None, 1, "one"])
+    buffer = BytesIO()
+    workbook.save(buffer)
+    parser = XLSXParserAdvanced(
+        config=config, database_provider=None, llm_provider=None
+    )
+
+    chunks = [chunk async for chunk in parser.ingest(buffer.getvalue())]
+
+    assert chunks == ["city, population\nOslo, 700000", "code, label\n1, one"]
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+import tiktoken
+
+from core.base import (
+    RecursiveCharacterTextSplitter,
+    RecursiveSpanTextSplitter,
+    RecursiveTokenTextSplitter,
+)
+from core.utils import count_tokens_batch, get_tokenizer, register_tokenizer
+
+PIECES = [
+    "word",
+    " ",
+    "  ",
+    "\n",
+    "\n\n",
+    "\n\n\n",
+    " \n",
+    "\t",
+    "é",
+    "x" * 40,
+]
+
+
+@pytest.mark.parametrize(
+    "chunk_size,chunk_overlap", [(1024, 512), (50, 0), (32, 32), (7, 3)]
+)
+def test_span_splitter_matches_recursive_splitter(chunk_size, chunk_overlap):
+    rng = random.Random(chunk_size)
+    for _ in range(200):
+        text = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 600)))
+        expected = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        ).split_text(text)
+        splitter = RecursiveSpanTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        )
+
+        assert splitter.split_text(text) == expected
+        assert [
+            text[start:end] for start, end in splitter.split_spans(text)
+        ] == expected
+
+
+def test_span_splitter_records_offsets_in_metadata():
+    text = "  first paragraph\n\nsecond paragraph  "
+    splitter = RecursiveSpanTextSplitter(
+        chunk_size=20, chunk_overlap=0, add_start_index=True
+    )
+
+    documents = splitter.create_documents([text])
+
+    assert [doc.page_content for doc in documents] == [
+        "first paragraph",
+        "second paragraph",
+    ]
+    for doc in documents:
+        start, end = doc.metadata["start_index"], doc.metadata["end_index"]
+        assert text[start:end] == doc.page_content
+
+
+@pytest.fixture
+def byte_tokenizer():
+    # One token per UTF-8 byte, so the tests need no downloaded encodings
+    return tiktoken.Encoding(
+        name="test_bytes",
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+
+
+def test_token_splitter_packs_chunks_by_token_count(byte_tokenizer):
+    text = "ab é " * 200 + "\n\n" + "ascii only words " * 50
+    splitter = RecursiveTokenTextSplitter(
+        tokenizer=byte_tokenizer, chunk_size=64, chunk_overlap=16
+    )
+
+    chunks = splitter.split_text(text)
+
+    assert len(chunks) > 1
+    assert all(
+        len(byte_tokenizer.encode_ordinary(chunk)) <= 64 for chunk in chunks
+    )
+    # Without multi-byte characters tokens and characters coincide
+    ascii_text = "ascii only words " * 50
+    assert splitter.split_text(ascii_text) == RecursiveSpanTextSplitter(
+        chunk_size=64, chunk_overlap=16
+    ).split_text(ascii_text)
+
+
+def test_tokenizer_registry_returns_shared_instance(byte_tokenizer):
+    register_tokenizer("test_bytes", byte_tokenizer)
+
+    assert get_tokenizer("test_bytes") is byte_tokenizer
+    assert count_tokens_batch(["é", "abc"], model="test_bytes") == [2, 3]
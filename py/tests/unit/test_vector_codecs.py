@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from core.providers.database.vector_codecs import (
+    decode_bit,
+    decode_halfvec,
+    decode_vector,
+    encode_bit,
+    encode_halfvec,
+    encode_vector,
+)
+
+
+def test_vector_round_trip():
+    data = encode_vector([1.0, -2.5, 3.25])
+    assert data.hex() == "000300003f800000c020000040500000"
+
+    decoded = decode_vector(data)
+    assert decoded.dtype == np.float32
+    assert decoded.tolist() == [1.0, -2.5, 3.25]
+
+
+def test_vector_accepts_arrays_and_text():
+    expected = encode_vector([0.5, 0.25])
+    assert encode_vector(np.array([0.5, 0.25], dtype=np.float64)) == expected
+    assert encode_vector("[0.5, 0.25]") == expected
+
+
+def test_halfvec_round_trip():
+    decoded = decode_halfvec(encode_halfvec([0.5, -1.0, 2.0]))
+    assert decoded.dtype == np.float32
+    assert decoded.tolist() == pytest.approx([0.5, -1.0, 2.0])
+
+
+def test_bit_round_trip():
+    bits = np.array([1, 0, 1, 1, 0, 0, 0, 0, 1], dtype=bool)
+    data = encode_bit(bits)
+    assert data.hex() == "00000009b080"
+    assert decode_bit(data).tolist() == bits.tolist()
+    assert encode_bit("101100001") == data
@@ -0,0 +1,118 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.base import AppConfig, IngestionConfig
+from core.parsers import VLMPDFParser
+from core.parsers.media.pdf_parser import _PageCache
+
+PAGES = 10
+
+
+class FakeVisionModel:
+    def __init__(self):
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def aget_completion(self, messages, generation_config):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        image_url = messages[0]["content"][1]["image_url"]["url"]
+        # Page n is rendered as 3n bytes, i.e. 4n base64 characters
+        page = len(image_url.rsplit(",", 1)[-1]) // 4
+        # Later pages answer first, so ordering is actually exercised
+        await asyncio.sleep(0.001 * (PAGES - page))
+        self.active -= 1
+        message = SimpleNamespace(content=f"text of page {page}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def make_parser(tmp_path, monkeypatch, llm):
+    config = IngestionConfig(
+        app=AppConfig(vlm="test-vlm"),
+        vision_pdf_page_window=3,
+        vision_pdf_render_batch=2,
+        vision_pdf_cache_dir=str(tmp_path),
+    )
+    prompts = SimpleNamespace(get_cached_prompt=lambda prompt_name: None)
+    parser = VLMPDFParser(
+        config=config,
+        database_provider=SimpleNamespace(prompts_handler=prompts),
+        llm_provider=llm,
+    )
+    parser.vision_prompt_text = "describe"
+    parser.rendered = []
+
+    def render_pages(pdf_path, first_page, last_page):
+        parser.rendered.append((first_page, last_page))
+        return {
+            page: b"\xff" * (3 * page)
+            for page in range(first_page, last_page + 1)
+        }
+
+    monkeypatch.setattr(parser, "count_pages", lambda pdf_path: PAGES)
+    monkeypatch.setattr(parser, "render_pages", render_pages)
+    return parser
+
+
+@pytest.mark.asyncio
+async def test_pages_stream_in_order_within_window(tmp_path, monkeypatch):
+    llm = FakeVisionModel()
+    parser = make_parser(tmp_path, monkeypatch, llm)
+
+    pages = [page async for page in parser.ingest(b"%PDF-fake")]
+
+    assert [page["page_number"] for page in pages] == list(range(1, 11))
+    assert [page["content"] for page in pages] == [
+        f"text of page {i}" for i in range(1, 11)
+    ]
+    assert llm.max_active <= 3
+    # Batches may render in any order, but each only once
+    assert sorted(parser.rendered) == [
+        (1, 2),
+        (3, 4),
+        (5, 6),
+        (7, 8),
+        (9, 10),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cached_pages_skip_rendering_and_vision_calls(
+    tmp_path, monkeypatch
+):
+    llm = FakeVisionModel()
+    first = [
+        page
+        async for page in make_parser(tmp_path, monkeypatch, llm).ingest(
+            b"%PDF-fake"
+        )
+    ]
+
+    parser = make_parser(tmp_path, monkeypatch, llm)
+    second = [page async for page in parser.ingest(b"%PDF-fake")]
+
+    assert second == first
+    assert llm.calls == PAGES
+    assert parser.rendered == []
+    # Rendered pages are dropped once described
+    assert list(tmp_path.rglob("*.jpg")) == []
+
+
+@pytest.mark.asyncio
+async def test_empty_cached_description_is_a_hit(tmp_path, monkeypatch):
+    llm = FakeVisionModel()
+    parser = make_parser(tmp_path, monkeypatch, llm)
+    [page async for page in parser.ingest(b"%PDF-fake")]
+    model = parser.config.vision_pdf_model or parser.config.app.vlm
+    cache = _PageCache(str(tmp_path), b"%PDF-fake", model, "describe")
+    await cache.put_result(2, "")
+
+    parser = make_parser(tmp_path, monkeypatch, llm)
+    pages = [page async for page in parser.ingest(b"%PDF-fake")]
+
+    assert pages[1] == {"content": "", "page_number": 2}
+    assert llm.calls == PAGES